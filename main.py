@@ -1,24 +1,703 @@
+import argparse
+import multiprocessing
 import os
-import time
+import signal
+from dataclasses import replace
 
-from models import Config
-from models.page import Page
+from colorama import Fore
+
+from models import ConfigContext, Settings
+from models.bundle import ARCHIVE_FORMATS, BUNDLE_KEYS, BundleEntry, BundleWriter
+from models.duplicates import DUPLICATE_POLICIES
+from models.export import EXPORT_FORMATS, RecordExporter
+from models.ledger import Ledger
+from models.ocr import OcrPool
+from models.optimizer import OUTPUT_PROFILES
+from models.page_cache import PageCache
+from models.parallel import process_parallel
+from models.prefilter import REJECTED_REPORT, RejectionReport
+from models.pipeline import PREFETCH_BYTES, OutputWriter, prefetch_documents
+from models.processor import (
+    DocumentStats,
+    document_skipped,
+    document_status,
+    document_time,
+    process_document,
+)
+from models.shards import SHARD_BALANCES, ShardQueue, plan_shards
+from models.watcher import POLL_INTERVAL, FolderWatcher
+from utils.constants import ENV_PREFIX, EXIT_ERROR, EXIT_NO_DOCUMENTS, EXIT_OK, EXIT_PARTIAL
+from utils.metrics import Metrics
+from utils.progress import PROGRESS_MODES, get_progress, set_progress
+from utils.string_helpers import format_size
 from utils import (
+    count_pdf_docs,
+    error,
     exit_application,
     get_pdf_docs,
     message,
-    page_message,
+    set_app_title,
     set_title,
     success,
     warn,
 )
 
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Divide comprovantes em PDF em um arquivo por página.",
+        epilog=(
+            "As opções do config.ini também podem ser definidas por variáveis de ambiente "
+            f"({ENV_PREFIX}INPUT_FOLDER, {ENV_PREFIX}OUTPUT_FOLDER, {ENV_PREFIX}OUTPUT_FILENAME, "
+            f"{ENV_PREFIX}TEXT_BACKEND...). Códigos de saída: {EXIT_OK} sucesso, {EXIT_ERROR} erro, "
+            f"{EXIT_PARTIAL} páginas com falha, {EXIT_NO_DOCUMENTS} nenhum documento encontrado."
+        ),
+    )
+    parser.add_argument("-i", "--input", help="Arquivo PDF ou pasta de origem (substitui o config.ini).")
+    parser.add_argument("-o", "--output", help="Pasta de destino (substitui o config.ini).")
+    parser.add_argument(
+        "-f",
+        "--filename",
+        help='Modelo do nome dos arquivos gerados, ex.: "BANK RECIPIENT R$ VALUE" (substitui o config.ini).',
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Execução não interativa: sem diálogos, sem título do console e sem aguardar uma tecla ao final.",
+    )
+    parser.add_argument(
+        "--progress",
+        choices=PROGRESS_MODES,
+        default="auto",
+        help=(
+            "Exibição do progresso: auto (padrão; barra em terminais, resumos periódicos com a saída "
+            "redirecionada), bar, log, pages (uma linha por página) ou quiet."
+        ),
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_const",
+        const="quiet",
+        dest="progress",
+        help="Não exibe as páginas nem os documentos processados, somente os erros e o resumo final.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Quantidade de processos usados no processamento (padrão: 1).",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help=(
+            "Lê os próximos documentos e grava as páginas em segundo plano, sobrepondo a leitura, "
+            "a extração e a gravação (útil em pastas de rede; ignorado com --workers)."
+        ),
+    )
+    parser.add_argument(
+        "--reprocess",
+        action="store_true",
+        help="Processa novamente as páginas já registradas em execuções anteriores.",
+    )
+    parser.add_argument(
+        "--bundle-by",
+        choices=list(BUNDLE_KEYS),
+        help="Agrupa as páginas em um único PDF por banco, favorecido ou data (substitui o config.ini).",
+    )
+    parser.add_argument(
+        "--archive",
+        choices=ARCHIVE_FORMATS,
+        help="Grava os PDFs agrupados em um único pacote .zip ou .tar (requer --bundle-by).",
+    )
+    parser.add_argument(
+        "--prefilter",
+        action="store_true",
+        help=(
+            "Rejeita, antes da extração completa, as páginas em branco, digitalizadas sem texto ou sem "
+            "rótulos de valor e nomes de banco, listando-as em paginas_rejeitadas.csv na pasta de destino."
+        ),
+    )
+    parser.add_argument(
+        "--optimize",
+        choices=OUTPUT_PROFILES,
+        help=(
+            "Perfil de otimização do tamanho dos arquivos gerados: off, compact (padrão), small (fontes "
+            "reduzidas aos caracteres usados) ou smallest (também reduz as imagens). Substitui o config.ini."
+        ),
+    )
+    parser.add_argument(
+        "--ocr",
+        action="store_true",
+        help=(
+            "Reconhece o texto (Tesseract) das páginas digitalizadas, sem camada de texto, em um pool "
+            "de processos próprio. Os resultados ficam em cache no ledger.db."
+        ),
+    )
+    parser.add_argument(
+        "--page-cache",
+        action="store_true",
+        help=(
+            "Reaproveita o texto e os campos das páginas já extraídas, mesmo em outro arquivo (ex.: o "
+            "mesmo extrato enviado novamente com uma página a mais). O cache fica em page_cache.db."
+        ),
+    )
+    parser.add_argument(
+        "--duplicates",
+        choices=DUPLICATE_POLICIES,
+        help=(
+            "Comprovantes já salvos anteriormente: off (padrão), skip (não grava), link (link físico "
+            "para o original) ou flag (grava na subpasta duplicados). Substitui o config.ini."
+        ),
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="ARQUIVO",
+        help="Registra os tempos de cada etapa por página e os exporta para o arquivo informado.",
+    )
+    parser.add_argument(
+        "--metrics-format",
+        choices=["jsonl", "prometheus"],
+        default="jsonl",
+        help="Formato do arquivo de métricas (padrão: jsonl).",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="ARQUIVO",
+        help="Exporta os campos extraídos de cada página (origem, página, banco, favorecido, valores e arquivo gerado).",
+    )
+    parser.add_argument(
+        "--export-format",
+        choices=EXPORT_FORMATS,
+        help="Formato do arquivo exportado (padrão: pela extensão, .csv ou jsonl).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Permanece em execução, processando os novos arquivos da pasta de origem.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=POLL_INTERVAL,
+        help=f"Intervalo, em segundos, entre as verificações da pasta no modo --watch (padrão: {POLL_INTERVAL:g}).",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="PASTA",
+        help="Pasta compartilhada do processamento em lotes entre várias máquinas (use com --plan, --claim ou --merge).",
+    )
+    batch = parser.add_mutually_exclusive_group()
+    batch.add_argument(
+        "--plan",
+        type=int,
+        metavar="LOTES",
+        help="Divide os documentos da pasta de origem na quantidade de lotes informada e grava o manifesto.",
+    )
+    batch.add_argument(
+        "--claim",
+        action="store_true",
+        help="Reivindica e processa os lotes pendentes até que não haja mais nenhum.",
+    )
+    batch.add_argument(
+        "--merge",
+        action="store_true",
+        help="Move os arquivos dos lotes concluídos para a pasta de destino e reúne os resultados.",
+    )
+    parser.add_argument(
+        "--balance",
+        choices=SHARD_BALANCES,
+        default="size",
+        help="Divisão dos lotes em --plan: size (tamanho total equilibrado, padrão) ou hash (pelo caminho).",
+    )
+
+    args = parser.parse_args()
+
+    if (args.plan is not None or args.claim or args.merge) != bool(args.batch):
+        parser.error("--batch deve ser usado com --plan, --claim ou --merge.")
+
+    if args.archive and not args.bundle_by:
+        parser.error("--archive deve ser usado com --bundle-by.")
+
+    return args
+
+
+def apply_overrides(args: argparse.Namespace) -> None:
+    """
+    Aplica as opções da linha de comando como variáveis de ambiente, que têm prioridade sobre
+    o config.ini e são herdadas pelos processos do modo --workers.
+    """
+    overrides = {
+        "INPUT_FOLDER": args.input,
+        "OUTPUT_FOLDER": args.output,
+        "OUTPUT_FILENAME": args.filename,
+        "BUNDLE_BY": args.bundle_by,
+        "BUNDLE_ARCHIVE": args.archive,
+        "DUPLICATES": args.duplicates,
+        "OPTIMIZE": args.optimize,
+        "PREFILTER": "1" if args.prefilter else None,
+        "OCR": "1" if args.ocr else None,
+        "PAGE_CACHE": "1" if args.page_cache else None,
+        "HEADLESS": "1" if args.headless else None,
+    }
+
+    for option, value in overrides.items():
+        if value is not None:
+            os.environ[f"{ENV_PREFIX}{option}"] = value
+
+
+def create_bundle(ledger: Ledger, settings: Settings) -> BundleWriter | None:
+    """Cria o gravador de arquivos combinados, se o agrupamento estiver configurado."""
+    bundle_by = settings.bundle_by
+
+    if not bundle_by:
+        return None
+
+    def record(entries: list[BundleEntry], path: str) -> None:
+        for file_hash, page_number, fields, amounts in entries:
+            ledger.record(file_hash, page_number, path, fields, amounts)
+
+    return BundleWriter(
+        settings.output_folder,
+        bundle_by,
+        archive=settings.bundle_archive,
+        max_pages=settings.bundle_max_pages,
+        on_flush=record,
+        **settings.save_options,
+    )
+
+
+def create_exporter(args: argparse.Namespace, settings: Settings) -> RecordExporter | None:
+    """
+    Cria o exportador dos registros das páginas, se `--export` for informado. É criado somente
+    após os modos que encerram a execução antes do processamento (`--plan`, `--merge`), pois
+    o arquivo é sobrescrito ao ser aberto.
+    """
+    if not args.export:
+        return None
+
+    return RecordExporter(args.export, args.export_format, list(settings.key_values))
+
+
+def create_ocr(ledger: Ledger, settings: Settings) -> OcrPool | None:
+    """Cria o pool do OCR, se o reconhecimento das páginas digitalizadas estiver ativado."""
+    if not settings.ocr:
+        return None
+
+    return OcrPool(ledger, settings.ocr_language, settings.ocr_workers)
+
+
+def create_page_cache(settings: Settings) -> PageCache | None:
+    """Abre o cache de páginas, se estiver ativado."""
+    if not settings.page_cache:
+        return None
+
+    return PageCache(max_size=settings.page_cache_size)
+
+
+def process_sequential(
+    total_docs: int,
+    separator: str,
+    ledger: Ledger,
+    settings: Settings,
+    reprocess: bool,
+    metrics: Metrics = None,
+    bundle: BundleWriter = None,
+    exporter: RecordExporter = None,
+    report: RejectionReport = None,
+    ocr: OcrPool = None,
+    cache: PageCache = None,
+) -> DocumentStats:
+    stats = DocumentStats()
+
+    for index, path in enumerate(get_pdf_docs(settings.input_folder, settings.output_folder), start=1):
+        stats += process_document(
+            path,
+            ledger,
+            settings,
+            reprocess,
+            index,
+            total_docs,
+            metrics,
+            bundle,
+            exporter=exporter,
+            report=report,
+            ocr=ocr,
+            cache=cache,
+        )
+        get_progress().separator(separator)
+
+    return stats
+
+
+def process_pipeline(
+    total_docs: int,
+    separator: str,
+    ledger: Ledger,
+    settings: Settings,
+    reprocess: bool,
+    metrics: Metrics = None,
+    bundle: BundleWriter = None,
+    exporter: RecordExporter = None,
+    report: RejectionReport = None,
+    ocr: OcrPool = None,
+    cache: PageCache = None,
+) -> DocumentStats:
+    """
+    Processa os documentos em etapas sobrepostas: enquanto um documento é processado, os
+    próximos são lidos por uma thread e as páginas já nomeadas são gravadas por um pool de
+    threads. As filas entre as etapas são limitadas, mantendo a memória estável.
+    """
+    stats = DocumentStats()
+    paths = get_pdf_docs(settings.input_folder, settings.output_folder)
+
+    # Com um limite de memória, os documentos lidos antecipadamente ocupam no máximo um quarto dele
+    max_bytes = min(PREFETCH_BYTES, settings.memory_limit // 4) if settings.memory_limit else PREFETCH_BYTES
+
+    with OutputWriter() as writer:
+        for index, (path, data) in enumerate(prefetch_documents(paths, max_bytes=max_bytes), start=1):
+            if isinstance(data, Exception):
+                error(f"Erro ao ler o arquivo {path}: {data}")
+                get_progress().separator(separator)
+                continue
+
+            stats += process_document(
+                path,
+                ledger,
+                settings,
+                reprocess,
+                index,
+                total_docs,
+                metrics,
+                bundle,
+                data,
+                None if bundle else writer,
+                exporter,
+                report,
+                ocr,
+                cache,
+            )
+            get_progress().separator(separator)
+
+    return stats
+
+
+def process_workers(
+    total_docs: int,
+    separator: str,
+    ledger: Ledger,
+    settings: Settings,
+    reprocess: bool,
+    workers: int,
+    metrics: Metrics = None,
+    bundle: BundleWriter = None,
+    exporter: RecordExporter = None,
+    report: RejectionReport = None,
+    ocr: OcrPool = None,
+) -> DocumentStats:
+    stats = DocumentStats()
+    index = 0
+    current_path = None
+    elapsed = 0.0
+
+    paths = get_pdf_docs(settings.input_folder, settings.output_folder)
+    progress = get_progress()
+
+    for result in process_parallel(
+        paths, workers, settings, ledger=ledger, reprocess=reprocess, bundle=bundle, ocr=ocr
+    ):
+        if result.path != current_path:
+            if current_path is not None and elapsed:
+                document_time(total, elapsed)
+
+            if current_path is not None:
+                progress.separator(separator)
+
+            index += 1
+            current_path = result.path
+            total = result.total
+            stats.total += total
+            elapsed = 0.0
+
+            document_status(result.name, index, total_docs, total)
+
+        if result.skipped:
+            stats.processed += total
+            stats.skipped += total
+            document_skipped(total)
+
+            if exporter:
+                for page_result in result.pages:
+                    if page_result.rejected:
+                        exporter.add(result.path, page_result.page_number, "rejected", error=page_result.rejected)
+                    else:
+                        exporter.add(
+                            result.path,
+                            page_result.page_number,
+                            "skipped",
+                            page_result.fields,
+                            page_result.amounts,
+                            page_result.filename,
+                        )
+
+            continue
+
+        if metrics:
+            metrics.record_open(result.path, result.open_seconds)
+
+        # Caminhos e campos das páginas já processadas, consultados somente se necessários na exportação
+        done = None
+
+        for page_result in result.pages:
+            if page_result.saved or page_result.skipped:
+                stats.processed += 1
+                stats.bytes_written += page_result.bytes_written
+                stats.bytes_unoptimized += page_result.bytes_unoptimized
+
+            if page_result.skipped:
+                stats.skipped += 1
+
+            if page_result.cached:
+                stats.cached += 1
+
+            if page_result.rejected:
+                stats.rejected += 1
+
+                if report:
+                    report.add(result.path, page_result.page_number, page_result.rejected)
+
+            progress.page(
+                page_result.page_number,
+                total,
+                page_result.saved,
+                skipped=page_result.skipped,
+                duplicate=page_result.duplicate,
+                rejected=page_result.rejected is not None,
+            )
+
+            if metrics:
+                metrics.record_page(
+                    result.path,
+                    page_result.page_number,
+                    page_result.timings,
+                    page_result.bytes_written,
+                    page_result.error,
+                    page_result.skipped,
+                    page_result.rejected is not None,
+                )
+
+            if exporter:
+                if page_result.skipped and page_result.filename is None:
+                    if done is None:
+                        done = ledger.processed_pages(result.file_hash, settings.output_folder)
+
+                    page_result.filename, page_result.fields, page_result.amounts = done.get(
+                        page_result.page_number, (None, None, [])
+                    )
+
+                exporter.add(
+                    result.path,
+                    page_result.page_number,
+                    page_result.status,
+                    page_result.fields,
+                    page_result.amounts,
+                    page_result.filename,
+                    page_result.error or page_result.rejected,
+                )
+
+        elapsed += result.elapsed
+
+    if current_path is not None and elapsed:
+        document_time(total, elapsed)
+
+    if current_path is not None:
+        progress.separator(separator)
+
+    return stats
+
+
+def plan_batch(batch_dir: str, shards: int, balance: str, settings: Settings) -> None:
+    paths = get_pdf_docs(settings.input_folder, settings.output_folder)
+    manifest = ShardQueue(batch_dir).create(plan_shards(paths, shards, balance), balance)
+
+    for shard in manifest["shards"]:
+        message(f"{shard['id']}: {shard['documents']} documentos ({format_size(shard['bytes'])})")
+
+    success(f"{len(manifest['shards'])} lotes gravados em {batch_dir}")
+
+
+def claim_batch(
+    batch_dir: str,
+    separator: str,
+    settings: Settings,
+    reprocess: bool,
+    metrics: Metrics = None,
+    cache: PageCache = None,
+) -> DocumentStats:
+    """
+    Reivindica e processa os lotes pendentes até que não haja mais nenhum (veja `ShardQueue`).
+
+    Cada lote é processado na sua pasta e com o seu registro de processamento, na pasta do lote;
+    os arquivos só chegam à pasta de destino na junção (`--merge`).
+    """
+    if settings.bundle_by:
+        raise ValueError("O processamento em lotes não pode ser combinado com o agrupamento (bundle_by).")
+
+    queue = ShardQueue(batch_dir)
+    stats = DocumentStats()
+
+    while shard := queue.claim():
+        warn(f"Lote {shard.id} ({len(shard.paths)} documentos)")
+        get_progress().separator(separator)
+
+        shard_settings = replace(settings, output_folder=queue.staging(shard))
+
+        with Ledger(queue.ledger_path(shard)) as ledger:
+            # Um lote abandonado e reivindicado novamente continua os resultados já gravados
+            exporter = RecordExporter(queue.results_path(shard), "jsonl", list(settings.key_values), append=True)
+            ocr = create_ocr(ledger, shard_settings)
+
+            try:
+                for index, path in enumerate(shard.paths, start=1):
+                    if not queue.heartbeat(shard):
+                        warn(f"O lote {shard.id} foi reivindicado por outra máquina.")
+                        break
+
+                    stats += process_document(
+                        path,
+                        ledger,
+                        shard_settings,
+                        reprocess,
+                        index,
+                        len(shard.paths),
+                        metrics,
+                        exporter=exporter,
+                        ocr=ocr,
+                        cache=cache,
+                    )
+                    exporter.flush()
+                    get_progress().separator(separator)
+                else:
+                    exporter.close()
+                    queue.complete(shard)
+            finally:
+                exporter.close()
+
+                if ocr:
+                    ocr.close()
+
+    return stats
+
+
+def merge_batch(batch_dir: str, settings: Settings) -> bool:
+    """
+    Junta os lotes concluídos na pasta de destino, registrando as páginas juntadas no registro
+    de processamento local.
+
+    Returns:
+        bool: True se todos os lotes foram juntados e nenhuma página falhou.
+    """
+    with Ledger() as ledger:
+        summary = ShardQueue(batch_dir).merge(settings.output_folder, ledger)
+
+    message(f"Lotes juntados: {summary.merged} ({summary.files} arquivos movidos para {settings.output_folder})")
+    message(f"Páginas incluídas no registro de processamento: {summary.pages}")
+
+    for status, count in sorted(summary.statuses.items()):
+        message(f"  {status}: {count} páginas")
+
+    if summary.pending:
+        warn(f"Lotes ainda não concluídos: {', '.join(summary.pending)}")
+
+    return not summary.pending and not summary.statuses["failed"]
+
+
+def watch_folder(
+    context: ConfigContext,
+    separator: str,
+    ledger: Ledger,
+    reprocess: bool,
+    interval: float,
+    metrics: Metrics = None,
+    bundle: BundleWriter = None,
+    exporter: RecordExporter = None,
+    report: RejectionReport = None,
+    ocr: OcrPool = None,
+    cache: PageCache = None,
+) -> None:
+    """
+    Processa os documentos adicionados à pasta de entrada até ser interrompido.
+
+    A configuração é recarregada antes de cada documento se o `config.ini` tiver sido alterado;
+    as pastas de entrada e de saída, o agrupamento, o OCR e o cache de páginas continuam os do
+    início da execução.
+    """
+    watcher = FolderWatcher(context.settings.input_folder, context.settings.output_folder, interval=interval)
+
+    def handle(path: str) -> None:
+        try:
+            if context.reload():
+                message("Configuração recarregada.")
+
+                if context.ignored:
+                    warn(f"Opções que só valem ao reiniciar (mantidas): {', '.join(context.ignored)}")
+        except ValueError as e:
+            error(f"Configuração inválida, mantendo a anterior: {e}")
+
+        try:
+            process_document(
+                path,
+                ledger,
+                context.settings,
+                reprocess,
+                metrics=metrics,
+                bundle=bundle,
+                exporter=exporter,
+                report=report,
+                ocr=ocr,
+                cache=cache,
+            )
+
+            if bundle:
+                bundle.flush()
+                ledger.commit()
+
+            if exporter:
+                exporter.flush()
+
+            if report:
+                report.flush()
+        except Exception as e:
+            error(f"Erro ao processar o arquivo {path}: {e}")
+
+        get_progress().separator(separator)
+        set_title("Aguardando novos arquivos...")
+
+    def shutdown(signum, frame) -> None:
+        warn("Encerrando após o arquivo atual...")
+        watcher.stop()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    set_title("Aguardando novos arquivos...")
+    message("Aguardando novos arquivos... (Ctrl+C para encerrar)")
+    watcher.run(handle)
+
+
 def main():
+    args = parse_args()
+    apply_overrides(args)
+
     try:
-        config = Config()
+        context = ConfigContext()
+        settings = context.settings
+        set_app_title(settings.title)
 
-        _input = config.get_input_folder()
-        _output =config.get_output_folder()
+        _input = settings.input_folder
+        _output = settings.output_folder
         _max = max(len(_input), len(_output)) + 27
 
         print(" Iniciando...\n", "-" * _max)
@@ -29,46 +708,172 @@ def main():
         warn(_output)
         print("", "-" * _max)
 
-        pdf_docs = get_pdf_docs()
+        metrics = Metrics() if args.metrics else None
+        report = RejectionReport(os.path.join(_output, REJECTED_REPORT)) if settings.prefilter else None
+
+        if args.plan is not None:
+            plan_batch(args.batch, args.plan, args.balance, settings)
+            exit_application(code=EXIT_OK)
+
+        if args.merge:
+            complete = merge_batch(args.batch, settings)
+            set_title("Concluído!")
+            exit_application(code=EXIT_OK if complete else EXIT_PARTIAL)
+
+        if args.watch:
+            # Os documentos chegam aos poucos: por padrão, cada documento e página é exibido
+            progress = set_progress("pages" if args.progress == "auto" else args.progress)
+            exporter = create_exporter(args, settings)
+
+            with Ledger() as ledger:
+                bundle = create_bundle(ledger, settings)
+                ocr = create_ocr(ledger, settings)
+                cache = create_page_cache(settings)
+
+                try:
+                    watch_folder(
+                        context,
+                        "-" * _max,
+                        ledger,
+                        args.reprocess,
+                        args.interval,
+                        metrics,
+                        bundle,
+                        exporter,
+                        report,
+                        ocr,
+                        cache,
+                    )
+                finally:
+                    progress.close()
+
+                    if bundle:
+                        bundle.close()
+
+                    if ocr:
+                        ocr.close()
+
+                    if cache:
+                        cache.close()
 
-        processed_pages = 0
-        total_pages = 0
+                    if exporter:
+                        exporter.close()
 
-        for pdf in pdf_docs:
-            doc_name = os.path.basename(pdf.path)
-            total = len(pdf.pages)
-            total_pages += total
+                    if report:
+                        report.close()
 
-            status = f"Processando arquivo {doc_name}..."
-            set_title(status)
-            warn(status)
+            if metrics:
+                metrics.write(args.metrics, args.metrics_format)
 
-            for current_page in pdf.pages:
-                page = Page(pdf, current_page, current_page.page_number)
-                saved = page.save()
+            set_title("Encerrado")
+            exit_application(code=EXIT_OK)
 
-                if saved:
-                    processed_pages += 1
+        total_docs = None if args.claim else count_pdf_docs(_input, _output)
 
-                page_message(page.page_number, total, saved)
+        if not args.claim and not total_docs:
+            set_title("Concluído!")
+            exit_application(f"{Fore.LIGHTRED_EX}Nenhum documento encontrado!{Fore.RESET}", EXIT_NO_DOCUMENTS)
 
-            pdf.close()
+        progress = set_progress(args.progress, total_docs)
 
+        # No modo `--claim`, os registros de cada lote são exportados no arquivo de resultados do lote
+        exporter = None if args.claim else create_exporter(args, settings)
+
+        with Ledger() as ledger:
+            bundle = create_bundle(ledger, settings)
+            ocr = create_ocr(ledger, settings)
+            cache = create_page_cache(settings)
+
+            try:
+                if args.claim:
+                    stats = claim_batch(args.batch, "-" * _max, settings, args.reprocess, metrics, cache)
+                elif args.workers > 1:
+                    stats = process_workers(
+                        total_docs,
+                        "-" * _max,
+                        ledger,
+                        settings,
+                        args.reprocess,
+                        args.workers,
+                        metrics,
+                        bundle,
+                        exporter,
+                        report,
+                        ocr,
+                    )
+                elif args.pipeline:
+                    stats = process_pipeline(
+                        total_docs, "-" * _max, ledger, settings, args.reprocess, metrics, bundle, exporter, report, ocr, cache
+                    )
+                else:
+                    stats = process_sequential(
+                        total_docs, "-" * _max, ledger, settings, args.reprocess, metrics, bundle, exporter, report, ocr, cache
+                    )
+            finally:
+                progress.close()
+
+                if bundle:
+                    bundle.close()
+
+                if ocr:
+                    ocr.close()
+
+                if cache:
+                    cache.close()
+
+                if exporter:
+                    exporter.close()
+
+                if report:
+                    report.close()
+
+        if metrics:
+            for line in metrics.summary_lines():
+                message(line)
+
+            metrics.write(args.metrics, args.metrics_format)
+            message(f"Métricas salvas em {args.metrics}")
             print("", "-" * _max)
 
-        msg = f"Número de páginas processadas com sucesso: {processed_pages} de {total_pages}"
+        if exporter:
+            message(f"{exporter.count} registros exportados para {args.export}")
+
+        msg = f"Número de páginas processadas com sucesso: {stats.processed} de {stats.total}"
 
         set_title("Concluído!")
 
-        if processed_pages == total_pages:
+        if stats.bytes_written and settings.optimize != "off":
+            reduction = 1 - stats.bytes_written / stats.bytes_unoptimized if stats.bytes_unoptimized else 0
+            message(
+                f"Tamanho dos arquivos gerados: {format_size(stats.bytes_written)}, "
+                f"sem otimização: {format_size(stats.bytes_unoptimized)} "
+                f"(otimização: {settings.optimize}, redução de {reduction:.0%})"
+            )
+        elif stats.bytes_written:
+            message(f"Tamanho dos arquivos gerados: {format_size(stats.bytes_written)} (otimização: {settings.optimize})")
+
+        if stats.skipped:
+            message(f"Páginas já processadas em execuções anteriores: {stats.skipped}")
+
+        if ocr and ocr.recognized + ocr.cached:
+            message(f"Páginas digitalizadas reconhecidas pelo OCR: {ocr.recognized} ({ocr.cached} do cache)")
+
+        if stats.cached:
+            message(f"Páginas lidas do cache de páginas (sem nova extração): {stats.cached}")
+
+        if stats.rejected:
+            message(f"Páginas rejeitadas pelo pré-filtro: {stats.rejected} (relatório em {report.path})")
+
+        if stats.complete:
             success(msg)
         else:
             warn(msg)
     except Exception as e:
-        exit_application(e)
+        exit_application(e, EXIT_ERROR)
 
-    exit_application()
+    exit_application(code=EXIT_OK if stats.complete else EXIT_PARTIAL)
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
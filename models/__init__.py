@@ -1,4 +1,5 @@
 from .config import Config
 from .config_manager import ConfigManager
+from .settings import ConfigContext, Settings
 
-__all__ = ["ConfigManager", "Config"]
+__all__ = ["ConfigManager", "Config", "ConfigContext", "Settings"]
@@ -0,0 +1,183 @@
+import io
+import os
+import re
+import tarfile
+import time
+import zipfile
+from decimal import Decimal
+from collections import OrderedDict
+from typing import Callable
+
+import fitz
+
+from utils.output_registry import OutputRegistry
+
+BUNDLE_KEYS = {"bank": "BANK", "recipient": "RECIPIENT", "date": "DATE"}
+ARCHIVE_FORMATS = ["zip", "tar"]
+MAX_OPEN_GROUPS = 32
+UNKNOWN_GROUP = "OUTROS"
+INVALID_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+# (hash do arquivo de origem, número da página, campos, valores encontrados)
+BundleEntry = tuple[str | None, int, dict[str, str | None], list[tuple[str, Decimal]]]
+
+
+def group_name(fields: dict[str, str | None], group_by: str) -> str:
+    """
+    Retorna o nome do grupo (e do arquivo combinado) de uma página.
+
+    Example:
+        >>> group_name({"DATE": "05/03/2024"}, "date")
+        '2024-03-05'
+        >>> group_name({"BANK": None}, "bank")
+        'OUTROS'
+    """
+    value = fields.get(BUNDLE_KEYS[group_by])
+
+    if not value:
+        return UNKNOWN_GROUP
+
+    if group_by == "date":
+        day, month, year = value.split("/")
+        return f"{year}-{month}-{day}"
+
+    return INVALID_CHARS.sub("-", value).strip(" .") or UNKNOWN_GROUP
+
+
+class BundleWriter:
+    """
+    Agrupa as páginas por um campo (banco, favorecido ou data) em um único PDF por grupo.
+
+    As páginas de cada grupo são acumuladas em memória e gravadas de uma só vez quando o grupo
+    atinge `max_pages` páginas ou em `flush()`/`close()`, evitando a gravação de milhares de
+    arquivos pequenos. No máximo `max_open` grupos ficam em memória: ao abrir um grupo além
+    do limite (ex.: agrupamento por favorecido), o grupo usado há mais tempo é gravado como
+    uma parte (`NOME_1.pdf`, `NOME_2.pdf`...), como ao atingir `max_pages`. Opcionalmente, os
+    PDFs combinados são gravados em um único pacote `.zip` ou `.tar` na pasta de saída.
+
+    Example:
+        >>> with BundleWriter("saida", "bank", archive="zip") as bundle:
+        >>>     bundle.add(document.source, 0, {"BANK": "BB", ...})
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        group_by: str,
+        archive: str = None,
+        max_pages: int = 500,
+        max_open: int = MAX_OPEN_GROUPS,
+        garbage: int = 3,
+        deflate: bool = True,
+        on_flush: Callable[[list[BundleEntry], str], None] = None,
+    ):
+        self.output_dir = output_dir
+        self.group_by = group_by
+        self.max_pages = max_pages
+        self.max_open = max_open
+        self.save_options = {"garbage": garbage, "deflate": deflate}
+        self.on_flush = on_flush
+        # Em ordem de uso: o primeiro grupo é o usado há mais tempo
+        self.groups: OrderedDict[str, tuple[fitz.Document, list[BundleEntry]]] = OrderedDict()
+        self.archive = None
+        self.archive_path = None
+        self.archive_names = set()
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        if archive:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            self.archive_path = OutputRegistry.for_folder(output_dir, archive).reserve(f"comprovantes_{stamp}")
+
+            if archive == "zip":
+                # Os PDFs já são comprimidos (deflate), então não são comprimidos novamente
+                self.archive = zipfile.ZipFile(self.archive_path, "w", zipfile.ZIP_STORED)
+            else:
+                self.archive = tarfile.open(self.archive_path, "w")
+
+    def __enter__(self) -> "BundleWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def add(
+        self,
+        source: fitz.Document,
+        page_index: int,
+        fields: dict[str, str | None],
+        file_hash: str = None,
+        page_number: int = None,
+        amounts: list[tuple[str, Decimal]] = None,
+    ) -> str:
+        """
+        Adiciona uma página ao grupo correspondente aos seus campos.
+
+        Returns:
+            str: O nome do grupo.
+        """
+        name = group_name(fields, self.group_by)
+
+        if name in self.groups:
+            self.groups.move_to_end(name)
+        else:
+            if len(self.groups) >= self.max_open:
+                self.__flush_group(next(iter(self.groups)))
+
+            self.groups[name] = (fitz.open(), [])
+
+        output_pdf, entries = self.groups[name]
+        output_pdf.insert_pdf(source, from_page=page_index, to_page=page_index)
+        entries.append((file_hash, page_number if page_number is not None else page_index + 1, fields, amounts or []))
+
+        if len(entries) >= self.max_pages:
+            self.__flush_group(name)
+
+        return name
+
+    def __archive_name(self, name: str) -> str:
+        filename = f"{name}.pdf"
+        suffix = 0
+
+        while filename in self.archive_names:
+            suffix += 1
+            filename = f"{name}_{suffix}.pdf"
+
+        self.archive_names.add(filename)
+
+        return filename
+
+    def __flush_group(self, name: str) -> None:
+        output_pdf, entries = self.groups.pop(name)
+        data = output_pdf.tobytes(**self.save_options)
+        output_pdf.close()
+
+        if self.archive is None:
+            path = OutputRegistry.for_folder(self.output_dir).reserve(name)
+
+            with open(path, "wb") as output_file:
+                output_file.write(data)
+        elif isinstance(self.archive, zipfile.ZipFile):
+            path = self.archive_path
+            self.archive.writestr(self.__archive_name(name), data)
+        else:
+            path = self.archive_path
+            info = tarfile.TarInfo(self.__archive_name(name))
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self.archive.addfile(info, io.BytesIO(data))
+
+        if self.on_flush:
+            self.on_flush(entries, path)
+
+    def flush(self) -> None:
+        """Grava todos os grupos pendentes."""
+        for name in list(self.groups):
+            self.__flush_group(name)
+
+    def close(self) -> None:
+        self.flush()
+
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
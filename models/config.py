@@ -1,29 +1,39 @@
 import os
 
-from singleton import singleton
 from utils.constants import *
 from utils.file_helpers import select_folder
-from utils.helper import get_app_directory
-from utils.string_helpers import string_list_to_json
+from utils.filename_template import FILENAME_MAX_LENGTH
+from utils.helper import get_app_directory, has_desktop, is_interactive
+from utils.string_helpers import as_bool, string_list_to_json
 
+from .bundle import ARCHIVE_FORMATS, BUNDLE_KEYS
+from .duplicates import DUPLICATE_POLICIES
+from .ocr import OCR_LANGUAGE, OCR_WORKERS
+from .optimizer import OUTPUT_PROFILES
 from .config_manager import ConfigManager
 
 
-@singleton
 class Config(ConfigManager):
+    """
+    Leitura do `config.ini` (e das variáveis de ambiente `NOTAS_PDF_*`), criado na primeira
+    execução. O processamento usa o `Settings` gerado a partir desta classe.
+    """
+
     key_values = SEPARATOR.join(KEY_VALUES)
     input_folder = os.path.join(os.getcwd(), "receipts")
     output_folder = os.path.join(os.getcwd(), "receipts", DEFAULT_OUTPUT_DIR_NAME)
     bank_acronyms = SEPARATOR.join([f"{key}{SEPARATOR}{value}" for key, value in BANK_ACRONYMS.items()])
     config_file = os.path.join(get_app_directory(), CONFIG_FILE)
 
-    def __init__(self):
-        super().__init__(self.config_file)
+    def __init__(self, file_path: str = None):
+        super().__init__(file_path or self.config_file, env_prefix=ENV_PREFIX)
         self.read_config()
         try:
             self.get_section("App")
         except:
-            self.__default_values()
+            # Sem terminal ou ambiente gráfico, usa os valores padrão e as variáveis de ambiente
+            if is_interactive() and has_desktop():
+                self.__default_values()
 
     def __default_values(self):
         input_folder_title = select_folder("Selecione a pasta contendo os comprovantes (PDF)")
@@ -32,6 +42,7 @@ class Config(ConfigManager):
         self.set_value("App", "title", APP_TITLE)
         self.set_value("App", "key_values", self.key_values)
         self.set_value("App", "bank_acronyms", self.bank_acronyms)
+        self.set_value("App", "text_backend", TEXT_BACKEND)
         self.set_value("Folder", "input_folder", input_folder_title)
         self.set_value("Folder", "output_folder", output_folder_title)
         self.set_value("Folder", "output_filename", FILENAME)
@@ -48,6 +59,102 @@ class Config(ConfigManager):
         bank_acronyms = self.get_value("App", "bank_acronyms", self.bank_acronyms)
         return string_list_to_json(bank_acronyms, separator=SEPARATOR)
 
+    def get_text_backend(self):
+        text_backend = self.get_value("App", "text_backend", TEXT_BACKEND).strip().lower()
+
+        if text_backend not in TEXT_BACKENDS:
+            raise ValueError(
+                f"Backend de extração de texto inválido: '{text_backend}'. Use: {', '.join(TEXT_BACKENDS)}."
+            )
+
+        return text_backend
+
+    def get_page_window(self) -> int:
+        """Quantidade de páginas analisadas por vez nos documentos grandes (veja `Document.iter_pages`)."""
+        page_window = int(self.get_value("App", "page_window", PAGE_WINDOW))
+
+        if page_window < 1:
+            raise ValueError(f"Janela de páginas inválida: {page_window}. Use um valor maior que zero.")
+
+        return page_window
+
+    def get_memory_limit(self) -> int | None:
+        """Limite de memória do processo, em bytes (`memory_limit_mb`), ou None se não houver limite."""
+        memory_limit_mb = int(self.get_value("App", "memory_limit_mb", MEMORY_LIMIT_MB))
+
+        return memory_limit_mb * 1024 * 1024 if memory_limit_mb > 0 else None
+
+    def get_bundle_by(self) -> str | None:
+        bundle_by = self.get_value("Output", "bundle_by", "").strip().lower()
+
+        if bundle_by and bundle_by not in BUNDLE_KEYS:
+            raise ValueError(f"Agrupamento inválido: '{bundle_by}'. Use: {', '.join(BUNDLE_KEYS)}.")
+
+        return bundle_by or None
+
+    def get_bundle_archive(self) -> str | None:
+        archive = self.get_value("Output", "bundle_archive", "").strip().lower()
+
+        if archive and archive not in ARCHIVE_FORMATS:
+            raise ValueError(f"Formato de pacote inválido: '{archive}'. Use: {', '.join(ARCHIVE_FORMATS)}.")
+
+        return archive or None
+
+    def get_bundle_max_pages(self) -> int:
+        return int(self.get_value("Output", "bundle_max_pages", BUNDLE_MAX_PAGES))
+
+    def get_duplicates(self) -> str:
+        """Política para comprovantes já salvos anteriormente: off, skip, link ou flag."""
+        duplicates = self.get_value("Output", "duplicates", DUPLICATES).strip().lower()
+
+        if duplicates not in DUPLICATE_POLICIES:
+            raise ValueError(f"Política de duplicados inválida: '{duplicates}'. Use: {', '.join(DUPLICATE_POLICIES)}.")
+
+        return duplicates
+
+    def get_optimize(self) -> str:
+        """Perfil de otimização do tamanho dos arquivos gerados: off, compact, small ou smallest."""
+        optimize = self.get_value("Output", "optimize", OUTPUT_PROFILE).strip().lower()
+
+        if optimize not in OUTPUT_PROFILES:
+            raise ValueError(f"Perfil de otimização inválido: '{optimize}'. Use: {', '.join(OUTPUT_PROFILES)}.")
+
+        return optimize
+
+    def get_save_options(self) -> dict:
+        """Opções de gravação (`garbage` e `deflate`) dos arquivos PDF combinados."""
+        return {
+            "garbage": int(self.get_value("Output", "garbage", SAVE_GARBAGE)),
+            "deflate": as_bool(self.get_value("Output", "deflate", str(SAVE_DEFLATE))),
+        }
+
+    def get_prefilter(self) -> bool:
+        return as_bool(self.get_value("App", "prefilter", "false"))
+
+    def get_ocr(self) -> bool:
+        return as_bool(self.get_value("App", "ocr", "false"))
+
+    def get_ocr_language(self) -> str:
+        """Idioma(s) do Tesseract, ex.: `por` ou `por+eng`."""
+        return self.get_value("App", "ocr_language", OCR_LANGUAGE).strip()
+
+    def get_ocr_workers(self) -> int:
+        ocr_workers = int(self.get_value("App", "ocr_workers", OCR_WORKERS))
+
+        if ocr_workers < 1:
+            raise ValueError(f"Quantidade de processos do OCR inválida: {ocr_workers}. Use um valor maior que zero.")
+
+        return ocr_workers
+
+    def get_page_cache(self) -> bool:
+        return as_bool(self.get_value("App", "page_cache", "false"))
+
+    def get_page_cache_size(self) -> int:
+        """Tamanho máximo do cache de páginas, em bytes (`page_cache_mb`), ou 0 se não houver limite."""
+        page_cache_mb = int(self.get_value("App", "page_cache_mb", PAGE_CACHE_MB))
+
+        return max(page_cache_mb, 0) * 1024 * 1024
+
     def get_input_folder(self):
         return self.get_value("Folder", "input_folder", self.input_folder)
 
@@ -56,3 +163,6 @@ class Config(ConfigManager):
 
     def get_output_filename(self):
         return self.get_value("Folder", "output_filename", FILENAME)
+
+    def get_output_filename_max_length(self) -> int:
+        return int(self.get_value("Folder", "output_filename_max_length", FILENAME_MAX_LENGTH))
@@ -1,15 +1,29 @@
 import configparser
+import os
 
 
 class ConfigManager:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, env_prefix: str = None):
         self.file_path = file_path
+        self.env_prefix = env_prefix
         self.config = configparser.ConfigParser()
 
     def read_config(self):
+        """Lê o arquivo de configuração, descartando os valores lidos anteriormente."""
+        self.config = configparser.ConfigParser()
         self.config.read(self.file_path)
 
     def get_value(self, section: str, option: str, fallback=None):
+        """
+        Retorna o valor de uma opção. Se `env_prefix` tiver sido informado, a variável de ambiente
+        `<env_prefix><OPÇÃO>` (ex.: `NOTAS_PDF_INPUT_FOLDER`) tem prioridade sobre o arquivo.
+        """
+        if self.env_prefix:
+            value = os.environ.get(f"{self.env_prefix}{option.upper()}")
+
+            if value is not None:
+                return value
+
         return self.config.get(section, option, fallback=fallback)
 
     def set_value(self, section: str, option: str, value: str = None):
@@ -0,0 +1,270 @@
+import gc
+import io
+import itertools
+import os
+import time
+from typing import Iterator
+
+import fitz
+import pdfplumber
+from pdfminer.pdfpage import LITERAL_PAGE, PDFPage
+from pdfminer.pdftypes import dict_value
+
+from models.optimizer import optimized_bytes
+from utils.constants import PAGE_WINDOW
+from utils.memory import MEGABYTE, current_rss
+
+
+class Document:
+    """
+    Documento PDF de origem, aberto uma única vez durante todo o seu processamento.
+
+    Mantém o `pdfplumber.PDF` (extração de texto) e o `fitz.Document` (divisão das páginas)
+    abertos enquanto o arquivo é processado, evitando que o MuPDF analise o mesmo arquivo
+    novamente a cada página salva. Os recursos são liberados em `close()` ou ao sair do
+    bloco `with`.
+
+    Example:
+        >>> with Document("comprovantes.pdf") as document:
+        >>>     document.split_page(1, "pagina_1.pdf")
+        >>>     print(f"{document.elapsed:.2f}s")
+
+    Documentos grandes devem ser percorridos com `iter_pages`, que processa as páginas em
+    janelas e libera os caches do pdfplumber/pdfminer e do MuPDF entre elas.
+
+    Se `data` for informado (conteúdo já lido do arquivo, veja `prefetch_documents`), o
+    documento é aberto a partir da memória, sem uma nova leitura do disco.
+    """
+
+    def __init__(self, path: str, data: bytes = None):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.data = data
+        self.started_at = time.perf_counter()
+        self.pdf = self.__open_pdf()
+
+        try:
+            self.source = fitz.open(stream=data, filetype="pdf") if data is not None else fitz.open(path)
+        except:
+            self.pdf.close()
+            raise
+
+        self.open_seconds = self.elapsed
+
+    def __enter__(self) -> "Document":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __open_pdf(self, pages: list[int] = None) -> pdfplumber.PDF:
+        return pdfplumber.open(io.BytesIO(self.data) if self.data is not None else self.path, pages=pages)
+
+    @property
+    def pages(self) -> list[pdfplumber.page.Page]:
+        return self.pdf.pages
+
+    @property
+    def page_count(self) -> int:
+        """A quantidade de páginas, obtida do MuPDF sem analisar as páginas com o pdfplumber."""
+        return self.source.page_count
+
+    @property
+    def elapsed(self) -> float:
+        """Tempo, em segundos, desde a abertura do documento."""
+        return time.perf_counter() - self.started_at
+
+    def get_text(self, page_number: int) -> str:
+        """
+        Extrai o texto de uma página com o PyMuPDF, em ordem de leitura.
+
+        Args:
+            page_number (int): O número da página (iniciando em 1).
+        """
+        return self.source[page_number - 1].get_text(sort=True)
+
+    def page_bytes(self, page_number: int, profile: str = "off") -> bytes:
+        """
+        Gera, em memória, um novo arquivo PDF contendo uma única página do documento de origem.
+
+        Args:
+            page_number (int): O número da página (iniciando em 1).
+            profile (str, optional): O perfil de otimização do tamanho (veja `optimized_bytes`).
+        """
+        index = page_number - 1
+
+        with fitz.open() as output_pdf:
+            output_pdf.insert_pdf(self.source, from_page=index, to_page=index)
+            return optimized_bytes(output_pdf, profile)
+
+    def page_output(self, page_number: int, profile: str = "off") -> tuple[bytes, int]:
+        """
+        Como `page_bytes`, mas também retorna o tamanho que o arquivo teria sem otimização,
+        exibido no resumo da execução.
+
+        Returns:
+            tuple: (conteúdo do arquivo, tamanho em bytes sem otimização).
+        """
+        index = page_number - 1
+
+        with fitz.open() as output_pdf:
+            output_pdf.insert_pdf(self.source, from_page=index, to_page=index)
+
+            if profile == "off":
+                data = optimized_bytes(output_pdf, profile)
+                return data, len(data)
+
+            unoptimized = len(optimized_bytes(output_pdf))
+            return optimized_bytes(output_pdf, profile), unoptimized
+
+    def split_page(self, page_number: int, filename: str, profile: str = "off") -> tuple[int, int]:
+        """
+        Salva uma única página do documento de origem em um novo arquivo PDF.
+
+        Args:
+            page_number (int): O número da página (iniciando em 1).
+            filename (str): O caminho do arquivo de saída.
+            profile (str, optional): O perfil de otimização do tamanho (veja `optimized_bytes`).
+
+        Returns:
+            tuple: (bytes gravados, tamanho em bytes sem otimização).
+        """
+        data, unoptimized = self.page_output(page_number, profile)
+
+        # O arquivo pode ter sido reservado com criação exclusiva; `fitz.save` o removeria
+        # e recriaria, abrindo espaço para que outra execução reservasse o mesmo nome.
+        with open(filename, "wb") as output_file:
+            output_file.write(data)
+
+        return len(data), unoptimized
+
+    def iter_pages(
+        self,
+        first_page: int = 1,
+        last_page: int = None,
+        window: int = PAGE_WINDOW,
+        memory_limit: int = None,
+    ) -> Iterator[pdfplumber.page.Page]:
+        """
+        Percorre as páginas do intervalo informado em janelas de no máximo `window` páginas.
+
+        O pdfplumber mantém em cache todas as páginas (e o pdfminer, todos os objetos lidos)
+        enquanto o documento está aberto. Quando o documento é maior que uma janela, a árvore de
+        páginas não é percorrida: cada página é localizada diretamente (veja `iter_page_objects`)
+        e os caches são liberados ao final de cada janela, mantendo a memória estável
+        independentemente da quantidade de páginas e da posição do intervalo no documento.
+
+        Args:
+            first_page (int, optional): A primeira página (iniciando em 1).
+            last_page (int, optional): A última página. Por padrão, a última do documento.
+            window (int, optional): A quantidade de páginas por janela.
+            memory_limit (int, optional): O limite de memória do processo, em bytes. Se for
+                                          ultrapassado ao final de uma janela, a janela é
+                                          reduzida pela metade.
+
+        Raises:
+            MemoryError: Se o limite for ultrapassado mesmo com janelas de uma página.
+        """
+        last_page = min(last_page or self.page_count, self.page_count)
+
+        if self.page_count <= window and first_page == 1:
+            yield from self.pdf.pages[:last_page]
+            return
+
+        # Intervalos no meio do documento (modo `--workers`) começam direto na primeira página,
+        # sem percorrer a árvore de páginas desde o início
+        doctop = self.doctop(first_page)
+        pages_in_window = 0
+
+        for page_number, page_obj in zip(range(first_page, last_page + 1), self.iter_page_objects(first_page)):
+            page = pdfplumber.page.Page(self.pdf, page_obj, page_number=page_number, initial_doctop=doctop)
+            doctop += page.height
+
+            yield page
+
+            page.close()
+            pages_in_window += 1
+
+            if pages_in_window < window:
+                continue
+
+            self.release_caches()
+            pages_in_window = 0
+
+            rss = current_rss()
+
+            if memory_limit and rss and rss > memory_limit:
+                if window == 1:
+                    raise MemoryError(
+                        f"Limite de memória excedido ({rss / MEGABYTE:.0f} MB de {memory_limit / MEGABYTE:.0f} MB)."
+                    )
+
+                window = max(1, window // 2)
+
+    def doctop(self, page_number: int) -> float:
+        """A posição vertical da página no documento (a soma das alturas das anteriores)."""
+        doctop = 0.0
+
+        for index in range(page_number - 1):
+            doctop += self.source.page_cropbox(index).height
+
+        return doctop
+
+    def iter_page_objects(self, first_page: int = 1) -> Iterator[PDFPage]:
+        """
+        Percorre as páginas do pdfminer a partir de `first_page`.
+
+        Cada página é localizada pelo número do objeto informado pelo MuPDF, de modo que o
+        custo não depende da posição da primeira página no documento.
+        Se o número do objeto não corresponder a uma página no pdfminer (ex.: arquivo reparado
+        pelo MuPDF), a árvore de páginas é percorrida desde o início.
+        """
+        for index in range(first_page - 1, self.page_count):
+            page_obj = self.__page_object(index)
+
+            if page_obj is None:
+                yield from itertools.islice(PDFPage.create_pages(self.pdf.doc), index, None)
+                return
+
+            yield page_obj
+
+    def __page_object(self, index: int) -> PDFPage | None:
+        objid = self.source.page_xref(index)
+
+        try:
+            attrs = dict_value(self.pdf.doc.getobj(objid)).copy()
+        except Exception:
+            return None
+
+        if attrs.get("Type") is not LITERAL_PAGE:
+            return None
+
+        # Atributos herdados dos nós ancestrais, como em `PDFPage.create_pages`
+        parent, visited = attrs.get("Parent"), {objid}
+
+        while parent is not None and getattr(parent, "objid", None) not in visited:
+            visited.add(getattr(parent, "objid", None))
+            node = dict_value(parent)
+
+            for key in PDFPage.INHERITABLE_ATTRS:
+                if key not in attrs and key in node:
+                    attrs[key] = node[key]
+
+            parent = node.get("Parent")
+
+        return PDFPage(self.pdf.doc, objid, attrs, None)
+
+    def release_caches(self) -> None:
+        """Libera os objetos já lidos pelo pdfminer e o cache do MuPDF."""
+        for cache in ("_cached_objs", "_parsed_objs"):
+            getattr(self.pdf.doc, cache, {}).clear()
+
+        fitz.TOOLS.store_shrink(100)
+        gc.collect()
+
+    def close(self) -> None:
+        if self.source is not None:
+            self.source.close()
+            self.source = None
+
+        self.pdf.close()
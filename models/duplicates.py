@@ -0,0 +1,126 @@
+import hashlib
+import os
+import re
+import unicodedata
+
+from models.ledger import Ledger
+from utils.output_registry import OutputRegistry
+
+DUPLICATE_POLICIES = ["off", "skip", "link", "flag"]
+DUPLICATES_FOLDER = "duplicados"
+DIGEST_SIZE = 16
+FIELD_KEYS = ["BANK", "RECIPIENT", "VALUE", "DATE"]
+
+NON_ALPHANUMERIC = re.compile(r"[^A-Z0-9]+")
+
+
+def _digest(kind: bytes, content: str) -> bytes:
+    return kind + hashlib.blake2b(content.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+def fingerprints(text: str, fields: dict[str, str | None]) -> list[bytes]:
+    """
+    Calcula as impressões digitais (hashes compactos de 17 bytes) de uma página.
+
+    - Texto: o texto da página sem acentos, em maiúsculas e somente com letras e números, de
+      modo que diferenças de espaçamento e quebras de linha não impeçam a identificação.
+    - Campos: banco, favorecido, valor e data, somente se todos tiverem sido encontrados
+      (identifica o mesmo comprovante digitalizado novamente, com texto diferente).
+
+    Example:
+        >>> len(fingerprints("Valor: R$ 10,00", {"VALUE": "10,00"}))
+        1
+    """
+    normalized = unicodedata.normalize("NFKD", text.upper()).encode("ascii", "ignore").decode("ascii")
+    result = [_digest(b"T", NON_ALPHANUMERIC.sub("", normalized))]
+
+    values = [fields.get(key) for key in FIELD_KEYS]
+
+    if all(values):
+        result.append(_digest(b"F", "\x1f".join(value.upper() for value in values)))
+
+    return result
+
+
+class DuplicateIndex:
+    """
+    Índice de comprovantes já salvos, mantido no `Ledger` entre as execuções.
+
+    Cada página salva tem as suas impressões digitais (veja `fingerprints`) registradas com o
+    caminho do arquivo gerado. Uma página cuja impressão digital já esteja registrada (e cujo
+    arquivo ainda exista) é tratada de acordo com a política configurada:
+
+    - `skip`: a página não é gravada e passa a apontar para o arquivo original.
+    - `link`: a página é gravada como um link físico para o arquivo original (sem ocupar
+      espaço), ou como uma cópia se o link não for possível.
+    - `flag`: a página é gravada normalmente, na subpasta `duplicados` da pasta de saída.
+
+    As páginas cuja gravação ainda está em andamento (no pool de gravação) ficam em `pending`
+    até serem registradas com `add` ou descartadas com `discard`, se a gravação falhar.
+
+    Example:
+        >>> duplicates = DuplicateIndex(ledger, "skip", "saida")
+        >>> original = duplicates.find(page.get_fingerprints())
+    """
+
+    def __init__(self, ledger: Ledger, policy: str, output_dir: str):
+        self.ledger = ledger
+        self.policy = policy
+        self.output_dir = output_dir
+        self.pending: dict[bytes, str] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.policy != "off"
+
+    def find(self, hashes: list[bytes]) -> str | None:
+        """Retorna o arquivo original de uma página já salva com alguma das impressões digitais."""
+        if not self.enabled:
+            return None
+
+        for fingerprint in hashes:
+            if fingerprint in self.pending:
+                return self.pending[fingerprint]
+
+        output_path = self.ledger.find_fingerprint(hashes)
+
+        return output_path if output_path and os.path.exists(output_path) else None
+
+    def hold(self, hashes: list[bytes], output_path: str) -> None:
+        """Reserva as impressões digitais de uma página cuja gravação está em andamento."""
+        if self.enabled:
+            self.pending.update(dict.fromkeys(hashes, output_path))
+
+    def discard(self, hashes: list[bytes]) -> None:
+        """Descarta as impressões digitais reservadas de uma página cuja gravação falhou."""
+        for fingerprint in hashes:
+            self.pending.pop(fingerprint, None)
+
+    def add(self, hashes: list[bytes], output_path: str) -> None:
+        if self.enabled:
+            self.discard(hashes)
+            self.ledger.record_fingerprints(hashes, output_path)
+
+    def flagged_filename(self, name: str) -> str:
+        """Reserva um nome na subpasta de duplicados (política `flag`)."""
+        return OutputRegistry.for_folder(os.path.join(self.output_dir, DUPLICATES_FOLDER)).reserve(name)
+
+    def link(self, original: str, name: str) -> str:
+        """
+        Cria, com um nome único na pasta de saída, um link físico para o arquivo original
+        (política `link`).
+
+        Raises:
+            OSError: Se o sistema de arquivos não permitir o link.
+        """
+        filename = OutputRegistry.for_folder(self.output_dir).reserve(name)
+        temp_filename = f"{filename}.part"
+
+        try:
+            os.link(original, temp_filename)
+            os.replace(temp_filename, filename)
+        except OSError:
+            OutputRegistry.for_folder(self.output_dir).release(filename)
+            raise
+
+        return filename
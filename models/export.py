@@ -0,0 +1,164 @@
+import csv
+import json
+import os
+from decimal import Decimal
+
+EXPORT_FORMATS = ["csv", "jsonl"]
+EXPORT_BUFFER = 500
+
+# (rótulo em maiúsculas, valor)
+Amount = tuple[str, Decimal]
+
+
+def export_format(path: str, format: str = None) -> str:
+    """
+    Retorna o formato de exportação informado ou, se omitido, o indicado pela extensão do arquivo.
+
+    Example:
+        >>> export_format("campos.csv")
+        'csv'
+        >>> export_format("campos.jsonl")
+        'jsonl'
+    """
+    if format:
+        return format
+
+    return "csv" if os.path.splitext(path)[1].lower() == ".csv" else "jsonl"
+
+
+class RecordExporter:
+    """
+    Exporta, à medida que as páginas são processadas, um registro por página com o arquivo de
+    origem, o número da página, a situação, o banco, o favorecido, a data, todos os valores
+    encontrados (convertidos em decimal) e o caminho do arquivo gerado.
+
+    Os registros são acumulados e gravados em blocos de `buffer_size`, em CSV (uma coluna por
+    rótulo de `key_values`) ou em JSON Lines (lista completa de valores). Os valores decimais
+    são gravados como texto (ex.: "1234.56"), sem perda de precisão.
+
+    Example:
+        >>> with RecordExporter("campos.csv", key_values=["VALOR TOTAL", "VALOR"]) as exporter:
+        >>>     exporter.add("a.pdf", 1, "saved", page.fields, page.get_amounts(), page.output_filename)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        format: str = None,
+        key_values: list[str] = None,
+        buffer_size: int = EXPORT_BUFFER,
+        append: bool = False,
+    ):
+        self.path = path
+        self.format = export_format(path, format)
+        self.key_values = [label.upper() for label in key_values or []]
+        self.buffer_size = buffer_size
+        self.records: list[dict] = []
+        self.count = 0
+
+        if self.format not in EXPORT_FORMATS:
+            raise ValueError(f"Formato de exportação inválido: '{self.format}'. Use: {', '.join(EXPORT_FORMATS)}.")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Com `append`, os registros são acrescentados ao arquivo existente (ex.: ao retomar um lote)
+        mode = "a" if append else "w"
+
+        if self.format == "csv":
+            # utf-8-sig para que o Excel reconheça a codificação
+            self.file = open(path, mode, encoding="utf-8-sig", newline="")
+            self.columns = ["source", "page", "status", "bank", "recipient", "date", *self.key_values, "output", "error"]
+            self.writer = csv.DictWriter(self.file, fieldnames=self.columns, extrasaction="ignore")
+
+            if self.file.tell() == 0:
+                self.writer.writeheader()
+        else:
+            self.file = open(path, mode, encoding="utf-8")
+
+            # Uma linha incompleta (gravação interrompida) não se junta ao próximo registro
+            if self.file.tell() and not self.__ends_with_newline():
+                self.file.write("\n")
+
+    def __ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b"\n"
+
+    def __enter__(self) -> "RecordExporter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def add(
+        self,
+        source: str,
+        page_number: int,
+        status: str,
+        fields: dict[str, str | None] = None,
+        amounts: list[Amount] = None,
+        output_path: str = None,
+        error: str = None,
+    ) -> None:
+        """
+        Adiciona o registro de uma página.
+
+        Args:
+            source (str): O caminho do documento de origem.
+            page_number (int): O número da página (iniciando em 1).
+            status (str): A situação da página: `saved`, `skipped`, `duplicate` ou `failed`.
+            fields (dict, optional): Os campos extraídos da página.
+            amounts (list, optional): Os valores encontrados, como tuplas (rótulo, valor).
+            output_path (str, optional): O caminho do arquivo gerado.
+            error (str, optional): O motivo da falha.
+        """
+        fields = fields or {}
+
+        self.records.append(
+            {
+                "source": source,
+                "page": page_number,
+                "status": status,
+                "bank": fields.get("BANK"),
+                "recipient": fields.get("RECIPIENT"),
+                "date": fields.get("DATE"),
+                "amounts": [{"label": label, "value": str(value)} for label, value in amounts or []],
+                "output": output_path,
+                "error": error,
+            }
+        )
+
+        if len(self.records) >= self.buffer_size:
+            self.flush()
+
+    def __csv_row(self, record: dict) -> dict:
+        row = dict(record)
+
+        for amount in record["amounts"]:
+            if amount["label"] in self.key_values:
+                previous = row.get(amount["label"])
+                row[amount["label"]] = f"{previous};{amount['value']}" if previous else amount["value"]
+
+        return row
+
+    def flush(self) -> None:
+        """Grava os registros acumulados."""
+        if not self.records:
+            return
+
+        if self.format == "csv":
+            self.writer.writerows(self.__csv_row(record) for record in self.records)
+        else:
+            self.file.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in self.records))
+
+        self.file.flush()
+        self.count += len(self.records)
+        self.records.clear()
+
+    def close(self) -> None:
+        if self.file.closed:
+            return
+
+        self.flush()
+        self.file.close()
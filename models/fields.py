@@ -0,0 +1,151 @@
+import re
+from decimal import Decimal
+from typing import List, Tuple
+
+from utils.constants import RECIPIENT_LABELS
+
+PATTERN_VALUE = r"(\d+(?:[.,]\d{3})*(?:[.,]\d+)?)"
+PATTERN_DATE = re.compile(r"\b(\d{2}/\d{2}/\d{4})\b")
+
+
+def parse_amount(value: str) -> Decimal:
+    """
+    Converte um valor monetário extraído do texto em `Decimal`.
+
+    O último separador (ponto ou vírgula) é o decimal, exceto quando é o único tipo de
+    separador do valor e aparece mais de uma vez ou é seguido por exatamente três dígitos:
+    nesse caso, todos são separadores de milhar.
+
+    Example:
+        >>> parse_amount("1.234,56")
+        Decimal('1234.56')
+        >>> parse_amount("2,345.67")
+        Decimal('2345.67')
+        >>> parse_amount("1.234")
+        Decimal('1234')
+    """
+    position = max(value.rfind(","), value.rfind("."))
+
+    if position == -1:
+        return Decimal(value)
+
+    separator = value[position]
+    integer, fraction = value[:position], value[position + 1 :]
+    only_separator = ("," if separator == "." else ".") not in value
+
+    if only_separator and (separator in integer or len(fraction) == 3):
+        # Somente separadores de milhar (ex.: "1.234" ou "1.234.567")
+        return Decimal(value.replace(separator, ""))
+
+    return Decimal(f"{integer.replace(',', '').replace('.', '')}.{fraction}")
+
+
+class FieldExtractor:
+    """
+    Extrator dos campos de um comprovante (banco, favorecido e valores), com os padrões
+    compilados uma única vez a partir da configuração.
+
+    Os nomes dos bancos são procurados com uma única alternação compilada, em vez de uma
+    busca no texto para cada banco configurado.
+
+    Example:
+        >>> extractor = FieldExtractor(["VALOR"], {"CAIXA": "CEF"})
+        >>> extractor.extract("CAIXA\\nFavorecido: FULANO\\nValor: R$ 10,00")
+        {'BANK': 'CEF', 'RECIPIENT': 'FULANO', 'VALUE': '10,00', 'DATE': None}
+    """
+
+    def __init__(
+        self,
+        key_values: list[str],
+        bank_acronyms: dict[str, str],
+        recipient_labels: list[str] = RECIPIENT_LABELS,
+    ):
+        key_words = "|".join(key_values)
+        recipient_words = "|".join(recipient_labels)
+
+        self.currency_pattern = re.compile(rf"({key_words}):?\s*R?\$?\s?{PATTERN_VALUE}", re.IGNORECASE)
+
+        # Padrão de expressão regular para encontrar textos após as palavras específicas
+        self.recipient_pattern = re.compile(rf"({recipient_words}):?\s*([a-zA-Z\s]+?)\s*(?:-|\n|$)", re.IGNORECASE)
+
+        self.bank_acronyms = {name.upper(): acronym for name, acronym in bank_acronyms.items()}
+        self.bank_priority = {name: index for index, name in enumerate(self.bank_acronyms)}
+
+        # Nomes contidos em outros nomes (ex.: "CAIXA" em "CAIXA ECONOMICA") também são considerados
+        # encontrados, já que a alternação consome apenas o nome mais longo na mesma posição.
+        self.bank_contains = {
+            name: [other for other in self.bank_acronyms if other in name]
+            for name in self.bank_acronyms
+        }
+
+        names = sorted(self.bank_acronyms, key=len, reverse=True)
+        self.bank_pattern = (
+            re.compile("|".join(re.escape(name) for name in names), re.IGNORECASE) if names else None
+        )
+
+    def extract_currency_values(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Extrai valores monetários do texto fornecido.
+
+        A função procura por palavras específicas seguidos por valores
+        com separadores opcionais de ponto ou vírgula.
+
+        Returns:
+            list of tuples: Uma lista de tuplas onde cada tupla contém a palavra identificada e o valor correspondente.
+                            Exemplo: [('Valor principal', '1.234,56'), ('Valor nominal', '2,345.67'), ('Valor total', '300,50'), ('Valor', '400.00')]
+        """
+        return self.currency_pattern.findall(text)
+
+    def extract_amounts(self, text: str) -> List[Tuple[str, Decimal]]:
+        """
+        Extrai todos os valores monetários do texto, com o rótulo em maiúsculas e o valor
+        convertido em `Decimal`.
+
+        Example:
+            >>> extractor.extract_amounts("Valor total: R$ 1.234,56")
+            [('VALOR TOTAL', Decimal('1234.56'))]
+        """
+        return [(label.upper(), parse_amount(value)) for label, value in self.extract_currency_values(text)]
+
+    def get_bank_acronym(self, text: str) -> str | None:
+        """Retorna a sigla do primeiro banco configurado (na ordem da configuração) presente no texto."""
+        if self.bank_pattern is None:
+            return None
+
+        found = set()
+
+        for match in self.bank_pattern.finditer(text):
+            found.update(self.bank_contains.get(match.group(0).upper(), ()))
+
+        if not found:
+            return None
+
+        return self.bank_acronyms[min(found, key=self.bank_priority.get)]
+
+    def get_recipient_name(self, text: str) -> str | None:
+        match = self.recipient_pattern.search(text)
+
+        return match.group(2).strip() if match else None
+
+    def get_date(self, text: str) -> str | None:
+        """Retorna a primeira data (dd/mm/aaaa) encontrada no texto."""
+        match = PATTERN_DATE.search(text)
+
+        return match.group(1) if match else None
+
+    def extract(self, text: str) -> dict[str, str | None]:
+        """
+        Extrai todos os campos do texto de uma página.
+
+        Returns:
+            dict: Os campos `BANK`, `RECIPIENT`, `VALUE` (o primeiro valor monetário encontrado)
+                  e `DATE` (a primeira data encontrada). Campos não encontrados têm valor None.
+        """
+        values = self.extract_currency_values(text)
+
+        return {
+            "BANK": self.get_bank_acronym(text),
+            "RECIPIENT": self.get_recipient_name(text),
+            "VALUE": values[0][1] if values else None,
+            "DATE": self.get_date(text),
+        }
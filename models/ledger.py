@@ -0,0 +1,312 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from decimal import Decimal
+
+from models.export import Amount
+from utils.constants import LEDGER_FILE
+from utils.file_helpers import is_within, normalize_path
+from utils.helper import get_app_directory
+
+CHUNK_SIZE = 1024 * 1024
+
+# (caminho do arquivo de saída, campos registrados, valores encontrados)
+ProcessedPage = tuple[str, dict[str, str | None], list[Amount]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    sha256 TEXT PRIMARY KEY,
+    page_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    sha256 TEXT NOT NULL,
+    page_number INTEGER NOT NULL,
+    output_path TEXT NOT NULL,
+    bank TEXT,
+    recipient TEXT,
+    value TEXT,
+    date TEXT,
+    amounts TEXT,
+    processed_at REAL NOT NULL,
+    PRIMARY KEY (sha256, page_number)
+);
+CREATE TABLE IF NOT EXISTS rejected_pages (
+    sha256 TEXT NOT NULL,
+    page_number INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    PRIMARY KEY (sha256, page_number)
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    hash BLOB PRIMARY KEY,
+    output_path TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ocr_cache (
+    hash BLOB PRIMARY KEY,
+    text TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Colunas acrescentadas depois da criação da tabela `pages`, incluídas em registros antigos
+PAGE_COLUMNS = {"date": "TEXT", "amounts": "TEXT"}
+
+
+class Ledger:
+    """
+    Registro local (SQLite) das páginas já processadas, usado para processar somente
+    páginas novas ou alteradas em execuções seguintes.
+
+    Cada arquivo de origem é identificado pelo hash SHA-256 do seu conteúdo. O hash é
+    reaproveitado enquanto o tamanho e a data de modificação do arquivo não mudarem, de
+    modo que arquivos já conhecidos não precisam ser lidos novamente. Para cada página
+    salva, são registrados o arquivo de saída, os campos extraídos e os valores encontrados
+    (usados na exportação das páginas ignoradas em execuções seguintes). As páginas rejeitadas
+    pelo pré-filtro também são registradas, para que o documento possa ser considerado
+    completo mesmo com páginas rejeitadas.
+
+    Uma página só é considerada processada se o seu arquivo de saída ainda existir na pasta
+    de saída atual: com outra pasta de saída (`-o`), as páginas são gravadas novamente.
+
+    Example:
+        >>> with Ledger() as ledger:
+        >>>     file_hash = ledger.file_hash("comprovantes.pdf")
+        >>>     done = ledger.processed_pages(file_hash, "saida")
+        >>>     ledger.record(file_hash, 1, "saida/BB FULANO R$ 10,00.pdf", fields, amounts)
+        >>>     ledger.commit()
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(get_app_directory(), LEDGER_FILE)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(SCHEMA)
+        self.__migrate()
+
+    def __migrate(self) -> None:
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(pages)")}
+
+        for column, kind in PAGE_COLUMNS.items():
+            if column not in columns:
+                self.connection.execute(f"ALTER TABLE pages ADD COLUMN {column} {kind}")
+
+    def __enter__(self) -> "Ledger":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def file_hash(self, path: str, data: bytes = None) -> str:
+        """
+        Retorna o hash do conteúdo do arquivo, calculando-o somente se o arquivo for
+        desconhecido ou se o tamanho ou a data de modificação tiverem mudado.
+
+        Se o conteúdo (`data`) já tiver sido lido, o hash é calculado sobre ele, sem ler o
+        arquivo novamente.
+        """
+        key = normalize_path(path)
+        stat = os.stat(path)
+        row = self.connection.execute(
+            "SELECT size, mtime_ns, sha256 FROM files WHERE path = ?", (key,)
+        ).fetchone()
+
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+
+        sha256 = hashlib.sha256()
+
+        if data is not None:
+            sha256.update(data)
+        else:
+            with open(path, "rb") as file:
+                while chunk := file.read(CHUNK_SIZE):
+                    sha256.update(chunk)
+
+        file_hash = sha256.hexdigest()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+            (key, stat.st_size, stat.st_mtime_ns, file_hash),
+        )
+
+        return file_hash
+
+    def page_count(self, file_hash: str) -> int | None:
+        row = self.connection.execute(
+            "SELECT page_count FROM documents WHERE sha256 = ?", (file_hash,)
+        ).fetchone()
+
+        return row[0] if row else None
+
+    def set_page_count(self, file_hash: str, page_count: int) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO documents (sha256, page_count) VALUES (?, ?)",
+            (file_hash, page_count),
+        )
+
+    def processed_pages(self, file_hash: str, output_folder: str) -> dict[int, ProcessedPage]:
+        """
+        Retorna as páginas já processadas do arquivo cujo arquivo de saída ainda existe na
+        pasta de saída informada (ou em uma de suas subpastas).
+
+        Returns:
+            dict: `número da página -> (caminho do arquivo de saída, campos, valores)`.
+        """
+        rows = self.connection.execute(
+            "SELECT page_number, output_path, bank, recipient, value, date, amounts FROM pages WHERE sha256 = ?",
+            (file_hash,),
+        )
+
+        return {
+            page_number: (
+                output_path,
+                {"BANK": bank, "RECIPIENT": recipient, "VALUE": value, "DATE": date},
+                [(label, Decimal(amount)) for label, amount in json.loads(amounts or "[]")],
+            )
+            for page_number, output_path, bank, recipient, value, date, amounts in rows
+            if is_within(output_path, output_folder) and os.path.exists(output_path)
+        }
+
+    def rejected_pages(self, file_hash: str) -> dict[int, str]:
+        """
+        Retorna as páginas do arquivo rejeitadas pelo pré-filtro.
+
+        Returns:
+            dict: `número da página -> motivo da rejeição`.
+        """
+        rows = self.connection.execute(
+            "SELECT page_number, reason FROM rejected_pages WHERE sha256 = ?", (file_hash,)
+        )
+
+        return dict(rows)
+
+    def is_complete(
+        self, file_hash: str, processed_pages: dict[int, ProcessedPage], rejected_pages: dict[int, str] = None
+    ) -> bool:
+        """Indica se todas as páginas do arquivo já foram processadas (ou rejeitadas pelo pré-filtro)."""
+        page_count = self.page_count(file_hash)
+        pages = processed_pages.keys() | (rejected_pages or {}).keys()
+
+        return page_count is not None and len(pages) >= page_count
+
+    def record(
+        self,
+        file_hash: str,
+        page_number: int,
+        output_path: str,
+        fields: dict[str, str | None],
+        amounts: list[Amount] = None,
+    ) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO pages "
+            "(sha256, page_number, output_path, bank, recipient, value, date, amounts, processed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                file_hash,
+                page_number,
+                output_path,
+                fields.get("BANK"),
+                fields.get("RECIPIENT"),
+                fields.get("VALUE"),
+                fields.get("DATE"),
+                json.dumps([[label, str(value)] for label, value in amounts or []], ensure_ascii=False),
+                time.time(),
+            ),
+        )
+        self.connection.execute(
+            "DELETE FROM rejected_pages WHERE sha256 = ? AND page_number = ?", (file_hash, page_number)
+        )
+
+    def record_rejected(self, file_hash: str, page_number: int, reason: str) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO rejected_pages (sha256, page_number, reason) VALUES (?, ?, ?)",
+            (file_hash, page_number, reason),
+        )
+
+    def merge(self, path: str, moved: dict[str, str]) -> int:
+        """
+        Incorpora o registro de um lote do processamento distribuído (`--batch`): os documentos,
+        as páginas rejeitadas, as páginas salvas e as impressões digitais, com os caminhos de
+        saída definitivos (`moved`: caminho na pasta do lote -> caminho na pasta de destino).
+
+        As páginas (e impressões digitais) cujo arquivo não foi movido para a pasta de destino
+        não são registradas.
+
+        Returns:
+            int: A quantidade de páginas registradas.
+        """
+        moved = {normalize_path(source): target for source, target in moved.items()}
+        pages = []
+        fingerprints = []
+
+        with Ledger(path) as shard:
+            documents = shard.connection.execute("SELECT sha256, page_count FROM documents").fetchall()
+            rejected = shard.connection.execute("SELECT sha256, page_number, reason FROM rejected_pages").fetchall()
+
+            for row in shard.connection.execute(
+                "SELECT sha256, page_number, output_path, bank, recipient, value, date, amounts, processed_at FROM pages"
+            ):
+                if target := moved.get(normalize_path(row[2])):
+                    pages.append((*row[:2], target, *row[3:]))
+
+            for fingerprint, output_path in shard.connection.execute("SELECT hash, output_path FROM fingerprints"):
+                if target := moved.get(normalize_path(output_path)):
+                    fingerprints.append((fingerprint, target))
+
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO documents (sha256, page_count) VALUES (?, ?)", documents
+        )
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO rejected_pages (sha256, page_number, reason) VALUES (?, ?, ?)", rejected
+        )
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO pages "
+            "(sha256, page_number, output_path, bank, recipient, value, date, amounts, processed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            pages,
+        )
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO fingerprints (hash, output_path) VALUES (?, ?)", fingerprints
+        )
+
+        return len(pages)
+
+    def find_fingerprint(self, hashes: list[bytes]) -> str | None:
+        """Retorna o arquivo de saída registrado para a primeira impressão digital encontrada."""
+        for fingerprint in hashes:
+            row = self.connection.execute(
+                "SELECT output_path FROM fingerprints WHERE hash = ?", (fingerprint,)
+            ).fetchone()
+
+            if row:
+                return row[0]
+
+        return None
+
+    def record_fingerprints(self, hashes: list[bytes], output_path: str) -> None:
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO fingerprints (hash, output_path) VALUES (?, ?)",
+            [(fingerprint, output_path) for fingerprint in hashes],
+        )
+
+    def find_ocr_text(self, image_hash: bytes) -> str | None:
+        """Retorna o texto reconhecido anteriormente pelo OCR para as imagens de uma página."""
+        row = self.connection.execute("SELECT text FROM ocr_cache WHERE hash = ?", (image_hash,)).fetchone()
+
+        return row[0] if row else None
+
+    def record_ocr_text(self, image_hash: bytes, text: str) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO ocr_cache (hash, text) VALUES (?, ?)", (image_hash, text)
+        )
+
+    def commit(self) -> None:
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.commit()
+        self.connection.close()
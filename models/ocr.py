@@ -0,0 +1,131 @@
+import hashlib
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable
+
+import fitz
+
+from models.ledger import Ledger
+from models.prefilter import MIN_TEXT_LENGTH
+
+OCR_LANGUAGE = "por"
+OCR_DPI = 300
+OCR_WORKERS = 2
+
+# Páginas aguardando o OCR por documento; acima disso, a próxima página espera o resultado
+MAX_PENDING_OCR = 32
+
+
+def is_scanned(text: str, source_page: fitz.Page) -> bool:
+    """Indica se a página é uma digitalização: quase nenhum texto, mas com imagens."""
+    return len("".join(text.split())) < MIN_TEXT_LENGTH and bool(source_page.get_images())
+
+
+def image_hash(source_page: fitz.Page, language: str = OCR_LANGUAGE) -> bytes:
+    """
+    Hash (BLAKE2b, 16 bytes) das imagens da página, sem decodificá-las, usado como chave do
+    cache do OCR. A mesma digitalização tem o mesmo hash mesmo em outro arquivo.
+    """
+    digest = hashlib.blake2b(language.encode(), digest_size=16)
+
+    for image in source_page.get_images(full=True):
+        digest.update(source_page.parent.xref_stream_raw(image[0]) or b"")
+
+    return digest.digest()
+
+
+def recognize(data: bytes, language: str, dpi: int, tessdata: str) -> str:
+    """Reconhece o texto de um PDF de uma página (executado em um processo do pool do OCR)."""
+    with fitz.open(stream=data, filetype="pdf") as document:
+        page = document[0]
+        textpage = page.get_textpage_ocr(language=language, dpi=dpi, full=True, tessdata=tessdata)
+
+        return page.get_text(textpage=textpage)
+
+
+class OcrPool:
+    """
+    Reconhecimento de texto (Tesseract, pelo PyMuPDF) das páginas digitalizadas, em um pool
+    de processos próprio, para que as páginas com texto não esperem pelo OCR.
+
+    Os resultados são gravados no `ledger`, pelo hash das imagens da página (veja `image_hash`):
+    uma digitalização já reconhecida, nesta ou em outra execução, não passa pelo OCR novamente.
+
+    Example:
+        >>> with OcrPool(ledger) as ocr:
+        >>>     key = image_hash(document.source[0])
+        >>>     ocr.submit(key, lambda: document.page_bytes(1))
+        >>>     text = ocr.result(key)
+
+    Raises:
+        RuntimeError: Se o Tesseract-OCR não estiver instalado.
+    """
+
+    def __init__(self, ledger: Ledger, language: str = OCR_LANGUAGE, workers: int = OCR_WORKERS, dpi: int = OCR_DPI):
+        self.tessdata = fitz.get_tessdata()
+
+        if not self.tessdata:
+            raise RuntimeError("Tesseract-OCR não encontrado. Instale-o ou defina a variável TESSDATA_PREFIX.")
+
+        self.ledger = ledger
+        self.language = language
+        self.dpi = dpi
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.pending: dict[bytes, Future] = {}
+        self.waiting = Counter()
+        self.fresh: set[bytes] = set()
+        self.recognized = 0
+        self.cached = 0
+
+    def __enter__(self) -> "OcrPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def submit(self, key: bytes, load: Callable[[], bytes]) -> None:
+        """
+        Agenda o reconhecimento da página, se o resultado ainda não for conhecido.
+
+        Args:
+            key (bytes): O hash das imagens da página.
+            load (Callable): Retorna o conteúdo (PDF de uma página) a ser reconhecido; só é
+                             chamada quando o resultado não está no cache.
+        """
+        self.waiting[key] += 1
+
+        if key in self.pending:
+            return
+
+        text = self.ledger.find_ocr_text(key)
+
+        if text is None:
+            self.pending[key] = self.executor.submit(recognize, load(), self.language, self.dpi, self.tessdata)
+            self.fresh.add(key)
+            self.recognized += 1
+        else:
+            self.pending[key] = future = Future()
+            future.set_result(text)
+            self.cached += 1
+
+    def result(self, key: bytes) -> str:
+        """Aguarda e retorna o texto reconhecido de uma página agendada com `submit`."""
+        future = self.pending[key]
+
+        try:
+            text = future.result()
+
+            if key in self.fresh:
+                self.ledger.record_ocr_text(key, text)
+                self.fresh.discard(key)
+        finally:
+            self.waiting[key] -= 1
+
+            if not self.waiting[key]:
+                del self.waiting[key]
+                del self.pending[key]
+
+        return text
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
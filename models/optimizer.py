@@ -0,0 +1,89 @@
+import fitz
+
+OUTPUT_PROFILES = ["off", "compact", "small", "smallest"]
+
+# Resolução máxima e qualidade JPEG das imagens no perfil "smallest"
+IMAGE_DPI = 150
+IMAGE_QUALITY = 75
+
+
+def downsample_images(document: fitz.Document, dpi: int = IMAGE_DPI, quality: int = IMAGE_QUALITY) -> int:
+    """
+    Reduz para `dpi` as imagens exibidas com resolução maior, regravando-as em JPEG.
+
+    Imagens com transparência (máscara) ou que já estejam na resolução indicada são mantidas,
+    assim como as imagens cuja nova versão não seja menor que a original.
+
+    Returns:
+        int: A quantidade de imagens substituídas.
+    """
+    replaced = 0
+
+    for page in document:
+        for xref, smask, width, height, *_ in page.get_images(full=True):
+            rects = page.get_image_rects(xref)
+
+            if smask or not rects:
+                continue
+
+            scale = dpi / 72 * max(rect.width for rect in rects) / width
+
+            if scale >= 1:
+                continue
+
+            pixmap = fitz.Pixmap(document, xref)
+
+            if pixmap.colorspace is None or pixmap.colorspace.n not in (1, 3):
+                pixmap = fitz.Pixmap(fitz.csRGB, pixmap)
+
+            if pixmap.alpha:
+                continue
+
+            pixmap = fitz.Pixmap(pixmap, max(1, round(width * scale)), max(1, round(height * scale)), None)
+            data = pixmap.tobytes("jpeg", jpg_quality=quality)
+
+            if len(data) < len(document.xref_stream_raw(xref) or b""):
+                page.replace_image(xref, stream=data)
+                replaced += 1
+
+    return replaced
+
+
+def optimized_bytes(document: fitz.Document, profile: str = "off") -> bytes:
+    """
+    Gera o conteúdo do PDF com o perfil de otimização informado.
+
+    Ao copiar uma página, o PDF gerado leva as fontes completas e os recursos compartilhados
+    do documento de origem. Os perfis reduzem o tamanho dos arquivos, em ordem crescente de
+    custo de processamento:
+
+    - `off`: sem otimização (mais rápido).
+    - `compact`: remove os objetos não usados e duplicados e comprime os fluxos, as fontes e as imagens.
+    - `small`: como `compact`, e mantém nas fontes embutidas somente os caracteres usados.
+    - `smallest`: como `small`, e reduz as imagens para 150 dpi (JPEG), com perda de qualidade.
+      Os fluxos também são comparados na remoção dos duplicados, já que a imagem substituída
+      continua referenciada pelo recurso original.
+
+    Example:
+        >>> with fitz.open() as output_pdf:
+        >>>     output_pdf.insert_pdf(source, from_page=0, to_page=0)
+        >>>     data = optimized_bytes(output_pdf, "small")
+
+    Raises:
+        ValueError: Se o perfil for desconhecido.
+    """
+    if profile not in OUTPUT_PROFILES:
+        raise ValueError(f"Perfil de otimização inválido: '{profile}'. Use: {', '.join(OUTPUT_PROFILES)}.")
+
+    if profile == "off":
+        return document.tobytes()
+
+    if profile in ("small", "smallest"):
+        document.subset_fonts()
+
+    if profile == "smallest":
+        downsample_images(document)
+
+    garbage = 4 if profile == "smallest" else 3
+
+    return document.tobytes(garbage=garbage, deflate=True, deflate_images=True, deflate_fonts=True)
@@ -1,35 +1,112 @@
 import os
-import re
-from typing import List, Tuple
+from decimal import Decimal
+from functools import partial
+from typing import Callable
 
-import fitz
 import pdfplumber
 from pdfminer.pdfpage import PDFPage
 
-from models.config import Config
+from models.bundle import BundleWriter
+from models.document import Document
+from models.duplicates import fingerprints
+from models.ocr import image_hash, is_scanned
+from models.page_cache import PageCache, page_key
+from models.pipeline import OutputWriter
+from models.settings import Settings
 from utils.helper import *
-from utils.string_helpers import replace_words
+from utils.metrics import timed
+from utils.output_registry import OutputRegistry
 
 DEFAULT_OUTPUT_DIR_NAME = "output"
 
+# Campos que, se não encontrados no texto do PyMuPDF, levam o backend `auto` ao pdfplumber
+AUTO_FIELDS = ["BANK", "RECIPIENT", "VALUE"]
+
+
+def output_name(settings: Settings, fields: dict[str, str | None], page_number: int, source: str) -> str:
+    """
+    Monta o nome do arquivo de saída (sem sufixo numérico e sem extensão) a partir dos campos
+    extraídos de uma página.
+
+    Raises:
+        ValueError: Se nenhum valor monetário for encontrado na página.
+    """
+    if fields["VALUE"] is None:
+        raise ValueError("Nenhum valor encontrado na página.")
+
+    return settings.filename_template.render({**fields, "PAGE": page_number, "SOURCE": os.path.splitext(source)[0]})
+
 
 class Page(pdfplumber.page.Page):
     def __init__(
         self,
-        pdf: pdfplumber.pdf.PDF,
+        document: Document,
         page_obj: PDFPage,
         page_number: int,
+        settings: Settings,
         initial_doctop: pdfplumber.page.T_num = 0,
+        text_backend: str = None,
+        cache: PageCache = None,
     ):
-        self.pdf = pdf
+        self.document = document
+        self.pdf = document.pdf
         self.root_page = self
         self.page_obj = page_obj
         self.page_number = page_number
         self.initial_doctop = initial_doctop
-        self.text = page_obj.extract_text()
-        self.dirname = os.path.dirname(self.pdf.path)
-        self.filename = os.path.basename(self.pdf.path)
-        self.config = Config()
+        self.dirname = os.path.dirname(self.document.path)
+        self.filename = self.document.name
+        self.settings = settings
+        self.extractor = settings.field_extractor
+        self.fields = None
+        self.output_filename = None
+        self.bytes_written = 0
+        self.bytes_unoptimized = 0
+        self.error = None
+        self.timings = {}
+        self.text_backend = text_backend or settings.text_backend
+        self.fast_text = None
+        self.rejected = None
+        self.scanned = False
+        self.text = ""
+        self.cache = cache
+        self.cache_key = None
+        self.cached = False
+
+        if cache:
+            with timed(self.timings, "page_cache"):
+                self.cache_key = page_key(self.document.source[page_number - 1], settings.page_cache_signature)
+                entry = cache.get(self.cache_key)
+
+            # Página já extraída (neste ou em outro arquivo): o texto e os campos vêm do cache
+            if entry:
+                self.text, self.fields, self.text_backend = entry
+                self.cached = True
+                return
+
+        page_filter = settings.page_filter
+
+        if page_filter:
+            with timed(self.timings, "prefilter"):
+                self.fast_text = self.document.get_text(page_number)
+                self.rejected = page_filter.classify(self.fast_text, self.document.source[page_number - 1])
+
+        # Com o OCR ativado, as páginas digitalizadas seguem para o reconhecimento de texto
+        if self.rejected == "image_only" and settings.ocr:
+            self.rejected = None
+            self.scanned = True
+
+        if self.rejected is None and not self.scanned:
+            with timed(self.timings, "extract_text"):
+                self.text = self.__extract_text()
+
+            self.scanned = settings.ocr and is_scanned(self.text, self.document.source[page_number - 1])
+
+            # Campos já interpretados na escolha do backend (`auto`)
+            if self.fields is not None and not self.scanned:
+                self.__cache_put()
+            else:
+                self.fields = None
 
     def __enter__(self) -> "Page":
         return self
@@ -37,113 +114,180 @@ class Page(pdfplumber.page.Page):
     def __exit__(self) -> None:
         self.close()
 
-    def save(self) -> bool:
+    def save(
+        self, filename: str = None, writer: OutputWriter = None, on_done: Callable[[bool], None] = None
+    ) -> bool:
+        """
+        Salva a página em um novo arquivo PDF.
+
+        Args:
+            filename (str, opcional): O caminho do arquivo de saída. Se não fornecido,
+                                      um nome único é gerado na pasta de saída.
+            writer (OutputWriter, opcional): Se informado, a gravação do arquivo é agendada no
+                                             pool de gravação em vez de ser feita aqui.
+            on_done (Callable, opcional): Chamada uma única vez com o resultado da gravação:
+                                          com `writer`, quando o pool concluir a gravação;
+                                          caso contrário, antes do retorno. Se a gravação
+                                          falhar, `error` é preenchido e `output_filename`
+                                          volta a ser None.
+
+        Returns:
+            bool: True se a página foi salva (ou, com `writer`, agendada) com sucesso.
+        """
         success = False
+        reserved = None
 
         try:
-            doc = fitz.open(self.pdf.path)
-            output_pdf = fitz.open()
-            output_pdf_pg_num = self.page_number - 1
-            output_pdf.insert_pdf(
-                doc,
-                from_page=output_pdf_pg_num,
-                to_page=output_pdf_pg_num
-            )
-            output_pdf.save(self.__get_unique_name())
+            if filename is None:
+                self.get_fields()
+
+                with timed(self.timings, "name"):
+                    filename = reserved = self.__get_unique_name()
+
+            with timed(self.timings, "save"):
+                if writer:
+                    data, self.bytes_unoptimized = self.document.page_output(self.page_number, self.settings.optimize)
+                    self.output_filename = filename
+                    self.bytes_written = len(data)
+                    writer.write(filename, data, partial(self.__written, on_done))
+                    return True
+
+                self.bytes_written, self.bytes_unoptimized = self.document.split_page(
+                    self.page_number, filename, self.settings.optimize
+                )
+
+            self.output_filename = filename
             success = True
-        except:
-            pass
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self.output_filename = None
+
+            if reserved:
+                OutputRegistry.for_folder(self.settings.output_folder).release(reserved)
         finally:
             self.page_obj.close()
 
+        if on_done:
+            on_done(success)
+
         return success
 
-    def __extract_currency_values(self, index: int = None) -> List[Tuple[str, str]]:
-        """
-        Extrai valores monetários do texto fornecido.
+    def __written(self, on_done: Callable[[bool], None] | None, write_error: str | None) -> None:
+        """Resultado de uma gravação agendada no pool de gravação (veja `save`)."""
+        if write_error:
+            self.error = write_error
+            self.output_filename = None
+            self.bytes_written = 0
+            self.bytes_unoptimized = 0
 
-        A função procura por palavras específicas seguidos por valores
-        com separadores opcionais de ponto ou vírgula.
+        if on_done:
+            on_done(write_error is None)
 
-        Args:
-            index (int, opcional): Um índice específico para retornar apenas o valor encontrado nessa posição.
-                                    Se não fornecido, todos os valores encontrados serão retornados.
-                                    O valor padrão é None.
+    def add_to_bundle(self, bundle: BundleWriter, file_hash: str = None) -> bool:
+        """
+        Adiciona a página ao arquivo combinado do seu grupo (veja `BundleWriter`).
+
+        Assim como em `save`, somente páginas com um valor monetário são aceitas.
 
         Returns:
-            list of tuples: Uma lista de tuplas onde cada tupla contém a palavra identificada e o valor correspondente.
-                            Exemplo: [('Valor principal', '1.234,56'), ('Valor nominal', '2,345.67'), ('Valor total', '300,50'), ('Valor', '400.00')]
+            bool: True se a página foi adicionada com sucesso.
+        """
+        success = False
 
-                            Se um índice for fornecido, retorna apenas a tupla nessa posição.
-                            Exemplo: ('Valor principal', '1.234,56')
+        try:
+            self.get_fields()
+
+            with timed(self.timings, "name"):
+                self.get_name()
+
+            with timed(self.timings, "save"):
+                bundle.add(
+                    self.document.source, self.page_number - 1, self.fields, file_hash, self.page_number, self.get_amounts()
+                )
+
+            success = True
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            self.page_obj.close()
+
+        return success
+
+    def __extract_text(self) -> str:
         """
+        Extrai o texto da página com o backend configurado.
 
-        words = "|".join(self.config.get_key_values())
-        pattern_symbol = rf"({words}):?\s*R?\$?\s?"
-        pattern_value = r"(\d+(?:[.,]\d{3})*(?:[.,]\d+)?)"
-        pattern = pattern_symbol + pattern_value
+        - `pdfplumber`: análise de layout completa do pdfminer (mais lenta).
+        - `pymupdf`: extração do MuPDF, a partir do documento já aberto.
+        - `auto`: usa o `pymupdf` e recorre ao `pdfplumber` se algum dos campos (`BANK`,
+          `RECIPIENT` ou `VALUE`) não for encontrado no texto extraído. Caso contrário, os
+          campos interpretados são mantidos em `self.fields`.
+        """
+        if self.text_backend == "pdfplumber":
+            return self.page_obj.extract_text()
 
-        # Encontra todas as correspondências no texto e retorna como uma lista de tuplas
-        match = re.findall(pattern, self.text, re.IGNORECASE)
+        self.text = self.fast_text if self.fast_text is not None else self.document.get_text(self.page_number)
 
-        return match[index] if index is not None else match
+        if self.text_backend == "auto":
+            fields = self.extractor.extract(self.text)
 
-    def __get_bank_acronym(self) -> str | None:
-        bank_acronyms = self.config.get_bank_acronyms()
+            if any(fields[key] is None for key in AUTO_FIELDS):
+                self.text_backend = "pdfplumber"
+                return self.page_obj.extract_text()
 
-        for bank_name, bank_acronym in bank_acronyms.items():
-            if bank_name in self.text.upper():
-                return bank_acronym
+            self.fields = fields
 
-        return None
+        return self.text
 
-    def __get_recipient_name(self):
-        words = "|".join(["NOME DO DESTINATÁRIO", "FAVORECIDO"])
+    def ocr_key(self) -> bytes:
+        """A chave do cache do OCR: o hash das imagens da página (veja `image_hash`)."""
+        return image_hash(self.document.source[self.page_number - 1], self.settings.ocr_language)
 
-        # Padrão de expressão regular para encontrar textos após as palavras específicas
-        pattern = rf"({words}):?\s*([a-zA-Z\s]+?)\s*(?:-|\n|$)"
+    def set_text(self, text: str, text_backend: str = "ocr") -> None:
+        """Substitui o texto da página (ex.: pelo texto reconhecido pelo OCR)."""
+        self.text = text
+        self.text_backend = text_backend
+        self.fields = None
 
-        match = re.search(pattern, self.text, re.IGNORECASE)
+    def get_fields(self) -> dict[str, str | None]:
+        """
+        Extrai os campos usados no nome do arquivo de saída.
 
-        return match.group(2).strip() if match else None
+        Returns:
+            dict: Os campos `BANK`, `RECIPIENT` e `VALUE` (o primeiro valor monetário encontrado).
+                  Campos não encontrados têm valor None.
+        """
+        if self.fields is None:
+            with timed(self.timings, "parse_fields"):
+                self.fields = self.extractor.extract(self.text)
+
+            # O texto das páginas digitalizadas já fica no cache do OCR
+            if not self.scanned:
+                self.__cache_put()
+
+        return self.fields
+
+    def __cache_put(self) -> None:
+        if self.cache_key:
+            self.cache.put(self.cache_key, self.text, self.fields, self.text_backend)
+
+    def get_amounts(self) -> list[tuple[str, Decimal]]:
+        """Todos os valores monetários da página, como tuplas (rótulo, valor em decimal)."""
+        return self.extractor.extract_amounts(self.text)
+
+    def get_fingerprints(self) -> list[bytes]:
+        """As impressões digitais da página, usadas na identificação de duplicados."""
+        return fingerprints(self.text, self.get_fields())
+
+    def get_name(self) -> str:
+        """
+        Monta o nome do arquivo de saída (sem sufixo numérico e sem extensão) a partir
+        dos campos extraídos da página.
+
+        Raises:
+            ValueError: Se nenhum valor monetário for encontrado na página.
+        """
+        return output_name(self.settings, self.get_fields(), self.page_number, self.filename)
 
     def __get_unique_name(self):
-        extension = "pdf"
-        _, value = self.__extract_currency_values(0)
-        recipient_name = self.__get_recipient_name()
-        bank_acronym = self.__get_bank_acronym()
-        words = {
-            "BANK": bank_acronym,
-            "RECIPIENT": recipient_name,
-            "VALUE": value
-        }
-
-        doc_name = replace_words(self.config.get_output_filename(), words)
-
-        output_dir = self.config.get_output_folder()
-        basename = os.path.join(output_dir, doc_name)
-
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-
-        # Padrão de regex para corresponder arquivos com sufixos numéricos
-        pattern = re.compile(rf"^{re.escape(doc_name)}(_(\d+))?\.{extension}$")
-
-        # Encontra todos os arquivos existentes que correspondem ao padrão
-        existing_files = [f for f in os.listdir(output_dir) if pattern.match(f)]
-
-        # Determina o próximo sufixo numérico disponível
-        if existing_files:
-            highest_num = 0
-            for filename in existing_files:
-                match = pattern.match(filename)
-                if match and match.group(2):
-                    num = int(match.group(2))
-                    if num > highest_num:
-                        highest_num = num
-            next_num = highest_num + 1
-            filename = f"{basename}_{next_num}.{extension}"
-        else:
-            filename = f"{basename}.{extension}"
-
-        return filename
+        return OutputRegistry.for_folder(self.settings.output_folder).reserve(self.get_name())
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+import fitz
+
+from utils.constants import PAGE_CACHE_FILE
+from utils.helper import get_app_directory
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key BLOB PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used_at INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS pages_used_at ON pages (used_at);
+"""
+
+# Alterar ao mudar a extração do texto ou dos campos, invalidando as entradas gravadas
+PAGE_CACHE_VERSION = 1
+
+# Chaves de fonte que afetam a extração do texto (a tabela ToUnicode é incluída pelo conteúdo)
+FONT_KEYS = ["Subtype", "BaseFont", "Encoding", "FirstChar", "Widths"]
+DESCENDANT_KEYS = ["W", "DW"]
+
+# Fração de `max_size` gravada desde a última remoção que leva `flush` a remover entradas
+EVICT_FRACTION = 0.1
+
+
+def page_key(source_page: fitz.Page, signature: bytes = b"") -> bytes:
+    """
+    Chave (BLAKE2b, 16 bytes) de uma página: o fluxo de conteúdo (e o dos formulários que ele
+    desenha), as dimensões, a rotação e as fontes usadas (nome do recurso, tipo, codificação,
+    larguras e tabela ToUnicode). As imagens não entram na chave, pois não têm texto.
+
+    As referências a outros objetos não entram na chave, de modo que a mesma página tem a
+    mesma chave em outro arquivo (ex.: o mesmo extrato enviado novamente com uma página a mais).
+    A `signature` identifica a configuração que influencia o texto e os campos extraídos.
+    """
+    document = source_page.parent
+    digest = hashlib.blake2b(signature, digest_size=16)
+
+    # `read_contents` falha em páginas sem fluxo de conteúdo (em branco)
+    for xref in source_page.get_contents():
+        digest.update(document.xref_stream(xref) or b"")
+    digest.update(f"{tuple(source_page.mediabox)}{source_page.rotation}".encode())
+
+    for xref, name, *_ in source_page.get_xobjects():
+        digest.update(name.encode())
+        digest.update(document.xref_stream_raw(xref) or b"")
+
+    for xref, _, _, _, name, *_ in source_page.get_fonts(full=True):
+        digest.update(name.encode())
+
+        for key in FONT_KEYS:
+            digest.update(document.xref_get_key(xref, key)[1].encode())
+
+        kind, value = document.xref_get_key(xref, "ToUnicode")
+
+        if kind == "xref":
+            digest.update(document.xref_stream_raw(int(value.split()[0])) or b"")
+
+        kind, value = document.xref_get_key(xref, "DescendantFonts")
+
+        if kind == "array" and value.count(" R") == 1:
+            descendant = int(value.strip("[]").split()[0])
+
+            for key in DESCENDANT_KEYS:
+                digest.update(document.xref_get_key(descendant, key)[1].encode())
+
+    return digest.digest()
+
+
+class PageCache:
+    """
+    Cache persistente (SQLite) do texto e dos campos extraídos de cada página, pela chave do
+    seu conteúdo (veja `page_key`).
+
+    Diferente do registro de processamento (`Ledger`), que ignora arquivos já processados pelo
+    hash do arquivo, o cache reaproveita a extração de páginas iguais em arquivos diferentes:
+    um documento enviado novamente com páginas acrescentadas ou reordenadas só tem extraídas
+    as páginas novas.
+
+    Cada entrada é gravada compactada (zlib do JSON com o texto, os campos e o backend). O uso
+    é registrado em memória e gravado em `flush`. Se o cache exceder `max_size` bytes, as
+    entradas usadas há mais tempo são removidas (LRU) ao fechar e também em `flush`, sempre
+    que as entradas gravadas desde a última remoção somarem `EVICT_FRACTION` do limite (de
+    modo que execuções longas, como `--watch`, não fazem o cache crescer indefinidamente).
+    Com `max_size` 0, nada é removido (ex.: nos processos do modo `--workers`, cabendo a
+    remoção ao processo principal).
+
+    Vários processos podem usar o mesmo arquivo ao mesmo tempo (modo WAL do SQLite).
+
+    Example:
+        >>> with PageCache(max_size=256 * 1024 * 1024) as cache:
+        >>>     entry = cache.get(key)
+        >>>     if entry is None:
+        >>>         cache.put(key, text, fields, "pymupdf")
+    """
+
+    def __init__(self, path: str = None, max_size: int = 0):
+        self.path = path or os.path.join(get_app_directory(), PAGE_CACHE_FILE)
+        self.max_size = max_size
+        self.connection = sqlite3.connect(self.path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        self.used: dict[bytes, int] = {}
+        self.added = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> "PageCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get(self, key: bytes) -> tuple[str, dict[str, str | None], str] | None:
+        """
+        Returns:
+            tuple | None: (texto, campos, backend) ou None se a página não estiver no cache.
+        """
+        row = self.connection.execute("SELECT data FROM pages WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.used[key] = time.time_ns()
+        text, fields, text_backend = json.loads(zlib.decompress(row[0]))
+
+        return text, fields, text_backend
+
+    def put(self, key: bytes, text: str, fields: dict[str, str | None], text_backend: str) -> None:
+        data = zlib.compress(json.dumps([text, fields, text_backend], ensure_ascii=False).encode(), 6)
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO pages (key, data, size, used_at) VALUES (?, ?, ?, ?)",
+            (key, data, len(data), time.time_ns()),
+        )
+        self.added += len(data)
+
+    def flush(self) -> None:
+        """Grava as entradas novas e o uso das entradas lidas, removendo as mais antigas se necessário."""
+        if self.used:
+            self.connection.executemany(
+                "UPDATE pages SET used_at = ? WHERE key = ?", [(used_at, key) for key, used_at in self.used.items()]
+            )
+            self.used.clear()
+
+        self.connection.commit()
+
+        if self.max_size and self.added >= self.max_size * EVICT_FRACTION:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove as entradas usadas há mais tempo até que o cache não exceda `max_size` bytes.
+
+        Returns:
+            int: A quantidade de entradas removidas.
+        """
+        # Mantém as entradas mais recentes cuja soma dos tamanhos cabe no limite
+        evicted = self.connection.execute(
+            """
+            DELETE FROM pages WHERE key IN (
+                SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY used_at DESC) AS total FROM pages)
+                WHERE total > ?
+            )
+            """,
+            (self.max_size,),
+        ).rowcount
+        self.connection.commit()
+        self.added = 0
+
+        return evicted
+
+    def close(self) -> None:
+        self.flush()
+
+        # Sempre ao fechar: no modo `--workers`, as entradas são gravadas pelos outros processos
+        if self.max_size:
+            self.evict()
+
+        self.connection.close()
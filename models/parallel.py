@@ -0,0 +1,413 @@
+import os
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import fitz
+
+from models.bundle import BundleWriter
+from models.document import Document
+from models.duplicates import DuplicateIndex, fingerprints
+from models.ledger import Ledger
+from models.ocr import OcrPool
+from models.page import Page, output_name
+from models.page_cache import PageCache
+from models.settings import Settings
+from utils.metrics import timed
+from utils.output_registry import OutputRegistry
+
+PAGES_PER_TASK = 25
+
+# Idade mínima, em segundos, para que um arquivo temporário seja considerado abandonado por
+# uma execução interrompida (e não em uso por outra execução com a mesma pasta de saída)
+STALE_PART_SECONDS = 3600
+
+
+@dataclass
+class PageResult:
+    page_number: int
+    name: str | None = None
+    filename: str | None = None
+    fields: dict[str, str | None] | None = None
+    amounts: list[tuple[str, Decimal]] = field(default_factory=list)
+    fingerprints: list[bytes] = field(default_factory=list)
+    skipped: bool = False
+    duplicate: bool = False
+    rejected: str | None = None
+    cached: bool = False
+    ocr_key: bytes | None = None
+    timings: dict[str, float] = field(default_factory=dict)
+    bytes_written: int = 0
+    bytes_unoptimized: int = 0
+    error: str | None = None
+
+    @property
+    def saved(self) -> bool:
+        return self.filename is not None
+
+    @property
+    def status(self) -> str:
+        if self.skipped:
+            return "skipped"
+
+        if self.rejected:
+            return "rejected"
+
+        if self.duplicate:
+            return "duplicate"
+
+        return "saved" if self.saved else "failed"
+
+
+@dataclass
+class TaskResult:
+    path: str
+    total: int
+    first_page: int
+    last_page: int
+    file_hash: str | None = None
+    skipped: bool = False
+    open_seconds: float = 0.0
+    elapsed: float = 0.0
+    pages: list[PageResult] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+
+def iter_tasks(
+    paths: Iterable[str],
+    settings: Settings,
+    pages_per_task: int = PAGES_PER_TASK,
+    ledger: Ledger = None,
+    reprocess: bool = False,
+) -> Iterator[TaskResult | tuple]:
+    """
+    Divide os documentos em intervalos de páginas a serem processados pelos workers.
+
+    Apenas a contagem de páginas de cada documento é lida aqui, sob demanda. Se um registro
+    de processamento for informado, as páginas já processadas são repassadas aos workers
+    para serem ignoradas, e os documentos completos nem chegam a ser abertos.
+
+    Yields:
+        TaskResult | tuple: O resultado de um documento já processado, ou os argumentos de
+                            `process_task` (caminho, primeira página, última página, total de
+                            páginas, hash do arquivo e páginas ignoradas).
+    """
+    for path in paths:
+        file_hash = ledger.file_hash(path) if ledger else None
+        done = ledger.processed_pages(file_hash, settings.output_folder) if ledger and not reprocess else {}
+        rejected = ledger.rejected_pages(file_hash) if ledger and not reprocess and settings.prefilter else {}
+
+        if (done or rejected) and ledger.is_complete(file_hash, done, rejected):
+            total = ledger.page_count(file_hash)
+            result = TaskResult(path, total, 1, total, file_hash, skipped=True)
+            result.pages = []
+
+            for page_number in sorted(done.keys() | rejected.keys()):
+                filename, fields, amounts = done.get(page_number, (None, None, []))
+                result.pages.append(
+                    PageResult(
+                        page_number,
+                        filename=filename,
+                        fields=fields,
+                        amounts=amounts,
+                        skipped=True,
+                        rejected=rejected.get(page_number),
+                    )
+                )
+
+            yield result
+            continue
+
+        with fitz.open(path) as doc:
+            total = doc.page_count
+
+        if ledger:
+            ledger.set_page_count(file_hash, total)
+
+        for first_page in range(1, total + 1, pages_per_task):
+            last_page = min(first_page + pages_per_task - 1, total)
+            skip = frozenset(page_number for page_number in done if first_page <= page_number <= last_page)
+            yield path, first_page, last_page, total, file_hash, skip
+
+
+def process_task(
+    settings: Settings,
+    path: str,
+    first_page: int,
+    last_page: int,
+    total: int,
+    file_hash: str = None,
+    skip: frozenset[int] = frozenset(),
+) -> TaskResult:
+    """
+    Processa um intervalo de páginas de um documento (executado em um processo worker).
+
+    Cada página tem o texto extraído, os campos interpretados e é salva em um arquivo
+    temporário na pasta de saída. O nome definitivo é atribuído depois, no processo
+    principal, para que a numeração seja determinística e sem colisões.
+
+    Com o cache de páginas ativado, cada intervalo abre a sua própria conexão com o cache; as
+    entradas menos usadas são removidas somente pelo processo principal, ao final.
+    """
+    started_at = time.perf_counter()
+    output_dir = settings.output_folder
+    os.makedirs(output_dir, exist_ok=True)
+
+    result = TaskResult(path, total, first_page, last_page, file_hash)
+
+    cache = PageCache() if settings.page_cache else None
+
+    with Document(path) as document:
+        result.open_seconds = document.open_seconds
+
+        pages = document.iter_pages(first_page, last_page, settings.page_window, settings.memory_limit)
+
+        for current_page in pages:
+            if current_page.page_number in skip:
+                result.pages.append(PageResult(current_page.page_number, skipped=True))
+                continue
+
+            page = Page(document, current_page, current_page.page_number, settings, cache=cache)
+            page_result = PageResult(page.page_number, cached=page.cached)
+
+            page_result.timings = page.timings
+
+            if page.rejected:
+                page_result.rejected = page.rejected
+                current_page.close()
+                result.pages.append(page_result)
+                continue
+
+            # O arquivo é criado somente na gravação, com as permissões padrão (o `mkstemp`
+            # criaria um arquivo acessível apenas pelo usuário, mantido após o `os.replace`)
+            temp_filename = os.path.join(output_dir, f"{uuid.uuid4().hex}.part")
+
+            # A página digitalizada é gravada sem nome: o OCR e a nomeação são feitos no processo principal
+            if page.scanned:
+                page_result.ocr_key = page.ocr_key()
+            else:
+                try:
+                    page.get_fields()
+
+                    with timed(page.timings, "name"):
+                        page_result.name = page.get_name()
+
+                    page_result.fields = page.fields
+                    page_result.amounts = page.get_amounts()
+                    page_result.fingerprints = page.get_fingerprints()
+                except Exception as e:
+                    page_result.error = f"{type(e).__name__}: {e}"
+                    current_page.close()
+                    result.pages.append(page_result)
+                    continue
+
+            if page.save(temp_filename):
+                page_result.filename = temp_filename
+                page_result.bytes_written = page.bytes_written
+                page_result.bytes_unoptimized = page.bytes_unoptimized
+            else:
+                page_result.error = page.error
+
+                if os.path.exists(temp_filename):
+                    os.remove(temp_filename)
+
+            result.pages.append(page_result)
+
+    if cache:
+        cache.close()
+
+    result.elapsed = time.perf_counter() - started_at
+
+    return result
+
+
+def recognize_page(page_result: PageResult, source: str, settings: Settings, ocr: OcrPool = None) -> bool:
+    """
+    Extrai os campos e o nome de uma página digitalizada a partir do texto reconhecido pelo OCR.
+
+    Returns:
+        bool: True se a página foi nomeada; caso contrário, o arquivo temporário é removido.
+    """
+    try:
+        if ocr is None:
+            raise RuntimeError("OCR desativado.")
+
+        with timed(page_result.timings, "ocr"):
+            text = ocr.result(page_result.ocr_key)
+
+        extractor = settings.field_extractor
+        page_result.fields = extractor.extract(text)
+        page_result.amounts = extractor.extract_amounts(text)
+        page_result.fingerprints = fingerprints(text, page_result.fields)
+        page_result.name = output_name(settings, page_result.fields, page_result.page_number, source)
+
+        return True
+    except Exception as e:
+        page_result.error = f"{type(e).__name__}: {e}"
+        os.remove(page_result.filename)
+        page_result.filename = None
+
+        return False
+
+
+def finalize_task(
+    result: TaskResult,
+    settings: Settings,
+    ledger: Ledger = None,
+    bundle: BundleWriter = None,
+    ocr: OcrPool = None,
+) -> TaskResult:
+    """
+    Move os arquivos temporários de um intervalo para os seus nomes definitivos e
+    registra as páginas salvas no registro de processamento, aplicando a política de
+    duplicados (veja `DuplicateIndex`).
+
+    Com `bundle`, as páginas são adicionadas aos arquivos combinados (e registradas
+    quando estes forem gravados), e os arquivos temporários são removidos.
+
+    As páginas digitalizadas do intervalo são enviadas juntas ao `ocr` e nomeadas a partir
+    do texto reconhecido.
+    """
+    registry = OutputRegistry.for_folder(settings.output_folder)
+    duplicates = DuplicateIndex(ledger, settings.duplicates if ledger else "off", settings.output_folder)
+
+    if ocr:
+        for page_result in result.pages:
+            if page_result.ocr_key and page_result.saved:
+                ocr.submit(page_result.ocr_key, Path(page_result.filename).read_bytes)
+
+    for page_result in result.pages:
+        if page_result.rejected and ledger and not page_result.skipped:
+            ledger.record_rejected(result.file_hash, page_result.page_number, page_result.rejected)
+
+        if not page_result.saved or page_result.skipped:
+            continue
+
+        if page_result.ocr_key and not recognize_page(page_result, result.name, settings, ocr):
+            continue
+
+        if bundle:
+            with fitz.open(page_result.filename) as source:
+                bundle.add(source, 0, page_result.fields, result.file_hash, page_result.page_number, page_result.amounts)
+
+            os.remove(page_result.filename)
+            continue
+
+        original = duplicates.find(page_result.fingerprints)
+        page_result.duplicate = original is not None
+
+        if original is None:
+            filename = registry.reserve(page_result.name)
+            os.replace(page_result.filename, filename)
+            duplicates.add(page_result.fingerprints, filename)
+        elif duplicates.policy == "skip":
+            os.remove(page_result.filename)
+            filename = original
+        elif duplicates.policy == "link":
+            try:
+                filename = duplicates.link(original, page_result.name)
+                os.remove(page_result.filename)
+            except OSError:
+                # Sistema de arquivos sem suporte a links físicos: grava uma cópia
+                filename = registry.reserve(page_result.name)
+                os.replace(page_result.filename, filename)
+        else:
+            filename = duplicates.flagged_filename(page_result.name)
+            os.replace(page_result.filename, filename)
+
+        page_result.filename = filename
+
+        if ledger:
+            ledger.record(result.file_hash, page_result.page_number, filename, page_result.fields, page_result.amounts)
+
+    if ledger:
+        ledger.commit()
+
+    return result
+
+
+def remove_stale_parts(output_dir: str, max_age: float = STALE_PART_SECONDS) -> int:
+    """
+    Remove os arquivos temporários (`.part`) deixados na pasta de saída por execuções interrompidas.
+
+    Returns:
+        int: A quantidade de arquivos removidos.
+    """
+    removed = 0
+
+    if not os.path.isdir(output_dir):
+        return removed
+
+    now = time.time()
+
+    for entry in os.scandir(output_dir):
+        if not entry.name.endswith(".part") or not entry.is_file():
+            continue
+
+        try:
+            if now - entry.stat().st_mtime >= max_age:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            continue
+
+    return removed
+
+
+def process_parallel(
+    paths: Iterable[str],
+    workers: int,
+    settings: Settings,
+    pages_per_task: int = PAGES_PER_TASK,
+    ledger: Ledger = None,
+    reprocess: bool = False,
+    bundle: BundleWriter = None,
+    ocr: OcrPool = None,
+) -> Iterator[TaskResult]:
+    """
+    Processa os documentos em um pool de processos, produzindo os resultados na ordem original.
+
+    Os documentos grandes são divididos em intervalos de `pages_per_task` páginas. No máximo
+    `workers * 2` intervalos ficam pendentes ao mesmo tempo, de modo que a descoberta dos
+    documentos continua preguiçosa.
+
+    Args:
+        paths (Iterable[str]): Os caminhos dos documentos PDF.
+        workers (int): A quantidade de processos.
+        settings (Settings): A configuração da execução, enviada a cada processo.
+        pages_per_task (int, optional): A quantidade máxima de páginas por intervalo.
+        ledger (Ledger, optional): O registro usado para ignorar e registrar as páginas processadas.
+        reprocess (bool, optional): Se True, processa novamente as páginas já registradas.
+        bundle (BundleWriter, optional): Se informado, as páginas são agrupadas em arquivos combinados.
+        ocr (OcrPool, optional): Se informado, reconhece o texto das páginas digitalizadas.
+
+    Yields:
+        TaskResult: O resultado de cada intervalo, na ordem dos documentos e das páginas.
+    """
+    remove_stale_parts(settings.output_folder)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+
+        for task in iter_tasks(paths, settings, pages_per_task, ledger, reprocess):
+            if isinstance(task, TaskResult):
+                future = Future()
+                future.set_result(task)
+            else:
+                future = executor.submit(process_task, settings, *task)
+
+            pending.append(future)
+
+            if len(pending) >= workers * 2:
+                yield finalize_task(pending.popleft().result(), settings, ledger, bundle, ocr)
+
+        while pending:
+            yield finalize_task(pending.popleft().result(), settings, ledger, bundle, ocr)
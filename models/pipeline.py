@@ -0,0 +1,188 @@
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+from utils.output_registry import OutputRegistry
+
+PREFETCH_DOCUMENTS = 2
+PREFETCH_BYTES = 256 * 1024 * 1024
+WRITER_THREADS = 4
+MAX_PENDING_WRITES = 64
+
+_DONE = object()
+
+
+def prefetch_documents(
+    paths: Iterable[str],
+    size: int = PREFETCH_DOCUMENTS,
+    max_bytes: int = PREFETCH_BYTES,
+) -> Iterator[tuple[str, bytes | Exception | None]]:
+    """
+    Lê os documentos antecipadamente em uma thread separada.
+
+    Enquanto um documento é processado, os próximos `size` documentos já estão sendo lidos do
+    disco (ou da rede). A fila é limitada pela quantidade de documentos e pela soma dos seus
+    tamanhos (`max_bytes`, incluindo o documento em processamento), portanto a memória usada
+    não depende da quantidade nem do tamanho dos documentos. Os arquivos maiores que
+    `max_bytes` não são lidos antecipadamente: o conteúdo é None e o documento é aberto do
+    disco durante o processamento.
+
+    Yields:
+        tuple: (caminho, conteúdo do arquivo), (caminho, None) se o arquivo for grande demais
+               ou (caminho, exceção) se a leitura falhar.
+    """
+    documents = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+    budget = threading.Condition()
+    buffered = 0
+
+    def reserve(nbytes: int) -> None:
+        nonlocal buffered
+
+        with budget:
+            while buffered and buffered + nbytes > max_bytes and not stopped.is_set():
+                budget.wait(0.5)
+
+            buffered += nbytes
+
+    def release(nbytes: int) -> None:
+        nonlocal buffered
+
+        with budget:
+            buffered -= nbytes
+            budget.notify()
+
+    def put(item) -> bool:
+        # Aguarda espaço na fila verificando a interrupção; False se o consumo foi interrompido
+        while not stopped.is_set():
+            try:
+                documents.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def read() -> None:
+        try:
+            for path in paths:
+                reserved = 0
+
+                try:
+                    file_size = os.path.getsize(path)
+
+                    if file_size > max_bytes:
+                        item = (path, None)
+                    else:
+                        reserve(file_size)
+                        reserved = file_size
+
+                        with open(path, "rb") as file:
+                            item = (path, file.read())
+                except OSError as e:
+                    item = (path, e)
+
+                if not put((*item, reserved)):
+                    return
+        finally:
+            put(_DONE)
+
+    reader = threading.Thread(target=read, name="DocumentReader", daemon=True)
+    reader.start()
+
+    try:
+        while (item := documents.get()) is not _DONE:
+            path, data, reserved = item
+
+            try:
+                yield path, data
+            finally:
+                # O conteúdo deixa de ser usado quando o próximo documento é solicitado
+                release(reserved)
+    finally:
+        stopped.set()
+
+        # Descarta os documentos já lidos, liberando a memória e o leitor, se estiver aguardando
+        while True:
+            try:
+                documents.get_nowait()
+            except queue.Empty:
+                break
+
+
+class OutputWriter:
+    """
+    Grava os arquivos de saída em um pool de threads, liberando o processamento da próxima
+    página enquanto a anterior é gravada.
+
+    A quantidade de gravações pendentes é limitada por `max_pending`: quando o limite é
+    atingido, `write` aguarda, o que mantém a memória estável. Se uma gravação falhar, o
+    arquivo reservado (vazio ou incompleto) é removido.
+
+    O resultado de cada gravação é entregue à função `on_done` informada em `write`, na ordem
+    em que as gravações foram agendadas e na thread que chama `write`, `drain` ou `close`
+    (e não nas threads do pool), de modo que ela pode usar o `Ledger` e os demais registros
+    da execução.
+
+    Example:
+        >>> with OutputWriter() as writer:
+        >>>     writer.write("saida/BB FULANO R$ 10,00.pdf", data, lambda error: print(error or "ok"))
+    """
+
+    def __init__(self, threads: int = WRITER_THREADS, max_pending: int = MAX_PENDING_WRITES):
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="OutputWriter")
+        self.pending = threading.BoundedSemaphore(max_pending)
+        self.scheduled: deque[tuple[Future, Callable[[str | None], None] | None]] = deque()
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __write(self, filename: str, data: bytes) -> None:
+        try:
+            with open(filename, "wb") as output_file:
+                output_file.write(data)
+        except Exception:
+            OutputRegistry.for_folder(os.path.dirname(filename)).release(filename)
+            raise
+        finally:
+            self.pending.release()
+
+    def write(self, filename: str, data: bytes, on_done: Callable[[str | None], None] = None) -> None:
+        """
+        Agenda a gravação de `data` em `filename`, aguardando se houver muitas gravações pendentes.
+
+        Args:
+            on_done (Callable, optional): Chamada ao final da gravação com None, ou com a
+                                          descrição do erro se a gravação falhar.
+        """
+        self.pending.acquire()
+
+        # Os resultados anteriores são entregues antes do agendamento: `on_done` nunca é
+        # chamada durante o próprio `write`
+        self.drain()
+        self.scheduled.append((self.executor.submit(self.__write, filename, data), on_done))
+
+    def drain(self, wait: bool = False) -> None:
+        """
+        Entrega os resultados das gravações concluídas, na ordem em que foram agendadas.
+
+        Args:
+            wait (bool, optional): Se True, aguarda todas as gravações pendentes.
+        """
+        while self.scheduled and (wait or self.scheduled[0][0].done()):
+            future, on_done = self.scheduled.popleft()
+            exception = future.exception()
+
+            if on_done:
+                on_done(None if exception is None else f"{type(exception).__name__}: {exception}")
+
+    def close(self) -> None:
+        """Aguarda a conclusão de todas as gravações pendentes."""
+        self.drain(wait=True)
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,121 @@
+import csv
+import os
+import re
+
+import fitz
+
+MIN_TEXT_LENGTH = 10
+REJECTED_REPORT = "paginas_rejeitadas.csv"
+REPORT_BUFFER = 100
+
+REJECT_REASONS = {
+    "blank": "Página em branco.",
+    "image_only": "Página digitalizada, sem camada de texto.",
+    "no_keywords": "Nenhum rótulo de valor ou nome de banco encontrado.",
+}
+
+
+class PageFilter:
+    """
+    Classificação rápida das páginas, feita antes da extração completa, para descartar as
+    páginas que não são comprovantes (separadores em branco, capas e digitalizações sem texto).
+
+    Usa somente o texto extraído pelo PyMuPDF: uma página com menos de `min_text_length`
+    caracteres é rejeitada como em branco (ou como imagem, se tiver imagens), e uma página
+    sem nenhum rótulo de valor (`key_values`) nem nome de banco é rejeitada como sem palavras-chave.
+
+    Example:
+        >>> page_filter = PageFilter(["VALOR"], ["CAIXA"])
+        >>> page_filter.classify("Capa do lote 12", document.source[0])
+        'no_keywords'
+    """
+
+    def __init__(self, key_values: list[str], bank_names: list[str], min_text_length: int = MIN_TEXT_LENGTH):
+        keywords = sorted({*key_values, *bank_names}, key=len, reverse=True)
+
+        self.keyword_pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE)
+        self.min_text_length = min_text_length
+
+    def classify(self, text: str, source_page: fitz.Page) -> str | None:
+        """
+        Returns:
+            str | None: O motivo da rejeição (veja `REJECT_REASONS`) ou None se a página
+                        deve seguir para a extração completa.
+        """
+        if len("".join(text.split())) < self.min_text_length:
+            return "image_only" if source_page.get_images() else "blank"
+
+        if not self.keyword_pattern.search(text):
+            return "no_keywords"
+
+        return None
+
+
+class RejectionReport:
+    """
+    Relatório (CSV) das páginas rejeitadas pelo `PageFilter`, com o motivo da rejeição.
+
+    O arquivo só é criado na primeira rejeição, e as linhas são gravadas em blocos. Um relatório
+    existente (de uma execução anterior) é mantido e as novas rejeições são acrescentadas a ele;
+    as linhas que já constam do relatório (ex.: com `--reprocess`) não são repetidas.
+
+    Example:
+        >>> with RejectionReport("saida/paginas_rejeitadas.csv") as report:
+        >>>     report.add("a.pdf", 3, "blank")
+    """
+
+    def __init__(self, path: str, buffer_size: int = REPORT_BUFFER):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.rows: list[list] = []
+        self.count = 0
+        self.file = None
+        self.writer = None
+        self.existing: set[tuple[str, str, str]] = set()
+
+    def __enter__(self) -> "RejectionReport":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def add(self, source: str, page_number: int, reason: str) -> None:
+        self.rows.append([source, page_number, reason, REJECT_REASONS[reason]])
+        self.count += 1
+
+        if len(self.rows) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+
+        if self.file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.existing = self.__read_existing()
+
+            # utf-8-sig para que o Excel reconheça a codificação
+            self.file = open(self.path, "a", encoding="utf-8-sig", newline="")
+            self.writer = csv.writer(self.file)
+
+            if self.file.tell() == 0:
+                self.writer.writerow(["source", "page", "reason", "description"])
+
+        self.writer.writerows(row for row in self.rows if (row[0], str(row[1]), row[2]) not in self.existing)
+        self.file.flush()
+        self.rows.clear()
+
+    def __read_existing(self) -> set[tuple[str, str, str]]:
+        """As linhas (origem, página, motivo) do relatório gravado em uma execução anterior."""
+        if not os.path.exists(self.path):
+            return set()
+
+        with open(self.path, encoding="utf-8-sig", newline="") as file:
+            return {tuple(row[:3]) for row in csv.reader(file) if len(row) >= 3}
+
+    def close(self) -> None:
+        self.flush()
+
+        if self.file is not None:
+            self.file.close()
+            self.file = None
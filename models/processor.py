@@ -0,0 +1,315 @@
+import os
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable
+
+from models.bundle import BundleWriter
+from models.document import Document
+from models.duplicates import DuplicateIndex
+from models.prefilter import RejectionReport
+from models.export import RecordExporter
+from models.ledger import Ledger
+from models.ocr import MAX_PENDING_OCR, OcrPool
+from models.page import Page
+from models.page_cache import PageCache
+from models.pipeline import OutputWriter
+from models.settings import Settings
+from utils.helper import set_title
+from utils.message import error
+from utils.metrics import Metrics, timed
+from utils.output_registry import OutputRegistry
+from utils.progress import get_progress
+
+
+@dataclass
+class DocumentStats:
+    processed: int = 0
+    skipped: int = 0
+    rejected: int = 0
+    cached: int = 0
+    total: int = 0
+    bytes_written: int = 0
+    bytes_unoptimized: int = 0
+
+    def __iadd__(self, other: "DocumentStats") -> "DocumentStats":
+        self.processed += other.processed
+        self.skipped += other.skipped
+        self.rejected += other.rejected
+        self.cached += other.cached
+        self.total += other.total
+        self.bytes_written += other.bytes_written
+        self.bytes_unoptimized += other.bytes_unoptimized
+        return self
+
+    @property
+    def complete(self) -> bool:
+        """Indica se todas as páginas foram salvas, ignoradas ou rejeitadas pelo pré-filtro."""
+        return self.processed + self.rejected == self.total
+
+
+def document_status(name: str, index: int = None, total_docs: int = None, pages: int = 0) -> None:
+    status = f"Processando arquivo {name}..."
+
+    if index is not None:
+        status = f"Processando arquivo {name} ({index} de {total_docs})..."
+
+    set_title(status)
+    get_progress().document(status, name, index, total_docs, pages)
+
+
+def document_time(total: int, elapsed: float) -> None:
+    get_progress().document_time(total, elapsed)
+
+
+def document_skipped(total: int) -> None:
+    get_progress().document_skipped(total)
+
+
+def save_page(
+    page: Page,
+    duplicates: DuplicateIndex,
+    on_done: Callable[[bool, bool], None],
+    writer: OutputWriter = None,
+) -> None:
+    """
+    Salva a página, aplicando a política de duplicados (veja `DuplicateIndex`).
+
+    O resultado é entregue a `on_done(página salva, página duplicada)` ao final da gravação:
+    com `writer`, quando o pool concluir a gravação (veja `OutputWriter.write`); caso
+    contrário, antes do retorno.
+    """
+    if not duplicates.enabled or page.get_fields()["VALUE"] is None:
+        page.save(writer=writer, on_done=lambda saved: on_done(saved, False))
+        return
+
+    hashes = page.get_fingerprints()
+    original = duplicates.find(hashes)
+
+    if original is None:
+
+        def written(saved: bool) -> None:
+            if saved:
+                duplicates.add(hashes, page.output_filename)
+            else:
+                duplicates.discard(hashes)
+
+            on_done(saved, False)
+
+        # Enquanto a gravação está em andamento, as cópias seguintes apontam para este arquivo
+        if page.save(writer=writer, on_done=written) and writer:
+            duplicates.hold(hashes, page.output_filename)
+
+        return
+
+    if duplicates.policy == "skip":
+        page.output_filename = original
+        page.page_obj.close()
+        on_done(True, True)
+        return
+
+    if duplicates.policy == "link":
+        try:
+            page.output_filename = duplicates.link(original, page.get_name())
+            page.page_obj.close()
+            on_done(True, True)
+        except OSError:
+            # Sistema de arquivos sem suporte a links físicos: grava uma cópia
+            page.save(writer=writer, on_done=lambda saved: on_done(saved, True))
+
+        return
+
+    filename = duplicates.flagged_filename(page.get_name())
+
+    def flagged(saved: bool) -> None:
+        if not saved:
+            OutputRegistry.for_folder(os.path.dirname(filename)).release(filename)
+
+        on_done(saved, True)
+
+    page.save(filename, writer, flagged)
+
+
+def process_document(
+    path: str,
+    ledger: Ledger,
+    settings: Settings,
+    reprocess: bool = False,
+    index: int = None,
+    total_docs: int = None,
+    metrics: Metrics = None,
+    bundle: BundleWriter = None,
+    data: bytes = None,
+    writer: OutputWriter = None,
+    exporter: RecordExporter = None,
+    report: RejectionReport = None,
+    ocr: OcrPool = None,
+    cache: PageCache = None,
+) -> DocumentStats:
+    """
+    Processa todas as páginas de um documento, exibindo o progresso de cada página.
+
+    As páginas já registradas no `ledger` são ignoradas (exceto com `reprocess`), e as
+    páginas salvas são registradas nele.
+
+    Args:
+        path (str): O caminho do documento PDF.
+        ledger (Ledger): O registro de processamento.
+        settings (Settings): A configuração da execução.
+        reprocess (bool, optional): Se True, processa novamente as páginas já registradas.
+        index (int, optional): A posição do documento, exibida no status.
+        total_docs (int, optional): A quantidade total de documentos, exibida no status.
+        metrics (Metrics, optional): Se informado, recebe os tempos e o resultado de cada página.
+        bundle (BundleWriter, optional): Se informado, as páginas são adicionadas aos arquivos
+                                         combinados (registrados no `ledger` quando gravados).
+        data (bytes, optional): O conteúdo do documento, se já tiver sido lido.
+        writer (OutputWriter, optional): Se informado, as páginas são gravadas no pool de gravação.
+        exporter (RecordExporter, optional): Se informado, recebe o registro de cada página.
+        report (RejectionReport, optional): Se informado, recebe as páginas rejeitadas pelo pré-filtro.
+        ocr (OcrPool, optional): Se informado, as páginas digitalizadas passam pelo OCR, no pool
+                                 próprio, e são salvas quando o texto for reconhecido.
+        cache (PageCache, optional): Se informado, o texto e os campos das páginas já extraídas
+                                     (neste ou em outro arquivo) são lidos do cache.
+
+    Returns:
+        DocumentStats: As páginas processadas, ignoradas e o total de páginas do documento.
+    """
+    stats = DocumentStats()
+    file_hash = ledger.file_hash(path, data)
+    done = {} if reprocess else ledger.processed_pages(file_hash, settings.output_folder)
+    rejected = {} if reprocess or not settings.prefilter else ledger.rejected_pages(file_hash)
+
+    if (done or rejected) and ledger.is_complete(file_hash, done, rejected):
+        stats.total = stats.processed = stats.skipped = ledger.page_count(file_hash)
+
+        document_status(os.path.basename(path), index, total_docs, stats.total)
+        document_skipped(stats.total)
+
+        if exporter:
+            for page_number in sorted(done.keys() | rejected.keys()):
+                if page_number in done:
+                    output_path, fields, amounts = done[page_number]
+                    exporter.add(path, page_number, "skipped", fields, amounts, output_path)
+                else:
+                    exporter.add(path, page_number, "rejected", error=rejected[page_number])
+
+        return stats
+
+    with Document(path, data) as document:
+        if metrics:
+            metrics.record_open(path, document.open_seconds)
+
+        duplicates = DuplicateIndex(ledger, settings.duplicates, settings.output_folder)
+        stats.total = document.page_count
+        ledger.set_page_count(file_hash, stats.total)
+
+        document_status(document.name, index, total_docs, stats.total)
+        progress = get_progress()
+
+        def record(page: Page, saved: bool, duplicate: bool = False) -> None:
+            """Registra a página salva (ou agrupada) e exibe o resultado."""
+            if saved:
+                stats.processed += 1
+                stats.bytes_written += page.bytes_written
+                stats.bytes_unoptimized += page.bytes_unoptimized
+
+                if not bundle:
+                    ledger.record(file_hash, page.page_number, page.output_filename, page.fields, page.get_amounts())
+
+            progress.page(page.page_number, stats.total, saved, duplicate=duplicate)
+
+            if metrics:
+                metrics.record_page(path, page.page_number, page.timings, page.bytes_written, page.error)
+
+            if exporter:
+                exporter.add(
+                    path,
+                    page.page_number,
+                    "duplicate" if duplicate else ("saved" if saved else "failed"),
+                    page.fields,
+                    page.get_amounts(),
+                    page.output_filename,
+                    page.error,
+                )
+
+        def finish(page: Page) -> None:
+            """Salva (ou agrupa) a página; com `writer`, ela é registrada ao final da gravação."""
+            if bundle:
+                record(page, page.add_to_bundle(bundle, file_hash))
+            else:
+                save_page(page, duplicates, partial(record, page), writer)
+
+        def finish_ocr(page: Page, key: bytes) -> None:
+            with timed(page.timings, "ocr"):
+                try:
+                    page.set_text(ocr.result(key))
+                except Exception as e:
+                    error(f"Erro no OCR da página {page.page_number}: {e}")
+
+            finish(page)
+
+        deferred = deque()
+
+        for current_page in document.iter_pages(window=settings.page_window, memory_limit=settings.memory_limit):
+            if current_page.page_number in done:
+                stats.processed += 1
+                stats.skipped += 1
+                progress.page(current_page.page_number, stats.total, True, skipped=True)
+
+                if metrics:
+                    metrics.record_page(path, current_page.page_number, skipped=True)
+
+                if exporter:
+                    output_path, fields, amounts = done[current_page.page_number]
+                    exporter.add(path, current_page.page_number, "skipped", fields, amounts, output_path)
+
+                continue
+
+            page = Page(document, current_page, current_page.page_number, settings, cache=cache)
+            stats.cached += page.cached
+
+            if page.rejected:
+                stats.rejected += 1
+                current_page.close()
+                ledger.record_rejected(file_hash, page.page_number, page.rejected)
+                progress.page(page.page_number, stats.total, False, rejected=True)
+
+                if report:
+                    report.add(path, page.page_number, page.rejected)
+
+                if metrics:
+                    metrics.record_page(path, page.page_number, page.timings, rejected=True)
+
+                if exporter:
+                    exporter.add(path, page.page_number, "rejected", error=page.rejected)
+
+                continue
+
+            if page.scanned and ocr:
+                # As páginas digitalizadas aguardam o OCR sem bloquear as páginas seguintes
+                key = page.ocr_key()
+                ocr.submit(key, partial(document.page_bytes, page.page_number))
+                deferred.append((page, key))
+
+                if len(deferred) > MAX_PENDING_OCR:
+                    finish_ocr(*deferred.popleft())
+
+                continue
+
+            finish(page)
+
+        while deferred:
+            finish_ocr(*deferred.popleft())
+
+        # As páginas do documento são registradas somente depois de gravadas
+        if writer:
+            writer.drain(wait=True)
+
+        ledger.commit()
+
+        if cache:
+            cache.flush()
+
+        document_time(stats.total, document.elapsed)
+
+    return stats
@@ -0,0 +1,200 @@
+import json
+import os
+from dataclasses import dataclass, replace
+from functools import cached_property
+
+from utils.filename_template import FilenameTemplate
+
+from .config import Config
+from .fields import FieldExtractor
+from .page_cache import PAGE_CACHE_VERSION
+from .prefilter import PageFilter
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Configuração da execução, lida e validada uma única vez a partir do `Config`.
+
+    É imutável durante o processamento e pode ser enviada aos processos do modo `--workers`.
+    Os objetos derivados (extrator de campos, pré-filtro e modelo do nome) são criados no
+    primeiro uso e reaproveitados em todas as páginas.
+
+    Example:
+        >>> settings = Settings.load()
+        >>> settings.output_folder
+        'C:\\\\Comprovantes\\\\output'
+    """
+
+    title: str
+    key_values: tuple[str, ...]
+    bank_acronyms: tuple[tuple[str, str], ...]
+    text_backend: str
+    page_window: int
+    memory_limit: int | None
+    prefilter: bool
+    ocr: bool
+    ocr_language: str
+    ocr_workers: int
+    page_cache: bool
+    page_cache_size: int
+    duplicates: str
+    optimize: str
+    bundle_by: str | None
+    bundle_archive: str | None
+    bundle_max_pages: int
+    save_garbage: int
+    save_deflate: bool
+    input_folder: str
+    output_folder: str
+    output_filename: str
+    output_filename_max_length: int
+
+    @classmethod
+    def from_config(cls, config: Config) -> "Settings":
+        """
+        Lê e valida todas as opções do `config`.
+
+        Raises:
+            ValueError: Se alguma opção for inválida.
+        """
+        save_options = config.get_save_options()
+        settings = cls(
+            title=config.get_title(),
+            key_values=tuple(config.get_key_values()),
+            bank_acronyms=tuple(config.get_bank_acronyms().items()),
+            text_backend=config.get_text_backend(),
+            page_window=config.get_page_window(),
+            memory_limit=config.get_memory_limit(),
+            prefilter=config.get_prefilter(),
+            ocr=config.get_ocr(),
+            ocr_language=config.get_ocr_language(),
+            ocr_workers=config.get_ocr_workers(),
+            page_cache=config.get_page_cache(),
+            page_cache_size=config.get_page_cache_size(),
+            duplicates=config.get_duplicates(),
+            optimize=config.get_optimize(),
+            bundle_by=config.get_bundle_by(),
+            bundle_archive=config.get_bundle_archive(),
+            bundle_max_pages=config.get_bundle_max_pages(),
+            save_garbage=save_options["garbage"],
+            save_deflate=save_options["deflate"],
+            input_folder=config.get_input_folder(),
+            output_folder=config.get_output_folder(),
+            output_filename=config.get_output_filename(),
+            output_filename_max_length=config.get_output_filename_max_length(),
+        )
+
+        # Valida o modelo do nome antes do processamento
+        settings.filename_template
+
+        return settings
+
+    @classmethod
+    def load(cls, file_path: str = None) -> "Settings":
+        """Lê a configuração do arquivo informado (por padrão, o `config.ini` da aplicação)."""
+        return cls.from_config(Config(file_path))
+
+    @property
+    def bank_names(self) -> list[str]:
+        return [name for name, _ in self.bank_acronyms]
+
+    @property
+    def save_options(self) -> dict:
+        """Opções de gravação (`garbage` e `deflate`) dos arquivos PDF combinados."""
+        return {"garbage": self.save_garbage, "deflate": self.save_deflate}
+
+    @cached_property
+    def field_extractor(self) -> FieldExtractor:
+        return FieldExtractor(list(self.key_values), dict(self.bank_acronyms))
+
+    @cached_property
+    def page_filter(self) -> PageFilter | None:
+        """O pré-filtro de páginas, ou None se estiver desativado."""
+        return PageFilter(list(self.key_values), self.bank_names) if self.prefilter else None
+
+    @cached_property
+    def page_cache_signature(self) -> bytes:
+        """As opções que alteram o texto e os campos extraídos, incluídas na chave do cache de páginas."""
+        options = [
+            PAGE_CACHE_VERSION,
+            self.text_backend,
+            self.key_values,
+            self.bank_acronyms,
+            self.prefilter,
+            self.ocr,
+        ]
+
+        return json.dumps(options, ensure_ascii=False).encode()
+
+    @cached_property
+    def filename_template(self) -> FilenameTemplate:
+        return FilenameTemplate(self.output_filename, self.output_filename_max_length)
+
+
+class ConfigContext:
+    """
+    Contexto de configuração injetado no processamento: mantém o `Settings` atual e, no modo
+    contínuo (`--watch`), o recarrega quando o arquivo de configuração é alterado (verificando
+    a data de modificação).
+
+    As opções em `PINNED` (pastas, agrupamento, OCR e cache de páginas) dependem de objetos
+    criados no início da execução e mantêm o valor inicial; as alterações ignoradas ficam em
+    `ignored` após cada recarga.
+
+    Example:
+        >>> context = ConfigContext(Config())
+        >>> if context.reload():
+        >>>     print("Configuração recarregada.")
+        >>> process(context.settings)
+    """
+
+    PINNED = (
+        "input_folder",
+        "output_folder",
+        "bundle_by",
+        "bundle_archive",
+        "bundle_max_pages",
+        "ocr",
+        "ocr_language",
+        "ocr_workers",
+        "page_cache",
+        "page_cache_size",
+    )
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.mtime = self.__mtime()
+        self.settings = Settings.from_config(self.config)
+        self.ignored: tuple[str, ...] = ()
+
+    def __mtime(self) -> int | None:
+        try:
+            return os.stat(self.config.file_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def reload(self) -> bool:
+        """
+        Recarrega a configuração se o arquivo tiver sido alterado desde a última leitura.
+
+        Returns:
+            bool: True se a configuração foi recarregada.
+
+        Raises:
+            ValueError: Se a nova configuração for inválida (a anterior é mantida).
+        """
+        mtime = self.__mtime()
+
+        if mtime == self.mtime:
+            return False
+
+        self.mtime = mtime
+        self.config.read_config()
+        settings = Settings.from_config(self.config)
+        pinned = {name: getattr(self.settings, name) for name in self.PINNED}
+
+        self.ignored = tuple(name for name, value in pinned.items() if getattr(settings, name) != value)
+        self.settings = replace(settings, **pinned)
+
+        return True
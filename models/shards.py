@@ -0,0 +1,387 @@
+import hashlib
+import heapq
+import json
+import os
+import shutil
+import socket
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from models.ledger import Ledger
+from utils.file_helpers import normalize_path
+from utils.output_registry import SUFFIX_PATTERN, OutputRegistry
+
+SHARD_BALANCES = ["size", "hash"]
+SHARD_STALE_SECONDS = 600
+MANIFEST_FILE = "manifest.json"
+MERGED_RESULTS = "resultados.jsonl"
+
+# Situação de cada lote, indicada pela pasta em que está o seu arquivo
+PENDING, CLAIMED, DONE, MERGED = "pending", "claimed", "done", "merged"
+
+
+@dataclass
+class Shard:
+    id: str
+    documents: list[dict] = field(default_factory=list)
+    claim_path: str | None = None
+
+    @property
+    def paths(self) -> list[str]:
+        return [document["path"] for document in self.documents]
+
+
+def plan_shards(paths: Iterable[str], count: int, balance: str = "size") -> list[Shard]:
+    """
+    Divide os documentos em `count` lotes.
+
+    - `size`: equilibra o tamanho total dos lotes (o maior documento vai para o lote com menos bytes).
+    - `hash`: distribui pelo hash do caminho; o mesmo documento sempre cai no mesmo lote.
+
+    Dentro de cada lote, os documentos mantêm a ordem da descoberta.
+
+    Raises:
+        ValueError: Se a quantidade de lotes ou o critério forem inválidos.
+    """
+    if count < 1:
+        raise ValueError(f"Quantidade de lotes inválida: {count}. Use um valor maior que zero.")
+
+    if balance not in SHARD_BALANCES:
+        raise ValueError(f"Critério de divisão inválido: '{balance}'. Use: {', '.join(SHARD_BALANCES)}.")
+
+    documents = [{"path": path, "size": os.path.getsize(path), "order": order} for order, path in enumerate(paths)]
+    shards = [Shard(f"shard-{index + 1:04d}") for index in range(count)]
+
+    if balance == "hash":
+        for document in documents:
+            digest = hashlib.blake2b(normalize_path(document["path"]).encode(), digest_size=8).digest()
+            shards[int.from_bytes(digest, "big") % count].documents.append(document)
+    else:
+        heap = [(0, index) for index in range(count)]
+
+        for document in sorted(documents, key=lambda document: (-document["size"], document["order"])):
+            total, index = heapq.heappop(heap)
+            shards[index].documents.append(document)
+            heapq.heappush(heap, (total + document["size"], index))
+
+    for shard in shards:
+        shard.documents.sort(key=lambda document: document.pop("order"))
+
+    return shards
+
+
+def base_name(stem: str, stems: set[str]) -> str:
+    """
+    Remove do nome o sufixo numérico acrescentado na pasta do lote (`NOME_1`), somente se o
+    nome sem sufixo também existir nela; caso contrário, o sufixo faz parte do nome.
+    """
+    match = SUFFIX_PATTERN.match(stem)
+
+    if match and match.group(2) and match.group(1) in stems:
+        return match.group(1)
+
+    return stem
+
+
+@dataclass
+class MergeSummary:
+    shards: int = 0
+    merged: int = 0
+    files: int = 0
+    pages: int = 0
+    statuses: Counter = field(default_factory=Counter)
+    pending: list[str] = field(default_factory=list)
+
+
+class ShardQueue:
+    """
+    Fila de lotes de um processamento distribuído, em uma pasta compartilhada entre as máquinas.
+
+    Cada lote é um arquivo JSON que passa pelas pastas `pending`, `claimed`, `done` e `merged`.
+    Um lote é reivindicado renomeando o seu arquivo de `pending` para `claimed` (operação atômica):
+    se duas máquinas tentarem ao mesmo tempo, somente uma consegue, sem travas nem servidor.
+
+    Cada lote é processado em uma pasta própria (`staging/<lote>`), com um registro de
+    processamento próprio (`ledgers/<lote>.db`), e produz um arquivo de resultados
+    (`results/<lote>.jsonl`). A junção (`merge`) move os arquivos para a pasta de saída,
+    atribuindo os nomes definitivos, e reúne os resultados.
+
+    O lote reivindicado tem a data de modificação atualizada a cada documento (`heartbeat`).
+    Sem atualização por `stale_seconds`, o lote é considerado abandonado e pode ser
+    reivindicado por outra máquina, continuando das páginas já salvas.
+
+    Example:
+        >>> queue = ShardQueue("/mnt/lote")
+        >>> queue.create(plan_shards(paths, 8), "size")
+        >>> while shard := queue.claim():
+        >>>     ...
+        >>>     queue.complete(shard)
+    """
+
+    def __init__(self, batch_dir: str, node: str = None, stale_seconds: int = SHARD_STALE_SECONDS):
+        self.batch_dir = batch_dir
+        self.node = node or f"{socket.gethostname()}-{os.getpid()}"
+        self.stale_seconds = stale_seconds
+
+    def folder(self, state: str) -> str:
+        return os.path.join(self.batch_dir, state)
+
+    def staging(self, shard: Shard) -> str:
+        return os.path.join(self.batch_dir, "staging", shard.id)
+
+    def ledger_path(self, shard: Shard) -> str:
+        return os.path.join(self.batch_dir, "ledgers", f"{shard.id}.db")
+
+    def results_path(self, shard: Shard) -> str:
+        return os.path.join(self.batch_dir, "results", f"{shard.id}.jsonl")
+
+    def merged_results_path(self, shard: Shard) -> str:
+        return os.path.join(self.batch_dir, "results", f"{shard.id}.merged.jsonl")
+
+    def moves_path(self, shard: Shard) -> str:
+        return os.path.join(self.batch_dir, "results", f"{shard.id}.moves.jsonl")
+
+    def create(self, shards: list[Shard], balance: str) -> dict:
+        """
+        Grava o manifesto e os arquivos dos lotes.
+
+        Raises:
+            FileExistsError: Se a pasta já contiver um manifesto.
+        """
+        manifest_path = os.path.join(self.batch_dir, MANIFEST_FILE)
+
+        if os.path.exists(manifest_path):
+            raise FileExistsError(f"A pasta do lote já contém um manifesto: {manifest_path}")
+
+        for state in (PENDING, CLAIMED, DONE, MERGED, "staging", "ledgers", "results"):
+            os.makedirs(self.folder(state), exist_ok=True)
+
+        for shard in shards:
+            content = {"id": shard.id, "documents": shard.documents}
+            self.__write_json(os.path.join(self.folder(PENDING), f"{shard.id}.json"), content)
+
+        manifest = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "balance": balance,
+            "shards": [
+                {
+                    "id": shard.id,
+                    "documents": len(shard.documents),
+                    "bytes": sum(document["size"] for document in shard.documents),
+                }
+                for shard in shards
+            ],
+        }
+
+        # O manifesto é gravado por último: a sua existência indica que os lotes estão prontos
+        self.__write_json(manifest_path, manifest)
+
+        return manifest
+
+    def manifest(self) -> dict:
+        with open(os.path.join(self.batch_dir, MANIFEST_FILE), encoding="utf-8") as file:
+            return json.load(file)
+
+    def __write_json(self, path: str, content: dict) -> None:
+        temp_path = f"{path}.{self.node}.part"
+
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(content, file, ensure_ascii=False, indent=2)
+
+        os.replace(temp_path, path)
+
+    def __write_lines(self, path: str, lines: Iterable[str]) -> None:
+        temp_path = f"{path}.{self.node}.part"
+
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.writelines(lines)
+
+        os.replace(temp_path, path)
+
+    def __read_shard(self, path: str) -> Shard:
+        with open(path, encoding="utf-8") as file:
+            content = json.load(file)
+
+        return Shard(content["id"], content["documents"], path)
+
+    def __entries(self, state: str) -> Iterator[str]:
+        try:
+            entries = os.listdir(self.folder(state))
+        except FileNotFoundError:
+            return
+
+        yield from sorted(entry for entry in entries if entry.endswith(".json") or "@" in entry)
+
+    def claim(self) -> Shard | None:
+        """
+        Reivindica o próximo lote pendente ou, se não houver, um lote abandonado.
+
+        Returns:
+            Shard | None: O lote reivindicado, ou None se não houver lotes disponíveis.
+        """
+        for entry in self.__entries(PENDING):
+            if not entry.endswith(".json"):
+                continue
+
+            claim_path = os.path.join(self.folder(CLAIMED), f"{entry}@{self.node}")
+
+            try:
+                os.rename(os.path.join(self.folder(PENDING), entry), claim_path)
+            except FileNotFoundError:
+                # Reivindicado por outra máquina
+                continue
+
+            return self.__read_shard(claim_path)
+
+        for entry in self.__entries(CLAIMED):
+            path = os.path.join(self.folder(CLAIMED), entry)
+
+            try:
+                if time.time() - os.path.getmtime(path) < self.stale_seconds:
+                    continue
+
+                claim_path = os.path.join(self.folder(CLAIMED), f"{entry.split('@', 1)[0]}@{self.node}")
+                os.rename(path, claim_path)
+                os.utime(claim_path)
+            except FileNotFoundError:
+                continue
+
+            return self.__read_shard(claim_path)
+
+        return None
+
+    def heartbeat(self, shard: Shard) -> bool:
+        """
+        Indica que o lote continua em processamento.
+
+        Returns:
+            bool: False se o lote tiver sido reivindicado por outra máquina (por ter sido
+                  considerado abandonado); nesse caso, o processamento deve ser interrompido.
+        """
+        try:
+            os.utime(shard.claim_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def complete(self, shard: Shard) -> None:
+        os.rename(shard.claim_path, os.path.join(self.folder(DONE), f"{shard.id}.json"))
+
+    def status(self) -> Counter:
+        """A quantidade de lotes em cada situação."""
+        return Counter({state: len(list(self.__entries(state))) for state in (PENDING, CLAIMED, DONE, MERGED)})
+
+    def merge(self, output_dir: str, ledger: Ledger = None) -> MergeSummary:
+        """
+        Junta os lotes concluídos ainda não juntados, na ordem do manifesto.
+
+        Os arquivos de cada lote são movidos para `output_dir` com os nomes definitivos
+        (reservados no `OutputRegistry`, como no processamento normal). Os resultados de cada
+        lote, com os caminhos definitivos e um único registro por página, são gravados em
+        `results/<lote>.merged.jsonl`, e `resultados.jsonl`, na pasta do lote, é montado
+        novamente a partir deles.
+
+        A junção pode ser interrompida e executada novamente: cada arquivo é registrado em
+        `results/<lote>.moves.jsonl` antes de ser movido, e os resultados são sempre regravados
+        por inteiro, de modo que nenhum registro é duplicado.
+
+        Se o `ledger` for informado, o registro de cada lote é incorporado a ele, com os caminhos
+        definitivos, para que o processamento normal seguinte ignore as páginas já juntadas.
+        """
+        summary = MergeSummary()
+        registry = OutputRegistry.for_folder(output_dir)
+        done = set(self.__entries(DONE))
+        merged_results = []
+
+        for item in self.manifest()["shards"]:
+            summary.shards += 1
+            entry = f"{item['id']}.json"
+
+            if entry in done:
+                shard = self.__read_shard(os.path.join(self.folder(DONE), entry))
+                moved = self.__merge_shard(shard, registry, summary.statuses)
+                summary.files += len(moved)
+                summary.merged += 1
+
+                if ledger and os.path.exists(self.ledger_path(shard)):
+                    summary.pages += ledger.merge(self.ledger_path(shard), moved)
+                    ledger.commit()
+
+                os.rename(shard.claim_path, os.path.join(self.folder(MERGED), entry))
+            elif os.path.exists(os.path.join(self.folder(MERGED), entry)):
+                shard = Shard(item["id"])
+            else:
+                summary.pending.append(item["id"])
+                continue
+
+            merged_results.append(self.merged_results_path(shard))
+
+        self.__write_lines(os.path.join(self.batch_dir, MERGED_RESULTS), self.__read_lines(merged_results))
+
+        return summary
+
+    def __read_lines(self, paths: list[str]) -> Iterator[str]:
+        for path in paths:
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as file:
+                    yield from file
+
+    def __read_moves(self, shard: Shard) -> dict[str, str]:
+        """Os arquivos já movidos em uma junção anterior interrompida: `origem -> destino`."""
+        moves = {}
+
+        for line in self.__read_lines([self.moves_path(shard)]):
+            try:
+                source, target = json.loads(line)
+            except json.JSONDecodeError:
+                # Linha incompleta: o arquivo não chegou a ser movido
+                continue
+
+            moves[source] = target
+
+        return moves
+
+    def __merge_shard(self, shard: Shard, registry: OutputRegistry, statuses: Counter) -> dict[str, str]:
+        staging = self.staging(shard)
+        stems = {name[:-4] for name in os.listdir(staging) if name.endswith(".pdf")} if os.path.isdir(staging) else set()
+        moved = self.__read_moves(shard)
+        records: dict[tuple[str, int], dict] = {}
+
+        with open(self.moves_path(shard), "a", encoding="utf-8") as moves:
+            for line in self.__read_lines([self.results_path(shard)]):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Registro incompleto, de uma execução interrompida durante a gravação
+                    continue
+
+                output = record.get("output")
+
+                if output and normalize_path(os.path.dirname(output)) == normalize_path(staging):
+                    if os.path.exists(output):
+                        if output not in moved:
+                            stem = os.path.splitext(os.path.basename(output))[0]
+                            moved[output] = registry.reserve(base_name(stem, stems))
+                            moves.write(json.dumps([output, moved[output]], ensure_ascii=False) + "\n")
+                            moves.flush()
+
+                        shutil.move(output, moved[output])
+
+                    record["output"] = moved.get(output, output)
+
+                # Um lote retomado por outra máquina registra novamente, como `skipped`, as
+                # páginas já salvas: prevalece o registro original
+                key = (record["source"], record["page"])
+
+                if key not in records or record["status"] != "skipped":
+                    records[key] = record
+
+        statuses.update(record["status"] for record in records.values())
+        self.__write_lines(
+            self.merged_results_path(shard),
+            (json.dumps(record, ensure_ascii=False) + "\n" for record in records.values()),
+        )
+
+        return moved
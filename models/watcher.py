@@ -0,0 +1,120 @@
+import os
+import queue
+import threading
+import time
+from typing import Callable
+
+from utils.file_helpers import iter_pdf_paths
+
+POLL_INTERVAL = 2.0
+SETTLE_TIME = 5.0
+QUEUE_SIZE = 100
+
+
+class FolderWatcher:
+    """
+    Observa uma pasta e entrega, uma única vez, cada arquivo PDF novo ou alterado.
+
+    A pasta é verificada periodicamente (polling). Um arquivo só é considerado pronto quando
+    o seu tamanho e a sua data de modificação permanecem iguais por `settle` segundos, o que
+    evita processar comprovantes que ainda estão sendo gravados pelo scanner.
+
+    Os arquivos prontos são colocados em uma fila limitada: se o processamento ficar para
+    trás, a verificação da pasta aguarda até que haja espaço na fila.
+
+    Example:
+        >>> watcher = FolderWatcher("C:\\\\Comprovantes", exclude="C:\\\\Comprovantes\\\\output")
+        >>> watcher.run(lambda path: print(path))  # até watcher.stop()
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        exclude: str = None,
+        interval: float = POLL_INTERVAL,
+        settle: float = SETTLE_TIME,
+        queue_size: int = QUEUE_SIZE,
+    ):
+        self.folder = folder
+        self.exclude = exclude
+        self.interval = interval
+        self.settle = settle
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.stopped = threading.Event()
+        self.pending: dict[str, tuple[int, int, float]] = {}
+        self.delivered: dict[str, tuple[int, int]] = {}
+
+    def stop(self) -> None:
+        """Solicita o encerramento; o arquivo em processamento é concluído antes."""
+        self.stopped.set()
+
+    def poll(self) -> list[str]:
+        """
+        Verifica a pasta uma vez e retorna os arquivos que ficaram prontos desde a última verificação.
+        """
+        now = time.monotonic()
+        ready = []
+        current = set()
+
+        for path in iter_pdf_paths(self.folder, self.exclude):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            signature = (stat.st_size, stat.st_mtime_ns)
+            current.add(path)
+
+            if self.delivered.get(path) == signature:
+                continue
+
+            pending = self.pending.get(path)
+
+            if pending is None or pending[:2] != signature:
+                self.pending[path] = (*signature, now)
+            elif now - pending[2] >= self.settle:
+                del self.pending[path]
+                self.delivered[path] = signature
+                ready.append(path)
+
+        # Esquece arquivos removidos, para que sejam entregues novamente se voltarem
+        for path in list(self.pending.keys() - current):
+            del self.pending[path]
+
+        for path in list(self.delivered.keys() - current):
+            del self.delivered[path]
+
+        return ready
+
+    def __scan(self) -> None:
+        while not self.stopped.is_set():
+            for path in self.poll():
+                while not self.stopped.is_set():
+                    try:
+                        self.queue.put(path, timeout=self.interval)
+                        break
+                    except queue.Full:
+                        continue
+
+            self.stopped.wait(self.interval)
+
+    def run(self, handler: Callable[[str], None]) -> None:
+        """
+        Executa até `stop()` ser chamado, chamando `handler` para cada arquivo pronto.
+
+        A pasta é verificada em uma thread separada; `handler` é chamado na thread atual.
+        """
+        scanner = threading.Thread(target=self.__scan, name="FolderWatcher", daemon=True)
+        scanner.start()
+
+        try:
+            while not self.stopped.is_set():
+                try:
+                    path = self.queue.get(timeout=self.interval)
+                except queue.Empty:
+                    continue
+
+                handler(path)
+        finally:
+            self.stopped.set()
+            scanner.join()
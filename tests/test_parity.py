@@ -0,0 +1,82 @@
+"""
+Paridade dos backends de texto no corpus de `tests/fixtures/parity`.
+
+Cada arquivo do corpus tem uma diagramação em que o PyMuPDF e o `pdfplumber` ordenam ou
+agrupam o texto de formas diferentes. O `expected.json` traz os campos corretos de cada
+arquivo e, em `divergences`, os campos que um backend conhecidamente extrai de outra forma.
+O backend `auto` deve sempre chegar aos campos corretos.
+
+Para gerar o corpus novamente:
+    python -m tools.synthetic tests/fixtures/parity --layouts
+"""
+
+import json
+import os
+
+import pytest
+
+from models import Settings
+from models.document import Document
+from models.page import Page
+from tools.parity import REFERENCE_BACKEND, compare_document
+from tools.synthetic import LAYOUTS
+from utils.constants import ENV_PREFIX
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "parity")
+BACKENDS = ["pdfplumber", "pymupdf", "auto"]
+
+with open(os.path.join(FIXTURES, "expected.json"), encoding="utf-8") as file:
+    EXPECTED = json.load(file)
+
+
+@pytest.fixture(scope="module")
+def settings() -> Settings:
+    """A configuração do corpus, sem as variáveis de ambiente `NOTAS_PDF_*` da máquina."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        for name in os.environ:
+            if name.startswith(ENV_PREFIX):
+                monkeypatch.delenv(name)
+
+        return Settings.load(os.path.join(FIXTURES, "parity.ini"))
+
+
+def expected_fields(filename: str, backend: str) -> dict[str, str | None]:
+    """Os campos esperados de um arquivo do corpus com o backend informado."""
+    entry = EXPECTED[filename]
+
+    return {**entry["fields"], **entry.get("divergences", {}).get(backend, {})}
+
+
+def extract_fields(path: str, settings: Settings, backend: str) -> list[dict[str, str | None]]:
+    """Os campos de cada página de um documento, extraídos com o backend informado."""
+    fields = []
+
+    with Document(path) as document:
+        for current_page in document.pages:
+            page = Page(document, current_page, current_page.page_number, settings, text_backend=backend)
+            fields.append(page.get_fields())
+            current_page.close()
+
+    return fields
+
+
+def test_corpus_matches_layouts():
+    assert sorted(EXPECTED) == sorted(LAYOUTS)
+    assert all(os.path.isfile(os.path.join(FIXTURES, filename)) for filename in EXPECTED)
+    assert not any("auto" in entry.get("divergences", {}) for entry in EXPECTED.values())
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("filename", sorted(EXPECTED))
+def test_backend_fields(settings, filename, backend):
+    fields = extract_fields(os.path.join(FIXTURES, filename), settings, backend)
+
+    assert fields == [expected_fields(filename, backend)]
+
+
+@pytest.mark.parametrize("candidate", ["pymupdf", "auto"])
+@pytest.mark.parametrize("filename", sorted(EXPECTED))
+def test_parity_tool(settings, filename, candidate):
+    divergent = int(expected_fields(filename, REFERENCE_BACKEND) != expected_fields(filename, candidate))
+
+    assert compare_document(os.path.join(FIXTURES, filename), settings, candidate) == (1, divergent)
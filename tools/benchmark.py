@@ -0,0 +1,188 @@
+"""
+Mede a vazão de cada etapa do processamento sobre um corpus de comprovantes sintéticos.
+
+As etapas são cronometradas separadamente: descoberta dos arquivos, abertura dos documentos,
+extração de texto, interpretação dos campos, geração do nome e gravação da página. O resultado
+é impresso (ou salvo com `--output`) em JSON, para que execuções diferentes possam ser
+comparadas. O pico de memória residente (RSS) durante o processamento também é registrado,
+permitindo verificar que ele não cresce com a quantidade de páginas por documento. Nenhum
+recurso de rede é utilizado.
+
+Uso:
+    python -m tools.benchmark --documents 100 --pages 10
+    python -m tools.benchmark --documents 1 --pages 2000 --backend pdfplumber --output resultado.json
+    python -m tools.benchmark --documents 1 --pages 5000 --window 100
+    python -m tools.benchmark --corpus C:\\Corpus
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import fitz
+import pdfplumber
+
+from models import Settings
+from models.document import Document
+from models.page import Page
+from tools.synthetic import generate_corpus
+from utils.constants import PAGE_WINDOW, TEXT_BACKENDS
+from utils.file_helpers import iter_pdf_paths
+from utils.memory import MEGABYTE, current_rss, peak_rss
+from utils.output_registry import OutputRegistry
+
+STAGES = ["discovery", "open", "extract_text", "parse_fields", "name", "write"]
+
+
+class Timer:
+    def __init__(self):
+        self.seconds = {stage: 0.0 for stage in STAGES}
+
+    @contextmanager
+    def stage(self, name: str):
+        started_at = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - started_at
+
+
+def megabytes(value: int | None) -> float | None:
+    return round(value / MEGABYTE, 1) if value else None
+
+
+def run_benchmark(
+    corpus: str,
+    output_dir: str,
+    settings: Settings,
+    backend: str = None,
+    window: int = PAGE_WINDOW,
+) -> dict:
+    """
+    Processa o corpus cronometrando cada etapa.
+
+    Returns:
+        dict: O resultado da execução, pronto para ser serializado em JSON.
+    """
+    backend = backend or settings.text_backend
+    timer = Timer()
+    registry = OutputRegistry(output_dir)
+    documents = 0
+    pages = 0
+    saved = 0
+    initial_rss = current_rss()
+    max_rss = initial_rss or 0
+    started_at = time.perf_counter()
+
+    with timer.stage("discovery"):
+        paths = list(iter_pdf_paths(corpus, output_dir))
+
+    for path in paths:
+        with timer.stage("open"):
+            document = Document(path)
+
+        with document:
+            documents += 1
+
+            for current_page in document.iter_pages(window=window):
+                pages += 1
+
+                with timer.stage("extract_text"):
+                    page = Page(document, current_page, current_page.page_number, settings, text_backend=backend)
+
+                with timer.stage("parse_fields"):
+                    page.get_fields()
+
+                current_page.close()
+
+                with timer.stage("name"):
+                    try:
+                        filename = registry.reserve(page.get_name())
+                    except Exception:
+                        filename = None
+
+                if filename is None:
+                    continue
+
+                with timer.stage("write"):
+                    document.split_page(page.page_number, filename)
+
+                saved += 1
+                max_rss = max(max_rss, current_rss() or 0)
+
+    elapsed = time.perf_counter() - started_at
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pymupdf": fitz.VersionBind,
+            "pdfplumber": pdfplumber.__version__,
+        },
+        "text_backend": backend,
+        "corpus": {
+            "documents": documents,
+            "pages": pages,
+            "bytes": sum(os.path.getsize(path) for path in paths),
+        },
+        "saved_pages": saved,
+        "stages": {
+            stage: {
+                "seconds": round(seconds, 6),
+                "per_page_ms": round(seconds / pages * 1000, 4) if pages else None,
+            }
+            for stage, seconds in timer.seconds.items()
+        },
+        "memory": {
+            "page_window": window,
+            "initial_rss_mb": megabytes(initial_rss),
+            "peak_rss_mb": megabytes(max_rss),
+            "process_peak_rss_mb": megabytes(peak_rss()),
+        },
+        "total_seconds": round(elapsed, 6),
+        "pages_per_second": round(pages / elapsed, 2) if elapsed else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mede a vazão de cada etapa do processamento.")
+    parser.add_argument("--corpus", help="Pasta com PDFs existentes (por padrão, um corpus sintético é gerado).")
+    parser.add_argument("--documents", type=int, default=10, help="Arquivos do corpus sintético (padrão: 10).")
+    parser.add_argument("--pages", type=int, default=10, help="Páginas por arquivo do corpus sintético (padrão: 10).")
+    parser.add_argument("--seed", type=int, default=0, help="Semente do corpus sintético (padrão: 0).")
+    parser.add_argument("--backend", choices=TEXT_BACKENDS, default=None, help="Backend de extração de texto.")
+    parser.add_argument(
+        "--window", type=int, default=PAGE_WINDOW, help=f"Páginas analisadas por vez (padrão: {PAGE_WINDOW})."
+    )
+    parser.add_argument("--output", help="Arquivo JSON de resultado (padrão: saída padrão).")
+    args = parser.parse_args()
+
+    settings = Settings.load()
+
+    with tempfile.TemporaryDirectory(prefix="notas-pdf-bench-") as workdir:
+        corpus = args.corpus
+
+        if corpus is None:
+            corpus = os.path.join(workdir, "corpus")
+            generate_corpus(corpus, args.documents, args.pages, args.seed)
+
+        result = run_benchmark(corpus, os.path.join(workdir, "output"), settings, args.backend, args.window)
+
+    content = json.dumps(result, indent=2, ensure_ascii=False)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(content + "\n")
+    else:
+        sys.stdout.write(content + "\n")
+
+
+if __name__ == "__main__":
+    main()
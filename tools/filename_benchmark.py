@@ -0,0 +1,79 @@
+"""
+Compara a geração dos nomes dos arquivos pelo `FilenameTemplate` (modelo interpretado uma
+única vez) com a função `replace_words` (expressão regular compilada a cada chamada).
+
+Os campos são gerados aleatoriamente (incluindo campos vazios), e os nomes produzidos pelas
+duas implementações são conferidos antes da medição.
+
+Uso:
+    python -m tools.filename_benchmark
+    python -m tools.filename_benchmark --template "BANK - RECIPIENT - VALUE" --names 50000
+"""
+
+import argparse
+import json
+import random
+import sys
+import timeit
+
+from tools.synthetic import format_currency
+from utils.constants import BANK_ACRONYMS, FILENAME
+from utils.filename_template import FilenameTemplate
+from utils.string_helpers import replace_words
+
+RECIPIENTS = ["ANA LIMA", "JOAO SILVA", "MARIA SOUZA", "PEDRO COSTA", None]
+
+
+def sample_fields(count: int, seed: int = 0) -> list[dict[str, str | None]]:
+    rng = random.Random(seed)
+    banks = [*BANK_ACRONYMS.values(), None]
+
+    return [
+        {
+            "BANK": rng.choice(banks),
+            "RECIPIENT": rng.choice(RECIPIENTS),
+            "VALUE": format_currency(rng.randint(100, 10_000_000) / 100),
+            "DATE": None,
+        }
+        for _ in range(count)
+    ]
+
+
+def run(template: str, names: int, repeat: int, seed: int = 0) -> dict:
+    samples = sample_fields(names, seed)
+    compiled = FilenameTemplate(template)
+
+    mismatches = sum(compiled.render(fields) != replace_words(template, fields) for fields in samples)
+
+    def measure(render) -> float:
+        return min(timeit.repeat(lambda: [render(fields) for fields in samples], number=1, repeat=repeat))
+
+    legacy = measure(lambda fields: replace_words(template, fields))
+    current = measure(compiled.render)
+
+    return {
+        "template": template,
+        "names": names,
+        "mismatches": mismatches,
+        "replace_words_us": round(legacy / names * 1_000_000, 3),
+        "filename_template_us": round(current / names * 1_000_000, 3),
+        "speedup": round(legacy / current, 2) if current else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara FilenameTemplate e replace_words.")
+    parser.add_argument("--template", default=FILENAME, help=f'Modelo do nome (padrão: "{FILENAME}").')
+    parser.add_argument("--names", type=int, default=20_000, help="Nomes gerados por medição (padrão: 20000).")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições; vale a mais rápida (padrão: 5).")
+    parser.add_argument("--seed", type=int, default=0, help="Semente dos campos aleatórios (padrão: 0).")
+    args = parser.parse_args()
+
+    result = run(args.template, args.names, args.repeat, args.seed)
+    sys.stdout.write(json.dumps(result, indent=2, ensure_ascii=False) + "\n")
+
+    sys.exit(1 if result["mismatches"] else 0)
+
+
+if __name__ == "__main__":
+    main()
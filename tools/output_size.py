@@ -0,0 +1,77 @@
+"""
+Compara o tamanho dos arquivos gerados (uma página por arquivo) com cada perfil de otimização.
+
+Cada página dos documentos é gerada em memória com todos os perfis; o perfil `off` (sem
+otimização) é o tamanho "antes", e para os demais são informados o tamanho, a redução em
+relação ao `off` e o tempo médio por página.
+
+Uso:
+    python -m tools.output_size comprovantes/
+    python -m tools.output_size comprovantes/lote.pdf --profiles off small --output resultado.json
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from models.document import Document
+from models.optimizer import OUTPUT_PROFILES
+from utils.file_helpers import iter_pdf_paths
+
+
+def measure(paths: list[str], profiles: list[str]) -> dict:
+    sizes = dict.fromkeys(profiles, 0)
+    seconds = dict.fromkeys(profiles, 0.0)
+    pages = 0
+
+    for path in paths:
+        with Document(path) as document:
+            for page_number in range(1, document.page_count + 1):
+                pages += 1
+
+                for profile in profiles:
+                    started_at = time.perf_counter()
+                    sizes[profile] += len(document.page_bytes(page_number, profile))
+                    seconds[profile] += time.perf_counter() - started_at
+
+    before = sizes.get("off")
+
+    return {
+        "documents": len(paths),
+        "pages": pages,
+        "profiles": {
+            profile: {
+                "bytes": sizes[profile],
+                "bytes_per_page": round(sizes[profile] / pages) if pages else 0,
+                "reduction": round(before / sizes[profile], 2) if before and sizes[profile] else None,
+                "ms_per_page": round(seconds[profile] / pages * 1000, 3) if pages else 0,
+            }
+            for profile in profiles
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara o tamanho dos arquivos gerados por perfil de otimização.")
+    parser.add_argument("path", help="Arquivo ou pasta de PDFs.")
+    parser.add_argument(
+        "--profiles", nargs="+", choices=OUTPUT_PROFILES, default=OUTPUT_PROFILES, help="Perfis comparados (padrão: todos)."
+    )
+    parser.add_argument("--output", help="Arquivo JSON de resultado (padrão: saída padrão).")
+    args = parser.parse_args()
+
+    # O perfil `off` é a referência ("antes") da redução
+    profiles = ["off", *[profile for profile in args.profiles if profile != "off"]]
+    result = measure(list(iter_pdf_paths(args.path, None)), profiles)
+    content = json.dumps(result, indent=2, ensure_ascii=False)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(content + "\n")
+    else:
+        sys.stdout.write(content + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Verifica se os backends de extração de texto produzem os mesmos campos.
+
+Percorre os documentos da pasta de entrada configurada (ou o arquivo/pasta informado) e,
+para cada página, compara os campos BANK, RECIPIENT, VALUE e DATE extraídos com o `pdfplumber`
+(referência) e com o `pymupdf` (ou o `auto`, com `--backend auto`). Termina com código 1 se
+alguma página divergir.
+
+O corpus de `tests/fixtures/parity` reúne diagramações em que os backends divergem, com os
+campos esperados de cada página (veja `tests/test_parity.py`).
+
+Uso:
+    python -m tools.parity
+    python -m tools.parity C:\\Comprovantes --backend auto
+"""
+
+import argparse
+import sys
+
+from models import Settings
+from models.document import Document
+from models.page import Page
+from utils import error, message, success, warn
+from utils.file_helpers import iter_pdf_paths
+
+REFERENCE_BACKEND = "pdfplumber"
+CANDIDATE_BACKEND = "pymupdf"
+
+
+def compare_document(path: str, settings: Settings, candidate: str = CANDIDATE_BACKEND) -> tuple[int, int]:
+    """
+    Compara os campos de todas as páginas de um documento extraídos pelo backend de referência
+    e pelo `candidate`.
+
+    Returns:
+        tuple: (páginas comparadas, páginas divergentes).
+    """
+    divergent = 0
+
+    with Document(path) as document:
+        for current_page in document.pages:
+            page_number = current_page.page_number
+            expected = Page(document, current_page, page_number, settings, text_backend=REFERENCE_BACKEND).get_fields()
+            actual = Page(document, current_page, page_number, settings, text_backend=candidate).get_fields()
+            current_page.close()
+
+            if expected != actual:
+                divergent += 1
+                warn(f"{document.name}, página {page_number}:")
+                message(f"  {REFERENCE_BACKEND}: {expected}")
+                message(f"  {candidate}: {actual}")
+
+        return len(document.pages), divergent
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compara os campos extraídos pelos backends de texto.")
+    parser.add_argument("path", nargs="?", help="Arquivo ou pasta de PDFs (padrão: pasta de entrada configurada).")
+    parser.add_argument(
+        "--backend",
+        choices=["pymupdf", "auto"],
+        default=CANDIDATE_BACKEND,
+        help=f"Backend comparado com o {REFERENCE_BACKEND} (padrão: {CANDIDATE_BACKEND}).",
+    )
+    args = parser.parse_args()
+
+    settings = Settings.load()
+    paths = iter_pdf_paths(args.path or settings.input_folder, settings.output_folder)
+    total_pages = 0
+    total_divergent = 0
+
+    for path in paths:
+        pages, divergent = compare_document(path, settings, args.backend)
+        total_pages += pages
+        total_divergent += divergent
+
+    msg = f"Páginas divergentes: {total_divergent} de {total_pages}"
+
+    if total_divergent:
+        error(msg)
+        return 1
+
+    success(msg)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
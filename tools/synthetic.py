@@ -0,0 +1,220 @@
+"""
+Gera comprovantes PDF sintéticos para testes de desempenho e de paridade.
+
+As páginas usam os bancos, os rótulos de valores (`KEY_VALUES`) e os rótulos de favorecido
+da configuração, com nomes e valores aleatórios (a partir de uma semente fixa, para que o
+mesmo corpus possa ser gerado novamente).
+
+Com `--layouts`, gera o corpus de paridade dos backends de texto: um arquivo por diagramação
+(colunas, tabela, campos lado a lado, página girada...) em que o PyMuPDF e o `pdfplumber`
+ordenam ou agrupam o texto de formas diferentes. Os campos esperados de cada arquivo ficam
+em `tests/fixtures/parity/expected.json`.
+
+Uso:
+    python -m tools.synthetic C:\\Corpus --documents 100 --pages 10
+    python -m tools.synthetic tests\\fixtures\\parity --layouts
+"""
+
+import argparse
+import os
+import random
+
+import fitz
+
+from models import Settings
+from utils.constants import RECIPIENT_LABELS
+
+FIRST_NAMES = ["JOAO", "MARIA", "ANA", "JOSE", "PAULO", "FERNANDA", "CARLOS", "JULIANA", "LUCAS", "PATRICIA"]
+LAST_NAMES = ["SILVA", "SANTOS", "OLIVEIRA", "SOUZA", "LIMA", "PEREIRA", "COSTA", "RODRIGUES", "ALMEIDA", "NASCIMENTO"]
+
+
+def format_currency(value: float) -> str:
+    """
+    Formata um valor no padrão brasileiro.
+
+    Example:
+        >>> format_currency(1234.5)
+        '1.234,50'
+    """
+    return f"{value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def receipt_text(rng: random.Random, banks: list[str], key_values: list[str]) -> str:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    value = format_currency(rng.uniform(1, 50000))
+
+    return "\n".join(
+        [
+            rng.choice(banks) if banks else "BANCO",
+            "Comprovante de Pagamento",
+            f"Data: {rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2024",
+            f"{rng.choice(RECIPIENT_LABELS).title()}: {name}",
+            f"{rng.choice(key_values).title()}: R$ {value}",
+            f"Autenticação: {rng.getrandbits(64):016X}",
+        ]
+    )
+
+
+def generate_corpus(folder: str, documents: int = 10, pages: int = 10, seed: int = 0) -> list[str]:
+    """
+    Gera `documents` arquivos PDF com `pages` comprovantes cada.
+
+    Args:
+        folder (str): A pasta de destino (criada caso não exista).
+        documents (int, optional): A quantidade de arquivos.
+        pages (int, optional): A quantidade de páginas por arquivo.
+        seed (int, optional): A semente dos valores aleatórios.
+
+    Returns:
+        list[str]: Os caminhos dos arquivos gerados.
+    """
+    settings = Settings.load()
+    banks = settings.bank_names
+    key_values = list(settings.key_values)
+    rng = random.Random(seed)
+    paths = []
+
+    os.makedirs(folder, exist_ok=True)
+
+    for index in range(documents):
+        path = os.path.join(folder, f"comprovantes_{index + 1:06d}.pdf")
+
+        with fitz.open() as doc:
+            for _ in range(pages):
+                page = doc.new_page(width=595, height=842)
+                page.insert_text((72, 72), receipt_text(rng, banks, key_values), fontsize=11)
+
+            doc.save(path, garbage=3, deflate=True)
+
+        paths.append(path)
+
+    return paths
+
+
+def layout_lines(page: fitz.Page) -> None:
+    """Uma linha por campo, gravadas de baixo para cima (ordem inversa no conteúdo da página)."""
+    lines = [
+        "BRADESCO",
+        "Comprovante de Pagamento",
+        "Data: 10/10/2024",
+        "Favorecido: JOSE LIMA",
+        "Valor total: R$ 300,50",
+    ]
+
+    for index, line in reversed(list(enumerate(lines))):
+        page.insert_text((72, 72 + index * 18), line, fontsize=11)
+
+
+def layout_columns(page: fitz.Page) -> None:
+    """Rótulos e valores em duas caixas de texto: o PyMuPDF lê uma coluna inteira e depois a outra."""
+    page.insert_text((72, 72), "BANCO DO BRASIL", fontsize=12)
+    page.insert_textbox(fitz.Rect(72, 90, 250, 200), "Data:\nFavorecido:\nValor:", fontsize=11)
+    page.insert_textbox(fitz.Rect(250, 90, 500, 200), "05/03/2024\nMARIA SILVA\nR$ 1.234,56", fontsize=11)
+
+
+def layout_table(page: fitz.Page) -> None:
+    """Tabela com bordas, um rótulo e um valor por linha, em células separadas."""
+    rows = [
+        ("Data", "20/12/2023"),
+        ("Favorecido", "PAULO PEREIRA"),
+        ("Valor principal", "R$ 2.000,00"),
+        ("Valor total", "R$ 2.010,00"),
+    ]
+
+    page.insert_text((72, 72), "BANCO DO BRASIL", fontsize=12)
+
+    for index, (label, value) in enumerate(rows):
+        y = 100 + index * 24
+        page.draw_rect(fitz.Rect(72, y, 250, y + 24))
+        page.draw_rect(fitz.Rect(250, y, 450, y + 24))
+        page.insert_textbox(fitz.Rect(76, y + 5, 246, y + 24), label, fontsize=10)
+        page.insert_textbox(fitz.Rect(254, y + 5, 446, y + 24), value, fontsize=10)
+
+
+def layout_side_by_side(page: fitz.Page) -> None:
+    """Favorecido e valor na mesma altura: o `pdfplumber` os une em uma única linha."""
+    page.insert_text((72, 72), "CAIXA ECONOMICA FEDERAL", fontsize=12)
+    page.insert_text((72, 100), "Favorecido: MARIA SANTOS", fontsize=11)
+    page.insert_text((330, 100), "Valor: R$ 10,00", fontsize=11)
+    page.insert_text((72, 118), "Data: 02/01/2024", fontsize=11)
+
+
+def layout_spans(page: fitz.Page) -> None:
+    """Palavras em fontes diferentes e o valor gravado caractere a caractere."""
+    page.insert_text((72, 72), "CAIXA", fontname="hebo", fontsize=14)
+    page.insert_text((72, 100), "Data: 01/02/2024", fontsize=11)
+    x = 72
+
+    for word, font in [("Favorecido:", "hebo"), ("ANA", "helv"), ("SOUZA", "helv")]:
+        page.insert_text((x, 120), word, fontname=font, fontsize=11)
+        x += fitz.get_text_length(word, fontname=font, fontsize=11) + 3.2
+
+    x = 72
+
+    for char in "Valor: R$ 45,00":
+        page.insert_text((x, 140), char, fontsize=11)
+        x += fitz.get_text_length(char, fontsize=11)
+
+
+def layout_rotated(page: fitz.Page) -> None:
+    """Página com rotação de 90 graus."""
+    page.set_rotation(90)
+
+    for index, line in enumerate(["BRADESCO", "Data: 15/06/2024", "Favorecido: LUCAS ALMEIDA", "Valor: R$ 99,90"]):
+        page.insert_text((72, 72 + index * 18), line, fontsize=11)
+
+
+# Diagramações do corpus de paridade (nome do arquivo: função que desenha a página)
+LAYOUTS = {
+    "linhas.pdf": layout_lines,
+    "colunas.pdf": layout_columns,
+    "tabela.pdf": layout_table,
+    "lado_a_lado.pdf": layout_side_by_side,
+    "fontes.pdf": layout_spans,
+    "girada.pdf": layout_rotated,
+}
+
+
+def generate_layouts(folder: str) -> list[str]:
+    """
+    Gera o corpus de paridade: um arquivo de uma página para cada diagramação de `LAYOUTS`.
+
+    Returns:
+        list[str]: Os caminhos dos arquivos gerados.
+    """
+    paths = []
+
+    os.makedirs(folder, exist_ok=True)
+
+    for filename, draw in LAYOUTS.items():
+        path = os.path.join(folder, filename)
+
+        with fitz.open() as doc:
+            draw(doc.new_page(width=595, height=842))
+            doc.save(path, garbage=3, deflate=True)
+
+        paths.append(path)
+
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gera comprovantes PDF sintéticos.")
+    parser.add_argument("folder", help="Pasta de destino.")
+    parser.add_argument("--documents", type=int, default=10, help="Quantidade de arquivos (padrão: 10).")
+    parser.add_argument("--pages", type=int, default=10, help="Páginas por arquivo (padrão: 10).")
+    parser.add_argument("--seed", type=int, default=0, help="Semente dos valores aleatórios (padrão: 0).")
+    parser.add_argument("--layouts", action="store_true", help="Gera o corpus de paridade dos backends de texto.")
+    args = parser.parse_args()
+
+    if args.layouts:
+        paths = generate_layouts(args.folder)
+        print(f"{len(paths)} arquivos gerados em {args.folder}")
+        return
+
+    paths = generate_corpus(args.folder, args.documents, args.pages, args.seed)
+    print(f"{len(paths)} arquivos gerados ({len(paths) * args.pages} páginas) em {args.folder}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,17 @@
-from .file_helpers import get_pdf_docs
-from .helper import debugger_is_active, exit_application, set_title
+from .file_helpers import count_pdf_docs, get_pdf_docs
+from .helper import debugger_is_active, exit_application, set_app_title, set_title
 from .message import error, message, page_message, success, warn
 from .string_helpers import string_list_to_json
 
 __all__ = [
+    "count_pdf_docs",
     "debugger_is_active",
     "error",
     "exit_application",
     "get_pdf_docs",
     "message",
     "page_message",
+    "set_app_title",
     "set_title",
     "string_list_to_json",
     "success",
@@ -1,11 +1,32 @@
 SEPARATOR = ","
 APP_TITLE = "Notas PDF"
 CONFIG_FILE = "config.ini"
+LEDGER_FILE = "ledger.db"
+PAGE_CACHE_FILE = "page_cache.db"
+ENV_PREFIX = "NOTAS_PDF_"
+HEADLESS_ENV = f"{ENV_PREFIX}HEADLESS"
 DEFAULT_OUTPUT_DIR_NAME = "output"
 KEY_VALUES = ["VALOR PRINCIPAL", "VALOR NOMINAL", "VALOR TOTAL", "VALOR"]
+RECIPIENT_LABELS = ["NOME DO DESTINATÁRIO", "FAVORECIDO"]
 FILENAME = "BANK RECIPIENT R$ VALUE"
+BUNDLE_MAX_PAGES = 500
+SAVE_GARBAGE = 3
+SAVE_DEFLATE = True
+PAGE_WINDOW = 200
+MEMORY_LIMIT_MB = 0
+PAGE_CACHE_MB = 256
+DUPLICATES = "off"
+OUTPUT_PROFILE = "compact"
+TEXT_BACKEND = "auto"
+TEXT_BACKENDS = ["auto", "pymupdf", "pdfplumber"]
 BANK_ACRONYMS = {
     "BANCO DO BRASIL": "BB",
     "BRADESCO": "BRADESCO",
     "CAIXA": "CEF",
 }
+
+# Códigos de saída
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_PARTIAL = 2
+EXIT_NO_DOCUMENTS = 3
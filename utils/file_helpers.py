@@ -1,12 +1,8 @@
 import os
-import tkinter as tk
-from tkinter import filedialog
+from typing import Iterator
 
-import pdfplumber
 from colorama import Fore
 
-from utils.helper import set_title
-
 
 def select_folder(title: str = "Selecione uma pasta") -> str:
     """
@@ -28,6 +24,9 @@ def select_folder(title: str = "Selecione uma pasta") -> str:
         >>> except Exception as e:
         >>>     print(f"Erro: {e}")
     """
+    import tkinter as tk
+    from tkinter import filedialog
+
     root = tk.Tk()
     root.withdraw()  # Esconde a janela principal do Tkinter
 
@@ -43,55 +42,106 @@ def select_folder(title: str = "Selecione uma pasta") -> str:
     return folder_selected_normalized
 
 
-def get_pdf_docs() -> list[str]:
+def normalize_path(path: str) -> str:
+    """
+    Normaliza um caminho para comparação (absoluto, sem separadores redundantes e,
+    no Windows, sem diferenciar maiúsculas de minúsculas).
+
+    Example:
+        >>> normalize_path("C:/Comprovantes/./Saida/")
+        'c:\\comprovantes\\saida'
+    """
+    return os.path.normcase(os.path.abspath(path))
+
+
+def is_within(path: str, folder: str) -> bool:
+    """
+    Indica se o caminho está na pasta informada (ou em uma de suas subpastas), comparando
+    os caminhos normalizados.
+
+    Example:
+        >>> is_within("C:/Saida/BB FULANO R$ 10,00.pdf", "c:/saida")
+        True
+    """
+    path, folder = normalize_path(path), normalize_path(folder)
+
+    try:
+        return os.path.commonpath([path, folder]) == folder
+    except ValueError:
+        # Caminhos em unidades diferentes (Windows)
+        return False
+
+
+def iter_pdf_paths(path: str, exclude: str | None = None) -> Iterator[str]:
+    """
+    Percorre um arquivo ou diretório e produz, de forma preguiçosa, os caminhos dos arquivos PDF.
+
+    Os diretórios e arquivos são visitados em ordem alfabética, garantindo uma ordem
+    determinística entre execuções. Nenhum documento é aberto nesta etapa.
+
+    Args:
+        path (str): Um arquivo PDF ou um diretório contendo arquivos PDF.
+        exclude (str, optional): Diretório ignorado juntamente com seus subdiretórios
+                                 (normalmente a pasta de saída).
+
+    Yields:
+        str: O caminho de cada arquivo PDF encontrado.
+    """
+    if os.path.isfile(path):
+        if path.lower().endswith(".pdf"):
+            yield path
+        return
+
+    excluded = normalize_path(exclude) if exclude else None
+
+    for root, dirs, files in os.walk(path):
+        if excluded and normalize_path(root) == excluded:
+            dirs.clear()
+            continue
+
+        dirs.sort()
+
+        for file in sorted(files):
+            if file.lower().endswith(".pdf"):
+                yield os.path.join(root, file)
+
+
+def get_pdf_docs(input_folder: str, output_folder: str) -> Iterator[str]:
     """
-    Recupera documentos PDF de uma pasta de entrada ou caminho de arquivo especificado.
+    Recupera, sob demanda, os caminhos dos documentos PDF da pasta de entrada ou do arquivo especificado.
 
-    Esta função verifica o caminho de entrada especificado na configuração.
-    Se o caminho for um arquivo e terminar com '.pdf', ele abre o PDF e o adiciona à lista de documentos PDF.
+    Esta função verifica o caminho de entrada (`input_folder`, da configuração).
+    Se o caminho for um arquivo e terminar com '.pdf', ele é produzido diretamente.
     Se o caminho for um diretório, ele percorre o diretório e seus subdiretórios (excluindo a pasta de saída)
-    para encontrar e abrir todos os arquivos PDF, adicionando-os à lista de documentos PDF.
+    produzindo o caminho de cada arquivo PDF encontrado.
 
-    Returns:
-        list[str]: Uma lista de documentos PDF abertos.
+    Os documentos não são abertos aqui: cada um deve ser aberto somente no momento em que
+    for processado (veja `models.document.Document`).
 
-    Raises:
-        Exception: Se nenhum documento PDF for encontrado.
+    Yields:
+        str: O caminho de cada documento PDF, em ordem determinística.
 
     Notes:
-        O caminho da pasta de entrada é recuperado da classe Config.
-        A função usa `pdfplumber` para abrir arquivos PDF.
-        A função usa `os.walk` para percorrer diretórios.
-        A função ignora arquivos localizados na pasta de saída especificada na configuração.
+        A pasta de saída é comparada pelo caminho normalizado, e não por substring.
 
     Example:
-        >>> pdf_docs = get_pdf_docs()
-        >>> print(len(pdf_docs))
-        3
+        >>> for path in get_pdf_docs(settings.input_folder, settings.output_folder):
+        >>>     print(path)
     """
-    from models.config import Config
+    yield from iter_pdf_paths(input_folder, output_folder)
 
-    config = Config()
-    pdf_docs = list()
-    path = config.get_input_folder()
 
-    if os.path.isfile(path) and path.lower().endswith(".pdf"):
-        pdf_docs.append(pdfplumber.open(path))
-    elif os.path.isdir(path):
-        for root, _, files in os.walk(path):
-            if config.get_output_folder() in root:
-                continue
+def count_pdf_docs(input_folder: str, output_folder: str) -> int:
+    """
+    Conta os documentos PDF que serão processados, sem abri-los.
 
-            for file in files:
-                if file.lower().endswith(".pdf"):
-                    file_name = os.path.join(root, file)
-                    pdf_docs.append(pdfplumber.open(file_name))
+    Útil para exibir o progresso antes do processamento, já que apenas os nomes
+    dos arquivos são percorridos.
 
-    if pdf_docs:
-        return pdf_docs
-    else:
-        set_title("Concluído!")
-        raise Exception(f"{Fore.LIGHTRED_EX}Nenhum documento encontrado!{Fore.RESET}")
+    Returns:
+        int: A quantidade de documentos PDF encontrados.
+    """
+    return sum(1 for _ in get_pdf_docs(input_folder, output_folder))
 
 
-__all__ = ["get_pdf_docs"]
+__all__ = ["count_pdf_docs", "get_pdf_docs", "iter_pdf_paths", "normalize_path"]
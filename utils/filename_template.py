@@ -0,0 +1,98 @@
+import re
+
+TEMPLATE_FIELDS = ["BANK", "RECIPIENT", "VALUE", "DATE", "PAGE", "SOURCE"]
+
+# Campos que também podem ser usados sem chaves, como nos modelos anteriores ("BANK RECIPIENT R$ VALUE")
+LEGACY_FIELDS = ["BANK", "RECIPIENT", "VALUE", "DATE"]
+
+FILENAME_MAX_LENGTH = 150
+
+PLACEHOLDER_PATTERN = re.compile(
+    r"\{(\w+)\}|\b(" + "|".join(LEGACY_FIELDS) + r")\b",
+    re.IGNORECASE,
+)
+INVALID_CHARS_TABLE = str.maketrans({char: "-" for char in '<>:"/\\|?*' + "".join(map(chr, range(32)))})
+REPEATED_SEPARATORS = re.compile(r"([^\w\s]|_)\1+|(\s)\2+")
+EDGE_SEPARATORS = re.compile(r"^[^\w\s]+|[^\w\s]+$")
+RESERVED_NAMES = {"CON", "PRN", "AUX", "NUL", *(f"COM{i}" for i in range(1, 10)), *(f"LPT{i}" for i in range(1, 10))}
+
+
+class FilenameTemplate:
+    """
+    Modelo do nome dos arquivos de saída, interpretado uma única vez.
+
+    O modelo é dividido em trechos fixos e campos; a geração de cada nome apenas junta os
+    trechos, sem compilar expressões regulares. Os campos podem ser indicados entre chaves
+    (`{BANK}`, `{RECIPIENT}`, `{VALUE}`, `{DATE}`, `{PAGE}` e `{SOURCE}`, o nome do arquivo de
+    origem) ou, como nos modelos anteriores, sem chaves (`BANK`, `RECIPIENT`, `VALUE` e `DATE`).
+
+    Os valores têm os caracteres inválidos em nomes de arquivo substituídos por "-", campos
+    vazios não deixam separadores repetidos e o nome é limitado a `max_length` caracteres.
+
+    Example:
+        >>> template = FilenameTemplate("BANK RECIPIENT R$ VALUE")
+        >>> template.render({"BANK": "BB", "RECIPIENT": None, "VALUE": "10,00"})
+        'BB R$ 10,00'
+        >>> FilenameTemplate("{DATE} {SOURCE} p{PAGE}").render({"DATE": "05/03/2024", "SOURCE": "lote", "PAGE": 2})
+        '05-03-2024 lote p2'
+
+    Raises:
+        ValueError: Se o modelo contiver um campo desconhecido.
+    """
+
+    def __init__(self, template: str, max_length: int = FILENAME_MAX_LENGTH):
+        self.template = template
+        self.max_length = max_length
+        self.parts: list[str] = []
+        self.fields: list[str] = []
+
+        position = 0
+
+        for match in PLACEHOLDER_PATTERN.finditer(template):
+            name = (match.group(1) or match.group(2)).upper()
+
+            if name not in TEMPLATE_FIELDS:
+                raise ValueError(f"Campo desconhecido no modelo do nome: '{match.group(0)}'. Use: {', '.join(TEMPLATE_FIELDS)}.")
+
+            self.parts.append(template[position : match.start()])
+            self.fields.append(name)
+            position = match.end()
+
+        self.parts.append(template[position:])
+
+    def render(self, values: dict[str, object]) -> str:
+        """
+        Gera o nome do arquivo (sem extensão) a partir dos valores dos campos.
+
+        Raises:
+            ValueError: Se o nome gerado for vazio.
+        """
+        pieces = [self.parts[0]]
+
+        for field, part in zip(self.fields, self.parts[1:]):
+            value = values.get(field)
+
+            if value is not None:
+                pieces.append(str(value).translate(INVALID_CHARS_TABLE))
+
+            pieces.append(part)
+
+        name = "".join(pieces)
+
+        # A substituição só é feita quando necessária (campos vazios ou separadores repetidos)
+        if REPEATED_SEPARATORS.search(name):
+            name = REPEATED_SEPARATORS.sub(r"\1\2", name)
+
+        if EDGE_SEPARATORS.search(name):
+            name = EDGE_SEPARATORS.sub("", name)
+
+        name = name.strip()
+        name = name[: self.max_length].rstrip(" .")
+
+        if not name:
+            raise ValueError("O nome do arquivo gerado é vazio.")
+
+        if name.split(".")[0].upper() in RESERVED_NAMES:
+            name = f"{name}_"
+
+        return name
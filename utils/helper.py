@@ -1,14 +1,50 @@
-import ctypes
 import os
 import platform
 import sys
 
+from utils.constants import APP_TITLE, EXIT_OK, HEADLESS_ENV
+from utils.string_helpers import as_bool
+
+# Prefixo do título da janela do console (veja `set_app_title`)
+app_title = APP_TITLE
+
+
+def is_interactive() -> bool:
+    """
+    Retorna verdadeiro se a aplicação estiver sendo executada por um usuário em um terminal.
+
+    A execução é considerada não interativa (headless) quando a variável de ambiente
+    `NOTAS_PDF_HEADLESS` for verdadeira (1, true, yes ou sim) ou quando a entrada ou a
+    saída padrão não forem um terminal (ex.: agendador de tarefas, redirecionamento para log).
+    """
+    if as_bool(os.environ.get(HEADLESS_ENV, "")):
+        return False
+
+    return bool(sys.stdin and sys.stdin.isatty() and sys.stdout and sys.stdout.isatty())
+
+
+def has_desktop() -> bool:
+    """Retorna verdadeiro se houver um ambiente gráfico disponível para exibir diálogos."""
+    if platform.system() == "Windows":
+        return True
+
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def set_app_title(title: str) -> None:
+    """Define o prefixo do título da janela do console (o título configurado da aplicação)."""
+    global app_title
+    app_title = title
+
 
 def set_title(title: str) -> None:
-    from models.config import Config
+    """Altera o título da janela do console (somente no Windows, em execuções interativas)."""
+    if platform.system() != "Windows" or not is_interactive():
+        return
+
+    import ctypes
 
-    config = Config()
-    ctypes.windll.kernel32.SetConsoleTitleW(f"{config.get_title()}: {title}")
+    ctypes.windll.kernel32.SetConsoleTitleW(f"{app_title}: {title}")
 
 
 def get_app_directory():
@@ -21,14 +57,19 @@ def get_app_directory():
     return app_dir
 
 
-def exit_application(message=None):
+def exit_application(message=None, code: int = EXIT_OK):
+    """
+    Encerra a aplicação com o código de saída informado.
+
+    Em execuções interativas, aguarda o usuário pressionar uma tecla antes de encerrar.
+    """
     output_message = "Pressione qualquer tecla para encerrar..."
 
     if message:
         print(message)
 
-    if debugger_is_active():
-        exit()
+    if debugger_is_active() or not is_interactive():
+        sys.exit(code)
 
     print()
 
@@ -38,7 +79,7 @@ def exit_application(message=None):
         os.system(f"/bin/bash -c 'read -s -n 1 -p \"{output_message}\"'")
 
     print()
-    sys.exit()
+    sys.exit(code)
 
 
 def debugger_is_active() -> bool:
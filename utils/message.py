@@ -2,8 +2,39 @@ from colorama import Fore, just_fix_windows_console
 
 just_fix_windows_console()
 
+# Linha de status exibida no console (ex.: a barra de progresso), apagada antes de cada mensagem
+status_line = None
+
+
+def set_status_line(line) -> None:
+    """
+    Registra a linha de status atual (um objeto com o método `clear`), ou None para removê-la.
+    As mensagens apagam a linha antes de serem exibidas, e a linha é redesenhada depois.
+    """
+    global status_line
+    status_line = line
+
+
+def page_message(
+    page_number: int,
+    total: int,
+    success: bool,
+    skipped: bool = False,
+    duplicate: bool = False,
+    rejected: bool = False,
+) -> str:
+    if rejected:
+        print(f"   {Fore.LIGHTBLACK_EX}Página {page_number} de {total} (rejeitada){Fore.RESET}")
+        return
+
+    if skipped:
+        print(f"   {Fore.LIGHTCYAN_EX}Página {page_number} de {total} (já processada){Fore.RESET}")
+        return
+
+    if duplicate:
+        print(f"   {Fore.LIGHTMAGENTA_EX}Página {page_number} de {total} (duplicada){Fore.RESET}")
+        return
 
-def page_message(page_number: int, total: int, success: bool) -> str:
     color = Fore.LIGHTGREEN_EX if success else Fore.LIGHTYELLOW_EX
 
     print(f"   {color}Página {page_number} de {total}{Fore.RESET}")
@@ -20,6 +51,9 @@ def message(text: str, type: int = 0, end: str = "\n") -> str:
         )
     )
 
+    if status_line:
+        status_line.clear()
+
     print(f" {color}{text}{Fore.RESET}", end=end)
 
 
@@ -0,0 +1,181 @@
+import json
+import math
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+STAGES = ["open", "page_cache", "prefilter", "extract_text", "ocr", "parse_fields", "name", "save"]
+QUANTILES = [0.5, 0.9, 0.99]
+METRIC_PREFIX = "notas_pdf"
+
+
+@contextmanager
+def timed(timings: dict[str, float], stage: str):
+    """
+    Acumula em `timings[stage]` o tempo, em segundos, gasto dentro do bloco `with`.
+
+    Example:
+        >>> timings = {}
+        >>> with timed(timings, "save"):
+        >>>     document.split_page(1, "pagina_1.pdf")
+    """
+    started_at = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started_at
+
+
+def percentile(values: list[float], quantile: float) -> float | None:
+    """
+    Calcula o percentil (método nearest-rank) de uma lista ordenada de valores.
+
+    Example:
+        >>> percentile([1, 2, 3, 4], 0.5)
+        2
+    """
+    if not values:
+        return None
+
+    return values[max(0, math.ceil(quantile * len(values)) - 1)]
+
+
+class Metrics:
+    """
+    Coleta, sob demanda (`--metrics`), os tempos de cada etapa por página, os bytes gravados
+    e os motivos das falhas, permitindo exportar os dados em JSON Lines ou no formato texto
+    do Prometheus.
+
+    Example:
+        >>> metrics = Metrics()
+        >>> metrics.record_page("a.pdf", 1, page.timings, page.bytes_written, page.error)
+        >>> metrics.write("metricas.prom", "prometheus")
+    """
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {stage: [] for stage in STAGES}
+        self.records: list[dict] = []
+        self.statuses = Counter()
+        self.failures = Counter()
+        self.bytes_written = 0
+
+    def record_open(self, path: str, seconds: float) -> None:
+        self.samples["open"].append(seconds)
+        self.records.append({"type": "document", "document": path, "timings": {"open": seconds}})
+
+    def record_page(
+        self,
+        path: str,
+        page_number: int,
+        timings: dict[str, float] = None,
+        bytes_written: int = 0,
+        error: str = None,
+        skipped: bool = False,
+        rejected: bool = False,
+    ) -> None:
+        timings = timings or {}
+        status = "skipped" if skipped else "rejected" if rejected else ("failed" if error else "saved")
+
+        for stage, seconds in timings.items():
+            self.samples.setdefault(stage, []).append(seconds)
+
+        self.statuses[status] += 1
+        self.bytes_written += bytes_written or 0
+
+        if error:
+            self.failures[error.split(":", 1)[0]] += 1
+
+        self.records.append(
+            {
+                "type": "page",
+                "document": path,
+                "page": page_number,
+                "status": status,
+                "timings": timings,
+                "bytes": bytes_written or 0,
+                "error": error,
+            }
+        )
+
+    def summary(self) -> dict:
+        stages = {}
+
+        for stage, values in self.samples.items():
+            values = sorted(values)
+            stages[stage] = {
+                "count": len(values),
+                "sum": sum(values),
+                "max": values[-1] if values else None,
+                **{f"p{round(quantile * 100)}": percentile(values, quantile) for quantile in QUANTILES},
+            }
+
+        return {
+            "pages": dict(self.statuses),
+            "bytes_written": self.bytes_written,
+            "failures": dict(self.failures),
+            "stages": stages,
+        }
+
+    def summary_lines(self) -> list[str]:
+        """Linhas de texto com os percentis de cada etapa, para exibição no console."""
+        lines = []
+
+        for stage, values in self.summary()["stages"].items():
+            if not values["count"]:
+                continue
+
+            lines.append(
+                f"{stage:<13} p50 {values['p50'] * 1000:8.2f}ms  p90 {values['p90'] * 1000:8.2f}ms  "
+                f"p99 {values['p99'] * 1000:8.2f}ms  total {values['sum']:8.2f}s"
+            )
+
+        for reason, count in self.failures.most_common():
+            lines.append(f"Falhas ({reason}): {count}")
+
+        return lines
+
+    def to_jsonl(self) -> str:
+        lines = [json.dumps(record, ensure_ascii=False) for record in self.records]
+        lines.append(json.dumps({"type": "summary", **self.summary()}, ensure_ascii=False))
+
+        return "\n".join(lines) + "\n"
+
+    def to_prometheus(self) -> str:
+        summary = self.summary()
+        name = f"{METRIC_PREFIX}_stage_seconds"
+        lines = [
+            f"# HELP {name} Tempo de cada etapa do processamento, por página (open: por documento).",
+            f"# TYPE {name} summary",
+        ]
+
+        for stage, values in summary["stages"].items():
+            if not values["count"]:
+                continue
+
+            for quantile in QUANTILES:
+                value = values[f"p{round(quantile * 100)}"]
+                lines.append(f'{name}{{stage="{stage}",quantile="{quantile}"}} {value:.6f}')
+
+            lines.append(f'{name}_sum{{stage="{stage}"}} {values["sum"]:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {values["count"]}')
+
+        name = f"{METRIC_PREFIX}_pages_total"
+        lines += [f"# HELP {name} Páginas por situação.", f"# TYPE {name} counter"]
+        lines += [f'{name}{{status="{status}"}} {count}' for status, count in summary["pages"].items()]
+
+        name = f"{METRIC_PREFIX}_bytes_written_total"
+        lines += [f"# HELP {name} Bytes gravados nos arquivos de saída.", f"# TYPE {name} counter"]
+        lines.append(f"{name} {summary['bytes_written']}")
+
+        name = f"{METRIC_PREFIX}_failures_total"
+        lines += [f"# HELP {name} Páginas com falha, por motivo.", f"# TYPE {name} counter"]
+        lines += [f'{name}{{reason="{reason}"}} {count}' for reason, count in summary["failures"].items()]
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str, format: str = "jsonl") -> None:
+        content = self.to_prometheus() if format == "prometheus" else self.to_jsonl()
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
@@ -0,0 +1,111 @@
+import os
+import re
+import threading
+
+SUFFIX_PATTERN = re.compile(r"^(.+?)(?:_(\d+))?$")
+
+
+class OutputRegistry:
+    """
+    Índice em memória dos nomes de arquivos existentes em uma pasta de saída.
+
+    A pasta é listada uma única vez, na criação do registro, montando um mapa
+    `nome base -> maior sufixo numérico` (`0` para o arquivo sem sufixo). A partir daí,
+    cada novo nome é calculado sem consultar o disco novamente.
+
+    A reserva de um nome cria o arquivo com semântica exclusiva (`O_CREAT | O_EXCL`), de forma
+    que outro processo ou outra execução simultânea nunca recebe o mesmo nome: se o arquivo
+    já tiver sido criado por outra execução, o próximo sufixo é tentado.
+
+    Example:
+        >>> registry = OutputRegistry.for_folder("saida")
+        >>> registry.reserve("BB FULANO R$ 10,00")
+        'saida/BB FULANO R$ 10,00.pdf'
+        >>> registry.reserve("BB FULANO R$ 10,00")
+        'saida/BB FULANO R$ 10,00_1.pdf'
+    """
+
+    _registries: dict[tuple[str, str], "OutputRegistry"] = {}
+    _registries_lock = threading.Lock()
+
+    def __init__(self, output_dir: str, extension: str = "pdf"):
+        self.output_dir = output_dir
+        self.extension = extension
+        self.suffixes: dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.__scan()
+
+    @classmethod
+    def for_folder(cls, output_dir: str, extension: str = "pdf") -> "OutputRegistry":
+        """Retorna o registro compartilhado da pasta de saída, criando-o no primeiro uso."""
+        key = (os.path.normcase(os.path.abspath(output_dir)), extension)
+
+        with cls._registries_lock:
+            if key not in cls._registries:
+                cls._registries[key] = cls(output_dir, extension)
+
+            return cls._registries[key]
+
+    def __scan(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        extension = f".{self.extension}"
+
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(extension):
+                    self.__register(entry.name[: -len(extension)])
+
+    def __register(self, stem: str) -> None:
+        # "NOME_3" pode ser o terceiro arquivo de "NOME" ou um arquivo cujo nome base é "NOME_3"
+        self.suffixes.setdefault(stem, 0)
+
+        match = SUFFIX_PATTERN.match(stem)
+
+        if match and match.group(2):
+            name, num = match.group(1), int(match.group(2))
+
+            if num > self.suffixes.get(name, -1):
+                self.suffixes[name] = num
+
+    def __candidate(self, name: str) -> str:
+        if name in self.suffixes:
+            return f"{name}_{self.suffixes[name] + 1}"
+
+        return name
+
+    def reserve(self, name: str) -> str:
+        """
+        Reserva um nome ainda não utilizado, criando um arquivo vazio no seu lugar.
+
+        Args:
+            name (str): O nome do arquivo, sem extensão.
+
+        Returns:
+            str: O caminho completo do arquivo reservado.
+        """
+        with self.lock:
+            while True:
+                stem = self.__candidate(name)
+                filename = os.path.join(self.output_dir, f"{stem}.{self.extension}")
+                self.__register(stem)
+
+                try:
+                    fd = os.open(filename, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+                except FileExistsError:
+                    # Criado por outra execução depois da listagem inicial
+                    continue
+
+                os.close(fd)
+
+                return filename
+
+    def release(self, filename: str) -> None:
+        """
+        Remove um arquivo reservado cuja gravação falhou, vazio ou gravado parcialmente (o
+        nome foi reservado com exclusividade, portanto o arquivo não pertence a outra execução).
+        """
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
@@ -0,0 +1,226 @@
+import shutil
+import sys
+import time
+from collections import Counter
+
+from utils.message import message, page_message, set_status_line, warn
+from utils.string_helpers import format_duration
+
+PROGRESS_MODES = ["auto", "bar", "log", "pages", "quiet"]
+
+# Intervalo, em segundos, entre as atualizações da barra e entre os resumos do modo `log`
+BAR_INTERVAL = 0.2
+LOG_INTERVAL = 10.0
+BAR_WIDTH = 20
+
+
+def format_count(value: int) -> str:
+    return f"{value:,}".replace(",", ".")
+
+
+class Progress:
+    """
+    Exibição do progresso do processamento no console.
+
+    - `pages`: uma linha por página e por documento (o mais detalhado e o mais lento em
+      execuções grandes, principalmente por SSH ou com a saída redirecionada).
+    - `bar`: uma única linha, redesenhada no máximo a cada `BAR_INTERVAL` segundos, com a
+      barra de progresso, as páginas por segundo e o tempo restante estimado.
+    - `log`: um resumo em texto simples a cada `LOG_INTERVAL` segundos, para arquivos de log.
+    - `quiet`: nenhuma linha por página ou por documento; somente os erros e o resumo final.
+    - `auto`: `bar` se a saída for um terminal, ou `log` caso contrário.
+
+    As páginas são somente contadas a cada atualização; a linha é montada e escrita apenas
+    quando o intervalo tiver passado. O total de páginas da execução é estimado pela média de
+    páginas dos documentos já iniciados e pela quantidade de documentos (`total_docs`).
+
+    Example:
+        >>> progress = set_progress("auto", total_docs=40)
+        >>> progress.document("Processando arquivo a.pdf...", "a.pdf", 1, 40, pages=60)
+        >>> progress.page(1, 60, True)
+        >>> progress.close()
+    """
+
+    def __init__(self, mode: str = "pages", total_docs: int = None, stream=None):
+        self.stream = stream or sys.stdout
+
+        if mode == "auto":
+            mode = "bar" if self.stream.isatty() else "log"
+
+        if mode not in PROGRESS_MODES:
+            raise ValueError(f"Modo de progresso inválido: '{mode}'. Use: {', '.join(PROGRESS_MODES)}.")
+
+        self.mode = mode
+        self.total_docs = total_docs
+        self.interval = BAR_INTERVAL if mode == "bar" else LOG_INTERVAL
+        self.started_at = time.monotonic()
+        self.next_render = self.started_at + (0 if mode == "bar" else self.interval)
+        self.documents = 0
+        self.known_pages = 0
+        self.pages = 0
+        self.statuses = Counter()
+        self.name = None
+        self.shown = False
+
+        if mode == "bar":
+            set_status_line(self)
+
+    @property
+    def detailed(self) -> bool:
+        """Indica se as páginas e os documentos são exibidos um a um (modo `pages`)."""
+        return self.mode == "pages"
+
+    def document(self, status: str, name: str, index: int = None, total_docs: int = None, pages: int = 0) -> None:
+        """Início do processamento de um documento com `pages` páginas."""
+        self.documents += 1
+        self.known_pages += pages
+        self.name = name if index is None else f"{name} ({index} de {total_docs})"
+
+        if self.detailed:
+            warn(status)
+
+    def document_skipped(self, total: int) -> None:
+        """Documento já processado em uma execução anterior."""
+        if self.detailed:
+            message(f"Arquivo já processado ({total} páginas).")
+            return
+
+        self.pages += total
+        self.statuses["skipped"] += total
+        self.update()
+
+    def document_time(self, total: int, elapsed: float) -> None:
+        if self.detailed:
+            message(f"Tempo: {elapsed:.2f}s ({total / elapsed:.1f} páginas/s)")
+
+    def separator(self, text: str) -> None:
+        if self.detailed:
+            print("", text)
+
+    def page(
+        self,
+        page_number: int,
+        total: int,
+        success: bool,
+        skipped: bool = False,
+        duplicate: bool = False,
+        rejected: bool = False,
+    ) -> None:
+        if self.detailed:
+            page_message(page_number, total, success, skipped, duplicate, rejected)
+            return
+
+        if rejected:
+            status = "rejected"
+        elif skipped:
+            status = "skipped"
+        elif duplicate:
+            status = "duplicate"
+        else:
+            status = "saved" if success else "failed"
+
+        self.pages += 1
+        self.statuses[status] += 1
+        self.update()
+
+    def update(self) -> None:
+        """Exibe o progresso se o intervalo desde a última exibição tiver passado."""
+        if self.mode not in ("bar", "log"):
+            return
+
+        now = time.monotonic()
+
+        if now >= self.next_render:
+            self.next_render = now + self.interval
+            self.render(now)
+
+    def estimated_pages(self) -> int | None:
+        """O total de páginas estimado da execução, ou None se a quantidade de documentos for desconhecida."""
+        if not self.total_docs or not self.documents:
+            return None
+
+        if self.documents >= self.total_docs:
+            return self.known_pages
+
+        return round(self.known_pages / self.documents * self.total_docs)
+
+    def summary(self, now: float) -> tuple[str, float | None]:
+        """A descrição do progresso e a fração concluída (None se o total for desconhecido)."""
+        elapsed = now - self.started_at
+        rate = self.pages / elapsed if elapsed > 0 else 0.0
+        estimated = self.estimated_pages()
+        parts = []
+
+        if estimated:
+            fraction = min(self.pages / estimated, 1.0)
+            approximate = "~" if self.documents < self.total_docs else ""
+            parts.append(f"{fraction:4.0%} {format_count(self.pages)}/{approximate}{format_count(estimated)} páginas")
+        else:
+            fraction = None
+            parts.append(f"{format_count(self.pages)} páginas")
+
+        parts.append(f"{rate:.1f} páginas/s".replace(".", ","))
+
+        if estimated and rate and self.pages < estimated:
+            parts.append(f"restante {format_duration((estimated - self.pages) / rate)}")
+        else:
+            parts.append(f"tempo {format_duration(elapsed)}")
+
+        if self.statuses["failed"]:
+            parts.append(f"{format_count(self.statuses['failed'])} falhas")
+
+        if self.name:
+            parts.append(self.name)
+
+        return " | ".join(parts), fraction
+
+    def render(self, now: float) -> None:
+        text, fraction = self.summary(now)
+
+        if self.mode == "log":
+            print(f" Progresso: {text}", file=self.stream, flush=True)
+            return
+
+        if fraction is not None:
+            filled = round(fraction * BAR_WIDTH)
+            text = f"[{'#' * filled}{'-' * (BAR_WIDTH - filled)}] {text}"
+
+        width = shutil.get_terminal_size().columns - 2
+        self.stream.write(f"\r {text[:width]}\x1b[K")
+        self.stream.flush()
+        self.shown = True
+
+    def clear(self) -> None:
+        """Apaga a barra para a exibição de uma mensagem; ela é redesenhada na próxima atualização."""
+        if self.shown:
+            self.stream.write("\r\x1b[K")
+            self.stream.flush()
+            self.shown = False
+            self.next_render = 0
+
+    def close(self) -> None:
+        """Exibe o progresso final (nos modos `bar` e `log`) e libera a linha de status."""
+        if self.mode == "bar":
+            self.render(time.monotonic())
+            self.stream.write("\n")
+            self.stream.flush()
+            self.shown = False
+            set_status_line(None)
+        elif self.mode == "log" and self.pages:
+            self.render(time.monotonic())
+
+
+progress = Progress()
+
+
+def get_progress() -> Progress:
+    """O progresso da execução atual (por padrão, no modo `pages`)."""
+    return progress
+
+
+def set_progress(mode: str, total_docs: int = None) -> Progress:
+    """Substitui o progresso da execução atual (veja `Progress`)."""
+    global progress
+    progress = Progress(mode, total_docs)
+
+    return progress
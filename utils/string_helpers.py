@@ -1,5 +1,8 @@
 import re
 
+# Valores aceitos como verdadeiro nas opções booleanas (`config.ini` e variáveis de ambiente)
+TRUE_VALUES = ("1", "true", "yes", "sim")
+
 
 def string_list_to_json(words: str, use_even_indices: bool = True, separator: str = ",") -> dict:
     """
@@ -87,3 +90,49 @@ def replace_words(text, replacements):
     replaced_text = re.sub(r"^[^\w\s]+|[^\w\s]+$", "", replaced_text).strip()
 
     return replaced_text
+
+
+def format_size(size: int) -> str:
+    """
+    Formata uma quantidade de bytes em KB, MB ou GB.
+
+    Example:
+        >>> format_size(1536)
+        '1,5 KB'
+    """
+    value = float(size)
+
+    for unit in ["bytes", "KB", "MB"]:
+        if value < 1024:
+            break
+
+        value /= 1024
+    else:
+        unit = "GB"
+
+    return f"{value:.0f} {unit}" if unit == "bytes" else f"{value:.1f} {unit}".replace(".", ",")
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Formata uma duração em `MM:SS` ou, a partir de uma hora, `H:MM:SS`.
+
+    Example:
+        >>> format_duration(3725)
+        '1:02:05'
+    """
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+def as_bool(value: str) -> bool:
+    """
+    Interpreta um valor do `config.ini` (ou de uma variável de ambiente) como verdadeiro ou falso.
+
+    Example:
+        >>> as_bool("Sim"), as_bool("não")
+        (True, False)
+    """
+    return value.strip().lower() in TRUE_VALUES